@@ -2,7 +2,7 @@ from django.contrib import admin
 from .models import (
     Season, Item, Player, BisSet, BisItem, Materia,
     RaidProgress, ItemAcquisition, DistributionPriority, ResourceTracking,
-    CustomUser, Schedule
+    CustomUser, Schedule, DistributionPlan, BackgroundJob, SeasonCost
 )
 
 @admin.register(CustomUser)
@@ -11,11 +11,17 @@ class CustomUserAdmin(admin.ModelAdmin):
     list_filter = ('user_type', 'is_staff', 'is_active')
     search_fields = ['username', 'email', 'nickname']
 
+class SeasonCostInline(admin.TabularInline):
+    model = SeasonCost
+    extra = 1
+
 @admin.register(Season)
 class SeasonAdmin(admin.ModelAdmin):
-    list_display = ('name', 'start_date', 'end_date', 'is_active', 'distribution_method')
+    list_display = ('name', 'start_date', 'end_date', 'is_active', 'distribution_method', 'cost_version')
     list_filter = ('is_active', 'distribution_method')
     search_fields = ['name']
+    readonly_fields = ('cost_version', 'data_version', 'data_updated_at')
+    inlines = [SeasonCostInline]
 
 @admin.register(Item)
 class ItemAdmin(admin.ModelAdmin):
@@ -89,4 +95,14 @@ class DistributionPriorityAdmin(admin.ModelAdmin):
 class ResourceTrackingAdmin(admin.ModelAdmin):
     list_display = ('player', 'season', 'resource_type', 'current_amount', 'total_needed')
     list_filter = ('season', 'resource_type')
-    search_fields = ['player__nickname']
\ No newline at end of file
+    search_fields = ['player__nickname']
+
+@admin.register(DistributionPlan)
+class DistributionPlanAdmin(admin.ModelAdmin):
+    list_display = ('season', 'mode', 'week_count', 'updated_at')
+    list_filter = ('mode',)
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ('job_type', 'season', 'status', 'progress', 'total', 'created_at', 'finished_at')
+    list_filter = ('job_type', 'status')
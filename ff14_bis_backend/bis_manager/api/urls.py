@@ -5,7 +5,7 @@ from bis_manager.views import (
     SeasonViewSet, ItemViewSet, PlayerViewSet,
     BisSetViewSet, BisItemViewSet,
     RaidProgressViewSet, ItemAcquisitionViewSet, DistributionPriorityViewSet,
-    ResourceTrackingViewSet, ScheduleViewSet
+    ResourceTrackingViewSet, ScheduleViewSet, BackgroundJobViewSet, MetricsView
 )
 
 # API 라우터 설정
@@ -20,8 +20,10 @@ router.register(r'item-acquisitions', ItemAcquisitionViewSet)
 router.register(r'distribution-priorities', DistributionPriorityViewSet)
 router.register(r'resources', ResourceTrackingViewSet)
 router.register(r'schedules', ScheduleViewSet)
+router.register(r'jobs', BackgroundJobViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
     path('auth/', include('bis_manager.api.auth_urls')),
+    path('_metrics', MetricsView.as_view(), name='metrics'),
 ]
\ No newline at end of file
@@ -83,6 +83,12 @@ DISTRIBUTION_METHODS = [
     ('우선순위분배', '우선순위분배'),
 ]
 
+# 주간 분배 계획 방식
+DISTRIBUTION_PLAN_MODES = [
+    ('greedy', '균등 분배'),
+    ('optimal', '최적 배정'),
+]
+
 # 자원 종류
 RESOURCE_TYPES = [
     ('석판', '석판'),
@@ -144,4 +150,67 @@ UPGRADE_COSTS = {
     '경화약': {'floor': 2, 'count': 3},
     '강화섬유': {'floor': 3, 'count': 4},
     '무기석판': {'floor': 2, 'count': 4},
-}
\ No newline at end of file
+}
+
+# 시즌별 비용 표 항목 종류
+COST_TYPES = [
+    ('tomestone', '석판 비용'),
+    ('page', '낱장 교환 비용'),
+    ('upgrade', '강화 아이템 낱장 교환 비용'),
+]
+
+# 보강석판템 강화에 필요한 강화 아이템 (방어구: 강화섬유, 장신구: 경화약, 무기: 무기석판)
+UPGRADE_MATERIALS = {
+    '무기': '무기석판',
+    '모자': '강화섬유',
+    '상의': '강화섬유',
+    '장갑': '강화섬유',
+    '하의': '강화섬유',
+    '신발': '강화섬유',
+    '귀걸이': '경화약',
+    '목걸이': '경화약',
+    '팔찌': '경화약',
+    '반지1': '경화약',
+    '반지2': '경화약',
+}
+
+# 주간 영웅 레이드 층별 드롭 아이템 (분배 계획 기준)
+RAID_FLOOR_DROPS = {
+    1: ['귀걸이', '목걸이', '팔찌', '반지1', '반지2'],  # 1층 드랍
+    2: ['모자', '장갑', '신발'],  # 2층 드랍
+    3: ['상의', '하의'],  # 3층 드랍
+    4: ['무기'],  # 4층 드랍
+}
+
+# 시뮬레이션용 층별 주간 드롭 개수 (RAID_FLOOR_DROPS 중 무작위로 드롭)
+RAID_FLOOR_DROP_COUNTS = {
+    1: 2,
+    2: 2,
+    3: 2,
+    4: 1,
+}
+
+# 주간 석판 획득량 (주간 상한)
+WEEKLY_TOMESTONE_INCOME = 450
+
+# 루팅 시뮬레이션 분배 정책
+LOOT_SIMULATION_POLICIES = [
+    ('priority', '우선순위 분배'),
+    ('fewest', '획득 수 적은 순 분배'),
+    ('random', '무작위 분배'),
+]
+
+# 백그라운드 작업 종류
+BACKGROUND_JOB_TYPES = [
+    ('calculate_priority', '분배 우선순위 계산'),
+    ('generate_distribution_plan', '주간 분배 계획 생성'),
+    ('simulate_loot', '루팅 시뮬레이션'),
+]
+
+# 백그라운드 작업 상태
+BACKGROUND_JOB_STATUSES = [
+    ('pending', '대기'),
+    ('running', '실행 중'),
+    ('succeeded', '완료'),
+    ('failed', '실패'),
+]
@@ -0,0 +1,109 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from bis_manager.constants import ITEM_TYPES, MATERIA_TYPES
+from bis_manager.models import Season, Item, Player, BisSet, BisItem, Materia
+from bis_manager.serializers import BisSetSerializer
+from bis_manager.services.bis_set_read_service import BisSetReadService
+
+SLOTS = [item_type for item_type, _ in ITEM_TYPES]
+
+class Command(BaseCommand):
+    help = '비스 세트 목록 조회의 BisSetSerializer 경로와 values() 조회 경로 처리량을 비교합니다. (임시 데이터는 롤백)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sets', type=int, default=120, help='비교할 비스 세트 수 (기본 120)')
+        parser.add_argument('--iterations', type=int, default=5, help='경로별 반복 횟수 (기본 5)')
+
+    def handle(self, *args, **options):
+        set_count = max(1, options['sets'])
+        iterations = max(1, options['iterations'])
+
+        with transaction.atomic():
+            bis_set_ids = self._create_sets(set_count)
+
+            paths = [
+                ('BisSetSerializer', lambda: BisSetSerializer(BisSet.objects.filter(pk__in=bis_set_ids), many=True).data),
+                ('BisSetSerializer + prefetch', lambda: BisSetSerializer(
+                    BisSet.objects.filter(pk__in=bis_set_ids).select_related('player', 'season').prefetch_related(
+                        'items__item', 'items__materias'
+                    ),
+                    many=True
+                ).data),
+                ('BisSetReadService', lambda: BisSetReadService.to_dicts(bis_set_ids)),
+            ]
+
+            results = []
+            for name, build in paths:
+                query_count = [0]
+
+                def count_query(execute, sql, params, many, context):
+                    query_count[0] += 1
+                    return execute(sql, params, many, context)
+
+                with connection.execute_wrapper(count_query):
+                    build()
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    build()
+                elapsed = (time.perf_counter() - started) / iterations
+                results.append((name, elapsed, query_count[0]))
+
+            self._check_same_shape(bis_set_ids)
+            transaction.set_rollback(True)
+
+        baseline = results[0][1]
+        self.stdout.write(f'비스 세트 {set_count}개, 경로별 {iterations}회 평균')
+        for name, elapsed, query_count in results:
+            self.stdout.write(
+                f'  {name:<28} {elapsed * 1000:8.1f} ms  {set_count / elapsed:9.0f} 세트/초  '
+                f'쿼리 {query_count:5d}개  x{baseline / elapsed:.1f}'
+            )
+        self.stdout.write(self.style.SUCCESS('벤치마크 완료!'))
+
+    def _create_sets(self, set_count):
+        """세트당 전체 슬롯과 마테리쟈를 가진 임시 비스 세트 생성"""
+        season = Season.objects.create(name='벤치마크 시즌', start_date='2025-01-21', is_active=False)
+        items = Item.objects.bulk_create([
+            Item(season=season, name=f'{slot} 벤치마크', type=slot, source='영웅레이드템', item_level=740)
+            for slot in SLOTS
+        ])
+
+        players = [
+            Player.objects.create(nickname=f'벤치마크{season.id}_{index}', job='전사')
+            for index in range((set_count + 1) // 2)
+        ]
+        bis_sets = BisSet.objects.bulk_create([
+            BisSet(player=player, season=season, bis_type=bis_type)
+            for player in players for bis_type in ('출발', '최종')
+        ][:set_count])
+
+        bis_items = BisItem.objects.bulk_create([
+            BisItem(bis_set=bis_set, item=item, slot=item.type)
+            for bis_set in bis_sets for item in items
+        ])
+        materia_types = [materia_type for materia_type, _ in MATERIA_TYPES]
+        Materia.objects.bulk_create([
+            Materia(bis_item=bis_item, type=materia_types[(bis_item.id + slot_number) % len(materia_types)], slot_number=slot_number)
+            for bis_item in bis_items for slot_number in (1, 2)
+        ])
+        return [bis_set.id for bis_set in bis_sets]
+
+    def _check_same_shape(self, bis_set_ids):
+        """두 경로의 결과가 같은지 확인 (아이템/마테리쟈 순서는 ID 순으로 맞춤)"""
+        def normalize(data):
+            data = [dict(bis_set) for bis_set in data]
+            for bis_set in data:
+                bis_set['items'] = sorted(
+                    (dict(bis_item, item=dict(bis_item['item']), materias=sorted(
+                        (dict(materia) for materia in bis_item['materias']), key=lambda materia: materia['id']
+                    )) for bis_item in bis_set['items']),
+                    key=lambda bis_item: bis_item['id']
+                )
+            return sorted(data, key=lambda bis_set: bis_set['id'])
+
+        expected = normalize(BisSetSerializer(BisSet.objects.filter(pk__in=bis_set_ids), many=True).data)
+        if normalize(BisSetReadService.to_dicts(bis_set_ids)) != expected:
+            self.stderr.write(self.style.WARNING('두 경로의 결과가 다릅니다.'))
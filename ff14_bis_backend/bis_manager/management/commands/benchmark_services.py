@@ -0,0 +1,147 @@
+from contextlib import ExitStack
+import json
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from bis_manager.middleware import QueryStats
+from bis_manager.services.distribution_service import DistributionService
+from bis_manager.services.resource_calculation_service import ResourceCalculationService
+from bis_manager.services.synthetic_data import generate_season
+
+DEFAULT_BASELINE = settings.BASE_DIR / 'benchmarks' / 'services.json'
+
+# 이보다 작은 시간 차이는 측정 오차로 보고 회귀로 판단하지 않음
+MIN_TIME_DELTA_MS = 5.0
+
+class Command(BaseCommand):
+    help = (
+        '합성 시즌 데이터로 우선순위 계산/주간 분배 계획/재화 계산의 시간, 쿼리 수, 최대 메모리를 측정하고 '
+        'JSON 기준값과 비교합니다. (임시 데이터는 롤백)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--players', default='8,100,1000', help='쉼표로 구분한 플레이어 수 목록 (기본 8,100,1000)')
+        parser.add_argument('--seed', type=int, default=0, help='합성 데이터 시드 (기본 0)')
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help=f'기준값 JSON 파일 (기본 {DEFAULT_BASELINE})')
+        parser.add_argument('--write-baseline', action='store_true', help='측정 결과를 기준값 파일에 저장')
+        parser.add_argument('--check', action='store_true', help='기준값보다 나빠진 항목이 있으면 실패')
+        parser.add_argument('--tolerance', type=float, default=1.5, help='시간 회귀로 보는 기준값 대비 배율 (기본 1.5)')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted({int(size) for size in options['players'].split(',') if size.strip()})
+        except ValueError:
+            raise CommandError('--players는 쉼표로 구분한 정수 목록이어야 합니다.')
+        if not sizes or sizes[0] < 1:
+            raise CommandError('플레이어 수는 1 이상이어야 합니다.')
+
+        results = {}
+        for players in sizes:
+            self.stdout.write(f'플레이어 {players}명 측정 중...')
+            results[str(players)] = self._run_size(players, options['seed'])
+
+        baseline = self._load_baseline(options['baseline'])
+        regressions = self._report(results, baseline, options['tolerance'])
+
+        if options['write_baseline']:
+            self._write_baseline(options['baseline'], baseline, results, options['seed'])
+            self.stdout.write(f"기준값 저장: {options['baseline']}")
+
+        if options['check'] and regressions:
+            raise CommandError(f'기준값보다 나빠진 항목 {len(regressions)}개: ' + ', '.join(regressions))
+        self.stdout.write(self.style.SUCCESS('벤치마크 완료!'))
+
+    def _run_size(self, players, seed):
+        """플레이어 수 하나의 단계별 측정 (데이터 생성부터 모두 롤백)"""
+        steps = {}
+        with transaction.atomic():
+            season, steps['generate'] = self._measure(lambda: generate_season(players, seed=seed))
+
+            def check(result):
+                if not result.get('success', False):
+                    raise CommandError(result.get('error', '알 수 없는 오류가 발생했습니다.'))
+
+            priority_result, steps['priority'] = self._measure(
+                lambda: DistributionService.calculate_priority_for_season(season.id)
+            )
+            check(priority_result)
+            plan_result, steps['weekly_plan'] = self._measure(
+                lambda: DistributionService.generate_weekly_distribution_plan(season.id)
+            )
+            check(plan_result)
+            _, steps['resources'] = self._measure(
+                lambda: ResourceCalculationService.calculate_resources_for_season(season)
+            )
+            transaction.set_rollback(True)
+        return steps
+
+    def _measure(self, run):
+        """(결과, 측정값) 반환. 시간은 tracemalloc 추적을 켠 상태의 값이라 추적하지 않을 때보다 느리다."""
+        stats = QueryStats()
+        tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(stats))
+                result = run()
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return result, {
+            'wall_ms': round(elapsed * 1000, 1),
+            'db_ms': round(stats.db_time * 1000, 1),
+            'queries': stats.count,
+            'peak_kib': peak // 1024,
+        }
+
+    def _load_baseline(self, path):
+        try:
+            with open(path, encoding='utf-8') as baseline_file:
+                return json.load(baseline_file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            raise CommandError(f'{path}: 기준값 파일을 읽을 수 없습니다: {e}')
+
+    def _write_baseline(self, path, baseline, results, seed):
+        """측정한 플레이어 수의 결과만 덮어쓰고 나머지 기준값은 유지"""
+        sizes = dict(baseline.get('sizes', {}))
+        sizes.update(results)
+        data = {'seed': seed, 'sizes': sizes}
+        try:
+            with open(path, 'w', encoding='utf-8') as baseline_file:
+                json.dump(data, baseline_file, ensure_ascii=False, indent=2, sort_keys=True)
+                baseline_file.write('\n')
+        except OSError as e:
+            raise CommandError(f'{path}: 기준값 파일을 저장할 수 없습니다: {e}')
+
+    def _report(self, results, baseline, tolerance):
+        """결과 표 출력 후 회귀 항목 목록 반환 (쿼리 수 증가, 또는 시간이 tolerance배 이상 증가)"""
+        regressions = []
+        for players, steps in results.items():
+            base_steps = baseline.get('sizes', {}).get(players, {})
+            self.stdout.write(f'플레이어 {players}명')
+            for step, measured in steps.items():
+                line = (
+                    f"  {step:<12} {measured['wall_ms']:10.1f} ms  DB {measured['db_ms']:9.1f} ms  "
+                    f"쿼리 {measured['queries']:6d}개  최대 메모리 {measured['peak_kib']:8d} KiB"
+                )
+                base = base_steps.get(step)
+                if base:
+                    line += f"  (기준 {base['wall_ms']:.1f} ms, 쿼리 {base['queries']}개)"
+                    time_delta = measured['wall_ms'] - base['wall_ms']
+                    if measured['queries'] > base['queries']:
+                        regressions.append(f'{players}명 {step} 쿼리')
+                        line += ' 쿼리 증가'
+                    if time_delta > MIN_TIME_DELTA_MS and measured['wall_ms'] > base['wall_ms'] * tolerance:
+                        regressions.append(f'{players}명 {step} 시간')
+                        line += ' 시간 증가'
+                self.stdout.write(line)
+        return regressions
@@ -0,0 +1,51 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from bis_manager.services.bis_import_service import BisImportService
+
+class Command(BaseCommand):
+    help = '장비 플래너 내보내기 JSON 파일로 비스 세트를 가져옵니다. (여러 파일을 한 트랜잭션으로 처리)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='+', help='플래너 내보내기 JSON 파일 경로')
+        parser.add_argument('--season', type=int, required=True, help='가져올 시즌 ID')
+        parser.add_argument('--dry-run', action='store_true', help='저장하지 않고 검증만 수행')
+
+    def handle(self, *args, **options):
+        sets = []
+        for path in options['files']:
+            try:
+                with open(path, encoding='utf-8') as export_file:
+                    data = json.load(export_file)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'{path}: 파일을 읽을 수 없습니다: {e}')
+
+            # 파일마다 세트 하나 또는 세트 목록
+            if isinstance(data, dict) and 'sets' in data:
+                data = data['sets']
+            sets.extend(data if isinstance(data, list) else [data])
+
+        self.stdout.write(f'비스 세트 {len(sets)}개 가져오기 시작...')
+        result = BisImportService.import_sets(options['season'], {'sets': sets}, dry_run=options['dry_run'])
+
+        if not result.get('success', False):
+            for error in result.get('errors', []):
+                self.stderr.write(f'  - {error}')
+            raise CommandError(result.get('error'))
+
+        for imported in result['sets']:
+            if result.get('dry_run'):
+                self.stdout.write(f"  {imported['player']}({imported['bis_type']}): 슬롯 {imported['slots']}개 확인")
+            else:
+                state = '생성' if imported['created'] else '갱신'
+                self.stdout.write(
+                    f"  {imported['player']}({imported['bis_type']}): {state}, 변경 슬롯 {len(imported['changed_slots'])}개"
+                )
+
+        if result.get('dry_run'):
+            self.stdout.write(self.style.SUCCESS('검증 완료! (저장하지 않음)'))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"비스 세트 가져오기 완료! (새 플레이어 {result['players_created']}명)"
+            ))
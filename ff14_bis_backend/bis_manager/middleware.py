@@ -0,0 +1,193 @@
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+import random
+import time
+
+from django.conf import settings
+from django.db import connections
+
+from bis_manager import tracing
+from bis_manager.services import request_metrics
+
+import logging
+logger = logging.getLogger(__name__)
+
+class QueryBudgetExceeded(Exception):
+    """요청의 쿼리 수가 ViewSet에 선언된 쿼리 예산을 넘음 (QUERY_BUDGET_RAISE일 때만 발생)"""
+
+class QueryStats:
+    """요청 하나의 쿼리 수, 같은 SQL 반복 횟수, DB 시간 기록 (connection.execute_wrapper로 사용)"""
+
+    def __init__(self):
+        self.count = 0
+        self.db_time = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.count += 1
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self):
+        """같은 SQL(파라미터 제외)이 반복 실행된 횟수 (N+1 조회의 신호)"""
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    def most_repeated(self):
+        """가장 많이 반복된 (SQL, 횟수), 반복이 없으면 None"""
+        if not self.statements:
+            return None
+        sql, count = self.statements.most_common(1)[0]
+        return (sql, count) if count > 1 else None
+
+@contextmanager
+def record_queries(request):
+    """요청의 모든 DB 연결 쿼리를 request.query_stats에 기록 (바깥 미들웨어가 이미 기록 중이면 그 기록을 그대로 사용)"""
+    stats = getattr(request, 'query_stats', None)
+    if stats is not None:
+        yield stats
+        return
+
+    stats = QueryStats()
+    request.query_stats = stats
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+        yield stats
+
+def _resolve_view(request):
+    """요청한 뷰 클래스와 액션 이름, 뷰 클래스가 없으면 (None, None)"""
+    match = getattr(request, 'resolver_match', None)
+    view_class = getattr(match.func, 'cls', None) if match else None
+    if view_class is None:
+        return None, None
+
+    actions = getattr(match.func, 'actions', None) or {}
+    return view_class, actions.get(request.method.lower(), request.method.lower())
+
+def get_view_name(request):
+    """측정 기록용 뷰 이름 (ViewSet은 '클래스.액션', 라우트가 없는 요청은 하나로 묶음)"""
+    view_class, action = _resolve_view(request)
+    if view_class is not None:
+        return f'{view_class.__name__}.{action}'
+
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else 'unmatched'
+
+def get_view_budget(request):
+    """요청한 ViewSet 액션의 (액션 이름, 쿼리 예산), 예산이 선언되지 않았으면 예산은 None
+
+    ViewSet은 query_budgets = {액션 이름: 최대 쿼리 수}로 예산을 선언한다.
+    예산은 테스트 데이터로 측정한 값에 인증(세션/토큰) 조회 여유 2개를 더해 정한다.
+    """
+    view_class, action = _resolve_view(request)
+    if view_class is None:
+        return None, None
+    return f'{view_class.__name__}.{action}', getattr(view_class, 'query_budgets', {}).get(action)
+
+class PerformanceMiddleware:
+    """표본으로 뽑은 요청의 DB/뷰/렌더링 시간을 Server-Timing 헤더로 보내고 뷰 액션별 지연 시간 분포에 기록하는 미들웨어
+
+    PERFORMANCE_SAMPLE_RATE(0~1) 비율의 요청만 측정하며, 0이면 설정 확인 외에는 아무것도 하지 않는다.
+    - db: 쿼리 실행 시간 합계 (desc에 쿼리 수)
+    - view: 인증/권한 검사와 직렬화를 포함한 뷰 실행 시간 (DB 시간 포함)
+    - render: 응답 렌더링(JSON 인코딩) 시간
+    - total: 이 미들웨어 안쪽 전체 처리 시간
+    집계는 관리자 전용 /api/_metrics에서 Prometheus 텍스트 형식으로 조회한다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = getattr(settings, 'PERFORMANCE_SAMPLE_RATE', 0)
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return self.get_response(request)
+
+        timings = request.performance_timings = {}
+        started = time.perf_counter()
+        with record_queries(request) as stats:
+            response = self.get_response(request)
+        finished = time.perf_counter()
+
+        view_started = timings.get('view_started')
+        view_finished = timings.get('view_finished', finished)
+        metrics = [('db', stats.db_time, f'{stats.count} queries')]
+        if view_started is not None:
+            metrics.append(('view', view_finished - view_started, None))
+            if 'view_finished' in timings:
+                metrics.append(('render', finished - view_finished, None))
+        metrics.append(('total', finished - started, None))
+
+        response['Server-Timing'] = ', '.join(
+            f'{name};dur={duration * 1000:.1f}' + (f';desc="{desc}"' if desc else '')
+            for name, duration, desc in metrics
+        )
+        request_metrics.observe(
+            get_view_name(request), request.method, response.status_code, finished - started, stats.db_time, stats.count
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = getattr(request, 'performance_timings', None)
+        if timings is not None:
+            timings['view_started'] = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # DRF 응답은 뷰가 끝난 뒤 렌더링되므로 여기까지가 뷰 실행 시간
+        timings = getattr(request, 'performance_timings', None)
+        if timings is not None:
+            timings['view_finished'] = time.perf_counter()
+        return response
+
+class TracingMiddleware:
+    """TRACING_SAMPLE_RATE 비율의 요청을 추적해 요청 하나당 구조화 로그 한 줄로 남기는 미들웨어 (bis_manager.tracing 참고)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not tracing.should_sample():
+            return self.get_response(request)
+
+        with tracing.trace('request', method=request.method, path=request.path) as current:
+            response = self.get_response(request)
+            current.fields.update(view=get_view_name(request), status=response.status_code)
+        return response
+
+class QueryBudgetMiddleware:
+    """요청별 쿼리 수/반복 SQL/DB 시간을 기록하고 ViewSet 액션의 쿼리 예산 초과를 검사하는 미들웨어
+
+    QUERY_BUDGET_ENABLED일 때만 동작하며, 예산을 넘으면 QUERY_BUDGET_RAISE이면 예외(테스트), 아니면 경고 로그를 남긴다.
+    기록은 request.query_stats로 다른 미들웨어에서도 사용할 수 있다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'QUERY_BUDGET_ENABLED', False):
+            return self.get_response(request)
+
+        with record_queries(request) as stats:
+            response = self.get_response(request)
+
+        name, budget = get_view_budget(request)
+        if budget is not None and stats.count > budget:
+            repeated = stats.most_repeated()
+            message = (
+                f"쿼리 예산 초과: {name} {request.method} {request.path} "
+                f"쿼리 {stats.count}개 (예산 {budget}개), 반복 SQL {stats.duplicates}회, DB 시간 {stats.db_time * 1000:.1f}ms"
+            )
+            if repeated:
+                message += f", 가장 많이 반복된 SQL ({repeated[1]}회): {repeated[0][:200]}"
+
+            if getattr(settings, 'QUERY_BUDGET_RAISE', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+        return response
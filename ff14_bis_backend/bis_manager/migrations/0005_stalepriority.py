@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bis_manager', '0004_alter_customuser_profile_image_url'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StalePriority',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('player_id', models.IntegerField(verbose_name='플레이어 ID')),
+                ('slot', models.CharField(choices=[('무기', '무기'), ('모자', '모자'), ('상의', '상의'), ('장갑', '장갑'), ('하의', '하의'), ('신발', '신발'), ('귀걸이', '귀걸이'), ('목걸이', '목걸이'), ('팔찌', '팔찌'), ('반지1', '반지1'), ('반지2', '반지2')], max_length=20, verbose_name='장착 슬롯')),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stale_priorities', to='bis_manager.season', verbose_name='시즌')),
+            ],
+            options={
+                'verbose_name': '갱신 필요 우선순위',
+                'verbose_name_plural': '갱신 필요 우선순위들',
+                'unique_together': {('season', 'player_id', 'slot')},
+            },
+        ),
+    ]
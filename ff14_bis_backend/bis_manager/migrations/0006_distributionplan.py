@@ -0,0 +1,85 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bis_manager', '0005_stalepriority'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DistributionPlanFloor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('floor', models.IntegerField(choices=[(1, '1층'), (2, '2층'), (3, '3층'), (4, '4층')], verbose_name='층수')),
+            ],
+            options={
+                'verbose_name': '분배 계획 층',
+                'verbose_name_plural': '분배 계획 층들',
+                'ordering': ['floor'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DistributionPlan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mode', models.CharField(choices=[('greedy', '균등 분배'), ('optimal', '최적 배정')], default='greedy', max_length=20, verbose_name='분배 방식')),
+                ('week_count', models.IntegerField(default=12, verbose_name='주차 수')),
+                ('summary', models.JSONField(blank=True, default=dict, verbose_name='계획 요약')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성 시간')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정 시간')),
+                ('season', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='distribution_plan', to='bis_manager.season', verbose_name='시즌')),
+            ],
+            options={
+                'verbose_name': '분배 계획',
+                'verbose_name_plural': '분배 계획들',
+            },
+        ),
+        migrations.CreateModel(
+            name='DistributionPlanAssignment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.IntegerField(default=0, verbose_name='층 내 순서')),
+                ('item_type', models.CharField(choices=[('무기', '무기'), ('모자', '모자'), ('상의', '상의'), ('장갑', '장갑'), ('하의', '하의'), ('신발', '신발'), ('귀걸이', '귀걸이'), ('목걸이', '목걸이'), ('팔찌', '팔찌'), ('반지1', '반지1'), ('반지2', '반지2')], max_length=20, verbose_name='아이템 종류')),
+                ('player_name', models.CharField(blank=True, max_length=50, verbose_name='플레이어 이름')),
+                ('original_priority', models.IntegerField(default=0, verbose_name='원래 우선순위')),
+                ('note', models.CharField(blank=True, max_length=100, verbose_name='비고')),
+                ('manual', models.BooleanField(default=False, verbose_name='수동 입력 여부')),
+                ('player', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='plan_assignments', to='bis_manager.player', verbose_name='플레이어')),
+                ('floor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assignments', to='bis_manager.distributionplanfloor', verbose_name='분배 계획 층')),
+            ],
+            options={
+                'verbose_name': '분배 계획 배정',
+                'verbose_name_plural': '분배 계획 배정들',
+                'ordering': ['position'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DistributionPlanWeek',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week', models.IntegerField(verbose_name='주차')),
+                ('manual_input', models.BooleanField(default=False, verbose_name='수동 입력 여부')),
+                ('plan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='weeks', to='bis_manager.distributionplan', verbose_name='분배 계획')),
+            ],
+            options={
+                'verbose_name': '분배 계획 주차',
+                'verbose_name_plural': '분배 계획 주차들',
+                'ordering': ['week'],
+                'unique_together': {('plan', 'week')},
+            },
+        ),
+        migrations.AddField(
+            model_name='distributionplanfloor',
+            name='week',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='floors', to='bis_manager.distributionplanweek', verbose_name='분배 계획 주차'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='distributionplanfloor',
+            unique_together={('week', 'floor')},
+        ),
+    ]
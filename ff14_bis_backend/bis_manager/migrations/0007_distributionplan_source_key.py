@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bis_manager', '0006_distributionplan'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='distributionplan',
+            name='source_key',
+            field=models.CharField(blank=True, max_length=100, verbose_name='계획 원본 키'),
+        ),
+    ]
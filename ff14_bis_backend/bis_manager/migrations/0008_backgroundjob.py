@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:15
+
+import django.core.serializers.json
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bis_manager', '0007_distributionplan_source_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackgroundJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('job_type', models.CharField(choices=[('calculate_priority', '분배 우선순위 계산'), ('generate_distribution_plan', '주간 분배 계획 생성')], max_length=50, verbose_name='작업 종류')),
+                ('params', models.JSONField(blank=True, default=dict, verbose_name='작업 파라미터')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('running', '실행 중'), ('succeeded', '완료'), ('failed', '실패')], default='pending', max_length=20, verbose_name='상태')),
+                ('progress', models.IntegerField(default=0, verbose_name='진행 수')),
+                ('total', models.IntegerField(default=0, verbose_name='전체 수')),
+                ('result', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True, verbose_name='결과')),
+                ('error', models.TextField(blank=True, verbose_name='오류 메시지')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성 시간')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='시작 시간')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='종료 시간')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='background_jobs', to=settings.AUTH_USER_MODEL, verbose_name='요청자')),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='background_jobs', to='bis_manager.season', verbose_name='시즌')),
+            ],
+            options={
+                'verbose_name': '백그라운드 작업',
+                'verbose_name_plural': '백그라운드 작업들',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
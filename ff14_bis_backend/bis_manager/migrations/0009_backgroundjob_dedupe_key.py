@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bis_manager', '0008_backgroundjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='backgroundjob',
+            name='dedupe_key',
+            field=models.CharField(blank=True, db_index=True, max_length=200, null=True, verbose_name='중복 방지 키'),
+        ),
+        migrations.AddConstraint(
+            model_name='backgroundjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'running'])), fields=('dedupe_key',), name='unique_inflight_background_job'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bis_manager', '0009_backgroundjob_dedupe_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='season',
+            name='cost_version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='비용 표 버전'),
+        ),
+        migrations.CreateModel(
+            name='SeasonCost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cost_type', models.CharField(choices=[('tomestone', '석판 비용'), ('page', '낱장 교환 비용'), ('upgrade', '강화 아이템 낱장 교환 비용')], max_length=20, verbose_name='비용 종류')),
+                ('target', models.CharField(max_length=20, verbose_name='대상 (슬롯 또는 강화 아이템)')),
+                ('floor', models.IntegerField(blank=True, choices=[(1, '1층'), (2, '2층'), (3, '3층'), (4, '4층')], null=True, verbose_name='낱장 층')),
+                ('amount', models.PositiveIntegerField(verbose_name='비용')),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='costs', to='bis_manager.season', verbose_name='시즌')),
+            ],
+            options={
+                'verbose_name': '시즌 비용',
+                'verbose_name_plural': '시즌 비용들',
+                'unique_together': {('season', 'cost_type', 'target')},
+            },
+        ),
+    ]
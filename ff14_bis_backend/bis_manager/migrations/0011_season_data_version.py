@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bis_manager', '0010_seasoncost'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='season',
+            name='data_updated_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='데이터 변경 시각'),
+        ),
+        migrations.AddField(
+            model_name='season',
+            name='data_version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='데이터 버전'),
+        ),
+    ]
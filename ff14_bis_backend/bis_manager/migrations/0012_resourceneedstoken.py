@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bis_manager', '0011_season_data_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResourceNeedsToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('player_id', models.IntegerField(verbose_name='플레이어 ID')),
+                ('token', models.CharField(max_length=32, verbose_name='세대 토큰')),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resource_needs_tokens', to='bis_manager.season', verbose_name='시즌')),
+            ],
+            options={
+                'verbose_name': '필요 재화 캐시 토큰',
+                'verbose_name_plural': '필요 재화 캐시 토큰들',
+                'unique_together': {('season', 'player_id')},
+            },
+        ),
+    ]
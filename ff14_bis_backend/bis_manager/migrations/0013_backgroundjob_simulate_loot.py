@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bis_manager', '0012_resourceneedstoken'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='backgroundjob',
+            name='job_type',
+            field=models.CharField(choices=[('calculate_priority', '분배 우선순위 계산'), ('generate_distribution_plan', '주간 분배 계획 생성'), ('simulate_loot', '루팅 시뮬레이션')], max_length=50, verbose_name='작업 종류'),
+        ),
+    ]
@@ -3,6 +3,9 @@ from .season import Season
 from .item import Item
 from .player import Player
 from .bis import BisSet, BisItem, Materia
-from .raid import RaidProgress, ItemAcquisition, DistributionPriority
-from .resource import ResourceTracking
-from .schedule import Schedule
\ No newline at end of file
+from .raid import RaidProgress, ItemAcquisition, DistributionPriority, StalePriority
+from .resource import ResourceTracking, ResourceNeedsToken
+from .schedule import Schedule
+from .plan import DistributionPlan, DistributionPlanWeek, DistributionPlanFloor, DistributionPlanAssignment
+from .job import BackgroundJob
+from .cost import SeasonCost
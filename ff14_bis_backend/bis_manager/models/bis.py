@@ -3,9 +3,7 @@ from bis_manager.constants import ITEM_TYPES, MATERIA_TYPES, BIS_TYPES
 from .season import Season
 from .player import Player
 from .item import Item
-
-import logging
-logger = logging.getLogger(__name__)
+from bis_manager import tracing
 
 class BisSet(models.Model):
     player = models.ForeignKey(
@@ -35,19 +33,13 @@ class BisSet(models.Model):
         return f"{self.player.nickname}의 {self.get_bis_type_display()} ({self.season.name})"
     
     def save(self, *args, **kwargs):
-        """저장 과정을 로깅"""
-        # 로깅 - ID가 None인 경우(신규 생성) 처리
-        id_info = f"ID={self.id}" if self.id else "새 객체"
-        logger.info(
-            f"BisSet.save 호출: {id_info}, player_id={self.player_id}, "
-            f"season_id={self.season_id}, bis_type={self.bis_type}"
-        )
-        
-        # 원래 저장 로직 실행
+        """저장 후 추적 중이면 저장 이벤트 기록"""
+        created = self.pk is None
         super().save(*args, **kwargs)
-        
-        # 저장 후 로깅
-        logger.info(f"BisSet 저장 완료: ID={self.id}, bis_type={self.bis_type}")
+        tracing.event(
+            'bis_set.save', id=self.id, created=created,
+            player_id=self.player_id, season_id=self.season_id, bis_type=self.bis_type
+        )
 
 class BisItem(models.Model):
     bis_set = models.ForeignKey(
@@ -77,23 +69,17 @@ class BisItem(models.Model):
         return f"{self.bis_set}의 {self.get_slot_display()} - {self.item.name}"
     
     def save(self, *args, **kwargs):
-        """저장 과정을 로깅하고 각 비스 세트는 독립적으로 처리"""
-        # 로깅
-        id_info = f"ID={self.id}" if self.id else "새 객체"
-        bis_set_info = f"bis_set_id={self.bis_set_id}" if self.bis_set_id else "bis_set 없음"
-        
-        logger.info(
-            f"BisItem.save 호출: {id_info}, {bis_set_info}, "
-            f"slot={self.slot}, item_id={self.item_id if hasattr(self, 'item') else None}"
-        )
+        """각 비스 세트는 독립적으로 처리하고, 저장 후 추적 중이면 저장 이벤트 기록"""
+        created = self.pk is None
         
         # 트랜잭션으로 각 비스 세트를 독립적으로 처리
         with transaction.atomic():
-            # 원래 저장 로직 실행
             super().save(*args, **kwargs)
         
-        # 저장 후 로깅
-        logger.info(f"BisItem 저장 완료: ID={self.id}, bis_set_id={self.bis_set_id}, slot={self.slot}")
+        tracing.event(
+            'bis_item.save', id=self.id, created=created,
+            bis_set_id=self.bis_set_id, slot=self.slot, item_id=self.item_id
+        )
     
     def get_max_materia_slots(self):
         """아이템에 장착 가능한 최대 마테리쟈 슬롯 수 반환"""
@@ -127,19 +113,13 @@ class Materia(models.Model):
         return f"{self.bis_item}의 마테리쟈 {self.slot_number}번 - {self.get_type_display()}"
     
     def save(self, *args, **kwargs):
-        """저장 과정 로깅"""
-        # 로깅
-        id_info = f"ID={self.id}" if self.id else "새 객체"
-        logger.info(
-            f"Materia.save 호출: {id_info}, "
-            f"bis_item_id={self.bis_item_id}, type={self.type}, slot_number={self.slot_number}"
-        )
-        
-        # 원래 저장 로직 실행
+        """저장 후 추적 중이면 저장 이벤트 기록"""
+        created = self.pk is None
         super().save(*args, **kwargs)
-        
-        # 저장 후 로깅
-        logger.info(f"Materia 저장 완료: ID={self.id}, type={self.type}")
+        tracing.event(
+            'materia.save', id=self.id, created=created,
+            bis_item_id=self.bis_item_id, type=self.type, slot_number=self.slot_number
+        )
     
     def clean(self):
         from django.core.exceptions import ValidationError
@@ -0,0 +1,39 @@
+from django.core.exceptions import ValidationError
+from django.db import models
+from bis_manager.constants import COST_TYPES, ITEM_TYPES, UPGRADE_COSTS, RAID_FLOORS
+from .season import Season
+
+class SeasonCost(models.Model):
+    """시즌별 비용 표 항목 (없는 항목은 constants의 기본 비용 사용)
+
+    - tomestone: target 슬롯의 석판 가격 (amount)
+    - page: target 슬롯의 낱장 교환 층(floor)과 개수(amount)
+    - upgrade: target 강화 아이템의 낱장 교환 층(floor)과 개수(amount)
+    """
+    season = models.ForeignKey(
+        Season,
+        on_delete=models.CASCADE,
+        related_name='costs',
+        verbose_name="시즌"
+    )
+    cost_type = models.CharField(max_length=20, choices=COST_TYPES, verbose_name="비용 종류")
+    target = models.CharField(max_length=20, verbose_name="대상 (슬롯 또는 강화 아이템)")
+    floor = models.IntegerField(choices=RAID_FLOORS, null=True, blank=True, verbose_name="낱장 층")
+    amount = models.PositiveIntegerField(verbose_name="비용")
+    
+    class Meta:
+        unique_together = ('season', 'cost_type', 'target')
+        verbose_name = "시즌 비용"
+        verbose_name_plural = "시즌 비용들"
+    
+    def __str__(self):
+        return f"{self.season.name} {self.get_cost_type_display()} - {self.target}: {self.amount}"
+    
+    def clean(self):
+        slots = [slot for slot, _ in ITEM_TYPES]
+        if self.cost_type in ('tomestone', 'page') and self.target not in slots:
+            raise ValidationError({'target': f'슬롯 중 하나를 입력해주세요: {", ".join(slots)}'})
+        if self.cost_type == 'upgrade' and self.target not in UPGRADE_COSTS:
+            raise ValidationError({'target': f'강화 아이템 중 하나를 입력해주세요: {", ".join(UPGRADE_COSTS)}'})
+        if self.cost_type in ('page', 'upgrade') and self.floor is None:
+            raise ValidationError({'floor': '낱장 층을 입력해주세요.'})
@@ -0,0 +1,58 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from bis_manager.constants import BACKGROUND_JOB_TYPES, BACKGROUND_JOB_STATUSES
+from .season import Season
+from .user import CustomUser
+import uuid
+
+class BackgroundJob(models.Model):
+    """요청 스레드 밖에서 실행되는 계산 작업 (어느 워커에서든 상태를 조회할 수 있도록 DB에 저장)"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    job_type = models.CharField(max_length=50, choices=BACKGROUND_JOB_TYPES, verbose_name="작업 종류")
+    season = models.ForeignKey(
+        Season,
+        on_delete=models.CASCADE,
+        related_name='background_jobs',
+        verbose_name="시즌"
+    )
+    params = models.JSONField(default=dict, blank=True, verbose_name="작업 파라미터")
+    # 같은 키의 작업은 동시에 하나만 실행 (JobService.dedupe_key, 진행 중 작업 뒤의 대기 작업은 키 없음)
+    dedupe_key = models.CharField(max_length=200, null=True, blank=True, db_index=True, verbose_name="중복 방지 키")
+    status = models.CharField(
+        max_length=20,
+        choices=BACKGROUND_JOB_STATUSES,
+        default='pending',
+        verbose_name="상태"
+    )
+    # 처리한 플레이어 수 / 전체 플레이어 수
+    progress = models.IntegerField(default=0, verbose_name="진행 수")
+    total = models.IntegerField(default=0, verbose_name="전체 수")
+    result = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder, verbose_name="결과")
+    error = models.TextField(blank=True, verbose_name="오류 메시지")
+    requested_by = models.ForeignKey(
+        CustomUser,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='background_jobs',
+        verbose_name="요청자"
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성 시간")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="시작 시간")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="종료 시간")
+    
+    class Meta:
+        verbose_name = "백그라운드 작업"
+        verbose_name_plural = "백그라운드 작업들"
+        ordering = ['-created_at']
+        constraints = [
+            # 프로세스가 달라도 같은 키의 진행 중 작업은 하나만 존재
+            models.UniqueConstraint(
+                fields=['dedupe_key'],
+                condition=models.Q(status__in=['pending', 'running']),
+                name='unique_inflight_background_job'
+            )
+        ]
+    
+    def __str__(self):
+        return f"{self.get_job_type_display()} ({self.get_status_display()})"
@@ -0,0 +1,106 @@
+from django.db import models
+from bis_manager.constants import RAID_FLOORS, ITEM_TYPES, DISTRIBUTION_PLAN_MODES
+from .season import Season
+from .player import Player
+
+class DistributionPlan(models.Model):
+    season = models.OneToOneField(
+        Season,
+        on_delete=models.CASCADE,
+        related_name='distribution_plan',
+        verbose_name="시즌"
+    )
+    mode = models.CharField(
+        max_length=20,
+        choices=DISTRIBUTION_PLAN_MODES,
+        default='greedy',
+        verbose_name="분배 방식"
+    )
+    week_count = models.IntegerField(default=12, verbose_name="주차 수")
+    # 계획 계산에 사용한 우선순위/파라미터의 내용 해시 (같으면 다시 저장하지 않음)
+    source_key = models.CharField(max_length=100, blank=True, verbose_name="계획 원본 키")
+    # 플레이어별 획득 현황, 미획득 아이템, 목표 아이템 개수 등 계획 요약
+    summary = models.JSONField(default=dict, blank=True, verbose_name="계획 요약")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="생성 시간")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="수정 시간")
+    
+    class Meta:
+        verbose_name = "분배 계획"
+        verbose_name_plural = "분배 계획들"
+    
+    def __str__(self):
+        return f"{self.season.name} 분배 계획 ({self.get_mode_display()})"
+
+class DistributionPlanWeek(models.Model):
+    plan = models.ForeignKey(
+        DistributionPlan,
+        on_delete=models.CASCADE,
+        related_name='weeks',
+        verbose_name="분배 계획"
+    )
+    week = models.IntegerField(verbose_name="주차")
+    manual_input = models.BooleanField(default=False, verbose_name="수동 입력 여부")
+    
+    class Meta:
+        unique_together = ('plan', 'week')
+        ordering = ['week']
+        verbose_name = "분배 계획 주차"
+        verbose_name_plural = "분배 계획 주차들"
+    
+    def __str__(self):
+        return f"{self.plan} - {self.week}주차"
+
+class DistributionPlanFloor(models.Model):
+    week = models.ForeignKey(
+        DistributionPlanWeek,
+        on_delete=models.CASCADE,
+        related_name='floors',
+        verbose_name="분배 계획 주차"
+    )
+    floor = models.IntegerField(
+        choices=RAID_FLOORS,
+        verbose_name="층수"
+    )
+    
+    class Meta:
+        unique_together = ('week', 'floor')
+        ordering = ['floor']
+        verbose_name = "분배 계획 층"
+        verbose_name_plural = "분배 계획 층들"
+    
+    def __str__(self):
+        return f"{self.week} - {self.get_floor_display()}"
+
+class DistributionPlanAssignment(models.Model):
+    floor = models.ForeignKey(
+        DistributionPlanFloor,
+        on_delete=models.CASCADE,
+        related_name='assignments',
+        verbose_name="분배 계획 층"
+    )
+    position = models.IntegerField(default=0, verbose_name="층 내 순서")
+    item_type = models.CharField(
+        max_length=20,
+        choices=ITEM_TYPES,
+        verbose_name="아이템 종류"
+    )
+    player = models.ForeignKey(
+        Player,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='plan_assignments',
+        verbose_name="플레이어"
+    )
+    player_name = models.CharField(max_length=50, blank=True, verbose_name="플레이어 이름")
+    original_priority = models.IntegerField(default=0, verbose_name="원래 우선순위")
+    note = models.CharField(max_length=100, blank=True, verbose_name="비고")
+    manual = models.BooleanField(default=False, verbose_name="수동 입력 여부")
+    
+    class Meta:
+        ordering = ['position']
+        verbose_name = "분배 계획 배정"
+        verbose_name_plural = "분배 계획 배정들"
+    
+    def __str__(self):
+        return f"{self.floor} - {self.item_type} -> {self.player_name}"
@@ -79,4 +79,36 @@ class DistributionPriority(models.Model):
         verbose_name_plural = "분배 우선순위들"
     
     def __str__(self):
-        return f"{self.season.name} - {self.player.nickname}의 {self.get_item_type_display()} 우선순위: {self.priority}"
\ No newline at end of file
+        return f"{self.season.name} - {self.player.nickname}의 {self.get_item_type_display()} 우선순위: {self.priority}"
+
+class StalePriority(models.Model):
+    """비스 변경으로 다시 계산해야 하는 (시즌, 플레이어, 슬롯) 표시"""
+    season = models.ForeignKey(
+        Season,
+        on_delete=models.CASCADE,
+        related_name='stale_priorities',
+        verbose_name="시즌"
+    )
+    # 플레이어 삭제로 인한 표시도 남겨야 하므로 외래키 대신 ID만 저장
+    player_id = models.IntegerField(verbose_name="플레이어 ID")
+    slot = models.CharField(
+        max_length=20,
+        choices=ITEM_TYPES,
+        verbose_name="장착 슬롯"
+    )
+    
+    class Meta:
+        unique_together = ('season', 'player_id', 'slot')
+        verbose_name = "갱신 필요 우선순위"
+        verbose_name_plural = "갱신 필요 우선순위들"
+    
+    def __str__(self):
+        return f"{self.season_id} - 플레이어 {self.player_id}의 {self.slot} 갱신 필요"
+    
+    @classmethod
+    def mark(cls, season_id, player_id, slots):
+        """해당 슬롯들의 우선순위를 갱신 필요 상태로 표시"""
+        cls.objects.bulk_create(
+            [cls(season_id=season_id, player_id=player_id, slot=slot) for slot in slots],
+            ignore_conflicts=True
+        )
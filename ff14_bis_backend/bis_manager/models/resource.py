@@ -30,4 +30,23 @@ class ResourceTracking(models.Model):
         verbose_name_plural = "재화 현황들"
     
     def __str__(self):
-        return f"{self.player.nickname}의 {self.get_resource_type_display()} - {self.current_amount}/{self.total_needed}"
\ No newline at end of file
+        return f"{self.player.nickname}의 {self.get_resource_type_display()} - {self.current_amount}/{self.total_needed}"
+class ResourceNeedsToken(models.Model):
+    """(시즌, 플레이어)별 필요 재화 캐시 세대 토큰 (비스 변경과 같은 트랜잭션에서 교체)"""
+    season = models.ForeignKey(
+        Season,
+        on_delete=models.CASCADE,
+        related_name='resource_needs_tokens',
+        verbose_name="시즌"
+    )
+    # 플레이어 삭제 후에도 토큰을 교체할 수 있도록 외래키 대신 ID만 저장
+    player_id = models.IntegerField(verbose_name="플레이어 ID")
+    token = models.CharField(max_length=32, verbose_name="세대 토큰")
+    
+    class Meta:
+        unique_together = ('season', 'player_id')
+        verbose_name = "필요 재화 캐시 토큰"
+        verbose_name_plural = "필요 재화 캐시 토큰들"
+    
+    def __str__(self):
+        return f"{self.season_id} - 플레이어 {self.player_id}: {self.token}"
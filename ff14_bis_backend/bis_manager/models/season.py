@@ -12,6 +12,11 @@ class Season(models.Model):
         default='우선순위분배',
         verbose_name="분배 방식"
     )
+    # 시즌 비용 표가 바뀔 때마다 증가 (컴파일된 비용 표 캐시 키)
+    cost_version = models.PositiveIntegerField(default=0, editable=False, verbose_name="비용 표 버전")
+    # 시즌 데이터(비스/우선순위/재화/레이드 기록)가 바뀔 때마다 증가 (조회 응답의 ETag)
+    data_version = models.PositiveIntegerField(default=0, editable=False, verbose_name="데이터 버전")
+    data_updated_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name="데이터 변경 시각")
     
     def __str__(self):
         return self.name
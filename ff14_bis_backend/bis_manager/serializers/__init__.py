@@ -5,4 +5,5 @@ from .bis_serializers import BisSetSerializer, BisItemSerializer, MateriaSeriali
 from .raid_serializers import RaidProgressSerializer, ItemAcquisitionSerializer, DistributionPrioritySerializer
 from .resource_serializers import ResourceTrackingSerializer
 from .user_serializers import UserSerializer, RegisterSerializer, UserProfileUpdateSerializer
-from .schedule_serializers import ScheduleSerializer
\ No newline at end of file
+from .schedule_serializers import ScheduleSerializer
+from .job_serializers import BackgroundJobSerializer
\ No newline at end of file
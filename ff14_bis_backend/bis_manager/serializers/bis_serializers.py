@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from bis_manager.models import BisSet, BisItem, Materia
+from bis_manager.models import BisSet, BisItem, Materia, Item
 from .item_serializers import ItemSerializer
 
 class MateriaSerializer(serializers.ModelSerializer):
@@ -12,7 +12,7 @@ class MateriaSerializer(serializers.ModelSerializer):
 class BisItemSerializer(serializers.ModelSerializer):
     item = ItemSerializer(read_only=True)
     item_id = serializers.PrimaryKeyRelatedField(
-        queryset=BisItem.objects.all(),
+        queryset=Item.objects.all(),
         source='item',
         write_only=True
     )
@@ -0,0 +1,12 @@
+from rest_framework import serializers
+from bis_manager.models import BackgroundJob
+
+class BackgroundJobSerializer(serializers.ModelSerializer):
+    job_type_display = serializers.CharField(source='get_job_type_display', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    
+    class Meta:
+        model = BackgroundJob
+        fields = ['id', 'job_type', 'job_type_display', 'season', 'params', 'status', 'status_display',
+                  'progress', 'total', 'result', 'error', 'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
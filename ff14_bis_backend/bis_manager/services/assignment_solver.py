@@ -0,0 +1,80 @@
+# ff14_bis_backend/bis_manager/services/assignment_solver.py
+
+def solve_assignment(cost):
+    """최소 비용 배정 문제 풀이 (헝가리안 알고리즘, 직사각 행렬 지원)
+
+    cost[i][j]는 행 i를 열 j에 배정하는 비용이다.
+    행과 열 중 작은 쪽은 모두 배정되며, 행별로 배정된 열 인덱스(배정되지 않으면 None) 목록을 반환한다.
+    시간 복잡도는 O(min(n, m)^2 * max(n, m))이다.
+    """
+    row_count = len(cost)
+    if row_count == 0:
+        return []
+    col_count = len(cost[0])
+    if col_count == 0:
+        return [None] * row_count
+
+    # 행이 열보다 많으면 전치하여 풀고 결과를 되돌림
+    if row_count > col_count:
+        transposed = [[cost[i][j] for i in range(row_count)] for j in range(col_count)]
+        col_assignment = solve_assignment(transposed)
+        result = [None] * row_count
+        for j, i in enumerate(col_assignment):
+            result[i] = j
+        return result
+
+    n, m = row_count, col_count
+    inf = float('inf')
+    u = [0] * (n + 1)
+    v = [0] * (m + 1)
+    match = [0] * (m + 1)  # match[j]: 열 j에 배정된 행 (1부터 시작, 0은 미배정)
+    way = [0] * (m + 1)
+
+    for i in range(1, n + 1):
+        match[0] = i
+        j0 = 0
+        min_value = [inf] * (m + 1)
+        used = [False] * (m + 1)
+
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            row = cost[i0 - 1]
+            u_i0 = u[i0]
+            delta = inf
+            j1 = 0
+
+            for j in range(1, m + 1):
+                if not used[j]:
+                    current = row[j - 1] - u_i0 - v[j]
+                    if current < min_value[j]:
+                        min_value[j] = current
+                        way[j] = j0
+                    if min_value[j] < delta:
+                        delta = min_value[j]
+                        j1 = j
+
+            for j in range(m + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_value[j] -= delta
+
+            j0 = j1
+            if match[j0] == 0:
+                break
+
+        # 증가 경로를 따라 배정 갱신
+        while True:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+            if j0 == 0:
+                break
+
+    result = [None] * n
+    for j in range(1, m + 1):
+        if match[j]:
+            result[match[j] - 1] = j - 1
+    return result
@@ -0,0 +1,274 @@
+# ff14_bis_backend/bis_manager/services/bis_import_service.py
+"""외부 장비 플래너에서 내보낸 JSON 파일로 비스 세트를 가져오는 서비스
+
+파일 형식 (네트워크 조회 없이 로컬 파일만 사용):
+{
+  "sets": [
+    {
+      "player": "닉네임",
+      "job": "전사",                 # 새 플레이어를 만들 때만 필요
+      "bis_type": "최종",            # 생략하면 최종
+      "gear": [
+        {"slot": "Weapon", "name": "아이템 이름", "item_level": 740, "materia": ["무략", "야망"]}
+      ]
+    }
+  ]
+}
+- 세트 하나만 담긴 파일은 "sets" 없이 세트 객체를 최상위에 둘 수 있다.
+- gear는 목록 또는 {슬롯: 장비} 객체이며, 슬롯은 한국어 슬롯 이름이나 플래너의 영문 슬롯 이름을 쓸 수 있다.
+- materia 항목은 마테리쟈 종류로 시작하는 문자열(예: "무략 마테리쟈 XII") 또는 {"type": 종류} 객체이다.
+"""
+import re
+
+from django.db import transaction
+
+from bis_manager.constants import ITEM_TYPES, MATERIA_TYPES, BIS_TYPES, JOB_CHOICES, RING_SLOTS
+from bis_manager.models import Season, Player, BisSet, Item
+from .bis_set_bulk_service import BisSetBulkService
+from . import data_version
+
+import logging
+logger = logging.getLogger(__name__)
+
+SLOTS = [item_type for item_type, _ in ITEM_TYPES]
+
+# 플래너 영문 슬롯 이름 -> 슬롯
+SLOT_ALIASES = {
+    'weapon': '무기', 'mainhand': '무기',
+    'head': '모자',
+    'body': '상의',
+    'hand': '장갑', 'hands': '장갑',
+    'legs': '하의',
+    'feet': '신발',
+    'ears': '귀걸이', 'earrings': '귀걸이',
+    'neck': '목걸이', 'necklace': '목걸이',
+    'wrist': '팔찌', 'wrists': '팔찌', 'bracelet': '팔찌', 'bracelets': '팔찌',
+    'ringleft': '반지1', 'ring1': '반지1', 'leftring': '반지1',
+    'ringright': '반지2', 'ring2': '반지2', 'rightring': '반지2',
+}
+
+# 긴 이름이 먼저 일치하도록 정렬
+MATERIA_NAMES = sorted((materia_type for materia_type, _ in MATERIA_TYPES), key=len, reverse=True)
+
+def _normalize_name(name):
+    return re.sub(r'\s+', ' ', str(name)).strip().casefold()
+
+def _slot_group(slot):
+    """반지는 반지1/반지2 어느 슬롯 아이템이든 같은 반지로 취급"""
+    return '반지' if slot in RING_SLOTS else slot
+
+class ItemLookupIndex:
+    """시즌 아이템을 (이름, 슬롯, 아이템 레벨)로 찾는 색인 (시즌 아이템 조회 1회)"""
+
+    def __init__(self, items):
+        self.items = {item.id: item for item in items}
+        self._by_level = {}
+        self._by_name = {}
+        for item in self.items.values():
+            key = (_normalize_name(item.name), _slot_group(item.type))
+            self._by_level.setdefault(key + (item.item_level,), []).append(item)
+            self._by_name.setdefault(key, []).append(item)
+
+    @classmethod
+    def for_season(cls, season):
+        return cls(Item.objects.filter(season=season))
+
+    def find(self, name, slot, item_level=None):
+        """일치하는 아이템이 하나뿐이면 그 아이템, 없거나 여러 개면 None
+
+        아이템 레벨이 주어지면 이름/슬롯/레벨이 모두 같은 아이템을 찾는다.
+        """
+        key = (_normalize_name(name), _slot_group(slot))
+        if item_level is not None:
+            candidates = self._by_level.get(key + (item_level,), [])
+        else:
+            candidates = self._by_name.get(key, [])
+        return candidates[0] if len(candidates) == 1 else None
+
+class BisImportService:
+    """장비 플래너 내보내기 파일로 비스 세트/아이템/마테리쟈를 일괄 생성하는 서비스 클래스"""
+
+    @staticmethod
+    def import_sets(season_id, data, dry_run=False, allowed_players=None):
+        """내보내기 데이터의 모든 세트를 한 트랜잭션에서 가져오기
+
+        한 세트라도 아이템을 찾지 못하거나 구성이 올바르지 않으면 아무것도 저장하지 않는다.
+        dry_run이면 검증만 하고 저장하지 않는다.
+        allowed_players: 가져올 수 있는 플레이어 닉네임 목록 (None이면 제한 없음)
+        """
+        try:
+            season = Season.objects.get(pk=season_id)
+        except (Season.DoesNotExist, TypeError, ValueError):
+            return {'success': False, 'error': '존재하지 않는 시즌입니다.'}
+
+        specs, errors = BisImportService.parse(data)
+        if not errors and allowed_players is not None:
+            errors = [
+                f"{spec['player']}: 본인의 캐릭터 비스 세트만 가져올 수 있습니다."
+                for spec in specs if spec['player'] not in allowed_players
+            ]
+        if errors:
+            return {'success': False, 'error': '가져오기 파일 형식이 올바르지 않습니다.', 'errors': errors}
+
+        index = ItemLookupIndex.for_season(season)
+        players = {player.nickname: player for player in Player.objects.filter(nickname__in=[spec['player'] for spec in specs])}
+
+        validated = []
+        for spec in specs:
+            label = f"{spec['player']}({spec['bis_type']})"
+            if spec['player'] not in players and not spec['job']:
+                errors.append(f'{label}: 새 플레이어는 job이 필요합니다.')
+
+            items_data, resolve_errors = BisImportService._resolve_gear(spec['gear'], index)
+            slots, validate_errors = BisSetBulkService.validate(season.id, items_data, items=index.items)
+            errors.extend(f'{label} {error}' for error in resolve_errors + validate_errors)
+            validated.append((spec, slots))
+
+        if errors:
+            return {'success': False, 'error': '가져올 수 없는 세트가 있습니다.', 'errors': errors}
+
+        if dry_run:
+            return {
+                'success': True,
+                'dry_run': True,
+                'sets': [{'player': spec['player'], 'bis_type': spec['bis_type'], 'slots': len(slots)} for spec, slots in validated]
+            }
+
+        with transaction.atomic():
+            players_created = 0
+            for spec in specs:
+                if spec['player'] not in players:
+                    # 직업 타입은 Player.save에서 설정되므로 개별 생성
+                    players[spec['player']] = Player.objects.create(nickname=spec['player'], job=spec['job'])
+                    players_created += 1
+
+            bis_sets = {
+                (bis_set.player_id, bis_set.bis_type): bis_set
+                for bis_set in BisSet.objects.filter(
+                    season=season, player__in=players.values(), bis_type__in={spec['bis_type'] for spec in specs}
+                )
+            }
+            new_sets = [
+                BisSet(player=players[spec['player']], season=season, bis_type=spec['bis_type'])
+                for spec in specs if (players[spec['player']].id, spec['bis_type']) not in bis_sets
+            ]
+            if new_sets:
+                BisSet.objects.bulk_create(new_sets)
+                bis_sets.update({(bis_set.player_id, bis_set.bis_type): bis_set for bis_set in new_sets})
+                # 일괄 생성은 시그널을 보내지 않음
+                data_version.bump(season.id)
+
+            slots_by_set = [
+                (bis_sets[(players[spec['player']].id, spec['bis_type'])], slots)
+                for spec, slots in validated
+            ]
+            changes = BisSetBulkService.write(slots_by_set)
+
+        logger.info(
+            f"비스 세트 가져오기 완료: 시즌 ID={season.id}, 세트 {len(slots_by_set)}개, "
+            f"새 세트 {len(new_sets)}개, 새 플레이어 {players_created}명"
+        )
+
+        new_set_ids = {bis_set.id for bis_set in new_sets}
+        return {
+            'success': True,
+            'players_created': players_created,
+            'sets': [
+                {
+                    'bis_set_id': bis_set.id,
+                    'player': spec['player'],
+                    'bis_type': spec['bis_type'],
+                    'created': bis_set.id in new_set_ids,
+                    'changed_slots': changes[bis_set.id]
+                }
+                for (spec, _), (bis_set, _) in zip(validated, slots_by_set)
+            ]
+        }
+
+    @staticmethod
+    def parse(data):
+        """내보내기 데이터를 세트 목록 [{'player', 'job', 'bis_type', 'gear'}]으로 변환 후 (세트 목록, 오류 목록) 반환"""
+        if isinstance(data, dict) and 'sets' in data:
+            raw_sets = data['sets']
+        elif isinstance(data, list):
+            raw_sets = data
+        else:
+            raw_sets = [data]
+
+        if not isinstance(raw_sets, list) or not raw_sets:
+            return [], ['가져올 세트가 없습니다.']
+
+        bis_types = {bis_type for bis_type, _ in BIS_TYPES}
+        jobs = {job for job, _ in JOB_CHOICES}
+        specs = []
+        errors = []
+        seen = set()
+        for position, raw in enumerate(raw_sets, start=1):
+            if not isinstance(raw, dict):
+                errors.append(f'{position}번째 세트: 객체여야 합니다.')
+                continue
+
+            player = str(raw.get('player') or '').strip()
+            bis_type = raw.get('bis_type') or '최종'
+            job = raw.get('job')
+            gear = raw.get('gear')
+
+            if not player:
+                errors.append(f'{position}번째 세트: player가 필요합니다.')
+                continue
+            if bis_type not in bis_types:
+                errors.append(f'{player}: 알 수 없는 비스 종류입니다: {bis_type}')
+                continue
+            if job and job not in jobs:
+                errors.append(f'{player}: 알 수 없는 직업입니다: {job}')
+                continue
+            if (player, bis_type) in seen:
+                errors.append(f'{player}({bis_type}): 같은 세트가 여러 번 포함되어 있습니다.')
+                continue
+            if isinstance(gear, dict):
+                gear = [dict(entry, slot=slot) if isinstance(entry, dict) else entry for slot, entry in gear.items()]
+            if not isinstance(gear, list):
+                errors.append(f'{player}({bis_type}): gear는 목록 또는 객체여야 합니다.')
+                continue
+
+            seen.add((player, bis_type))
+            specs.append({'player': player, 'job': job, 'bis_type': bis_type, 'gear': gear})
+
+        return specs, errors
+
+    @staticmethod
+    def _resolve_gear(gear, index):
+        """플래너 장비 목록을 일괄 편집 요청 형식으로 변환 후 (items_data, 오류 목록) 반환"""
+        items_data = []
+        errors = []
+        for entry in gear:
+            if not isinstance(entry, dict):
+                errors.append('장비 항목은 객체여야 합니다.')
+                continue
+
+            raw_slot = str(entry.get('slot') or '')
+            slot = raw_slot if raw_slot in SLOTS else SLOT_ALIASES.get(re.sub(r'[\s_-]', '', raw_slot).lower())
+            if slot is None:
+                errors.append(f'알 수 없는 슬롯입니다: {raw_slot}')
+                continue
+
+            item_level = entry.get('item_level', entry.get('ilvl'))
+            try:
+                item_level = int(item_level) if item_level is not None else None
+            except (TypeError, ValueError):
+                errors.append(f'{slot}: 아이템 레벨이 올바르지 않습니다.')
+                continue
+
+            item = index.find(entry.get('name') or '', slot, item_level)
+            if item is None:
+                errors.append(f"{slot}: 아이템을 찾을 수 없습니다: {entry.get('name')} (IL {item_level})")
+                continue
+
+            materias = []
+            for slot_number, materia in enumerate(entry.get('materia') or [], start=1):
+                name = materia.get('type') if isinstance(materia, dict) else materia
+                materia_type = next((known for known in MATERIA_NAMES if str(name).startswith(known)), name)
+                materias.append({'slot_number': slot_number, 'type': materia_type})
+
+            items_data.append({'slot': slot, 'item_id': item.id, 'materias': materias})
+        return items_data, errors
@@ -0,0 +1,237 @@
+# ff14_bis_backend/bis_manager/services/bis_set_bulk_service.py
+from django.db import transaction
+
+from bis_manager.constants import ITEM_TYPES, MATERIA_TYPES, RING_SLOTS
+from bis_manager.models import BisSet, BisItem, Materia, Item, StalePriority
+from bis_manager.signals import changes_handled_by_caller
+from . import resource_needs_cache, data_version
+
+import logging
+logger = logging.getLogger(__name__)
+
+SLOTS = [item_type for item_type, _ in ITEM_TYPES]
+MATERIAS = {materia_type for materia_type, _ in MATERIA_TYPES}
+
+class BisSetBulkService:
+    """비스 세트의 모든 슬롯과 마테리쟈를 한 번에 교체하는 서비스 클래스"""
+
+    @staticmethod
+    def apply(bis_set, items_data):
+        """요청한 슬롯/마테리쟈 구성으로 비스 세트 전체 교체
+
+        items_data: [{'slot': 슬롯, 'item_id': 아이템 ID, 'materias': [{'slot_number': 번호, 'type': 종류}]}]
+        요청에 없는 슬롯은 비우고, 각 슬롯의 마테리쟈는 요청한 목록으로 교체한다.
+        전체 구성을 미리 불러온 아이템으로 검증한 뒤 한 트랜잭션에서 일괄 생성/수정/삭제한다.
+        """
+        slots, errors = BisSetBulkService.validate(bis_set.season_id, items_data)
+        if errors:
+            return {
+                'success': False,
+                'error': '비스 세트 구성이 올바르지 않습니다.',
+                'errors': errors
+            }
+
+        changed_slots = BisSetBulkService.write([(bis_set, slots)])[bis_set.id]
+        logger.info(f"비스 세트 일괄 수정 완료: BisSet ID={bis_set.id}, 변경 슬롯={changed_slots}")
+
+        return {
+            'success': True,
+            'bis_set': BisSetBulkService.get_bis_set(bis_set.id),
+            'changed_slots': changed_slots
+        }
+
+    @staticmethod
+    @transaction.atomic
+    def write(slots_by_set):
+        """검증된 구성 [(비스 세트, {슬롯: (아이템, {마테리쟈 번호: 종류})})]을 한 트랜잭션에서 일괄 반영
+
+        세트 수와 관계없이 기존 아이템 조회, 아이템/마테리쟈 생성/수정/삭제, 갱신 필요 표시를 각각 한 번에 처리한다.
+        반환값: {비스 세트 ID: 아이템이 바뀐 슬롯 목록}
+        """
+        existing_by_set = {bis_set.id: {} for bis_set, _ in slots_by_set}
+        for bis_item in BisItem.objects.select_for_update().filter(
+            bis_set_id__in=list(existing_by_set)
+        ).prefetch_related('materias'):
+            existing_by_set[bis_item.bis_set_id][bis_item.slot] = bis_item
+
+        # 일괄 생성/수정은 시그널을 보내지 않고 삭제 시그널은 건너뛰므로 아래에서 직접 갱신 필요 표시 및 필요 재화 캐시 무효화
+        with changes_handled_by_caller():
+            changes = BisSetBulkService._apply_items(slots_by_set, existing_by_set)
+            materia_changed = BisSetBulkService._apply_materias(slots_by_set, existing_by_set)
+
+        stale = [
+            StalePriority(season_id=bis_set.season_id, player_id=bis_set.player_id, slot=slot)
+            for bis_set, _ in slots_by_set for slot in changes[bis_set.id]
+        ]
+        if stale:
+            StalePriority.objects.bulk_create(stale, ignore_conflicts=True)
+        changed_players = {}
+        for item in stale:
+            changed_players.setdefault(item.season_id, set()).add(item.player_id)
+        for season_id, player_ids in changed_players.items():
+            resource_needs_cache.invalidate(season_id, *player_ids)
+        if stale or materia_changed:
+            data_version.bump(*{bis_set.season_id for bis_set, _ in slots_by_set})
+
+        return changes
+
+    @staticmethod
+    def get_bis_set(bis_set_id):
+        """응답 직렬화에 필요한 관계를 한 번에 불러온 비스 세트"""
+        return BisSet.objects.select_related('player', 'season').prefetch_related(
+            'items__item', 'items__materias'
+        ).get(pk=bis_set_id)
+
+    @staticmethod
+    def validate(season_id, items_data, items=None):
+        """요청 구성 검증 후 ({슬롯: (아이템, {마테리쟈 번호: 종류})}, 오류 목록) 반환
+
+        items: 미리 불러온 {아이템 ID: 아이템} (없으면 요청한 아이템을 한 번에 조회)
+        """
+        if not isinstance(items_data, list):
+            return {}, ['items는 목록이어야 합니다.']
+
+        if items is None:
+            item_ids = set()
+            for entry in items_data:
+                if isinstance(entry, dict) and entry.get('item_id') is not None:
+                    try:
+                        item_ids.add(int(entry['item_id']))
+                    except (TypeError, ValueError):
+                        pass
+            items = Item.objects.in_bulk(item_ids)
+
+        slots = {}
+        errors = []
+        for entry in items_data:
+            if not isinstance(entry, dict):
+                errors.append('각 항목은 slot, item_id를 가진 객체여야 합니다.')
+                continue
+
+            slot = entry.get('slot')
+            if slot not in SLOTS:
+                errors.append(f'알 수 없는 슬롯입니다: {slot}')
+                continue
+            if slot in slots:
+                errors.append(f'{slot} 슬롯이 중복되었습니다.')
+                continue
+
+            try:
+                item = items.get(int(entry.get('item_id')))
+            except (TypeError, ValueError):
+                item = None
+            if item is None:
+                errors.append(f'{slot}: 존재하지 않는 아이템입니다.')
+                continue
+            if item.season_id != season_id:
+                errors.append(f'{slot}: 다른 시즌의 아이템입니다.')
+                continue
+            if item.type != slot and not (slot in RING_SLOTS and item.type in RING_SLOTS):
+                errors.append(f'{slot}: {item.type} 아이템은 이 슬롯에 장착할 수 없습니다.')
+                continue
+
+            materias, materia_errors = BisSetBulkService._validate_materias(slot, item, entry.get('materias') or [])
+            errors.extend(materia_errors)
+            slots[slot] = (item, materias)
+
+        # 동일한 레이드 반지는 하나만 착용 가능
+        rings = [slots[slot][0] for slot in RING_SLOTS if slot in slots]
+        if len(rings) == 2 and rings[0].id == rings[1].id and rings[0].source == '영웅레이드템':
+            errors.append('동일한 레이드 반지 2개를 착용할 수 없습니다.')
+
+        return slots, errors
+
+    @staticmethod
+    def _validate_materias(slot, item, materias_data):
+        """슬롯 마테리쟈 검증 후 ({마테리쟈 번호: 종류}, 오류 목록) 반환"""
+        if not isinstance(materias_data, list):
+            return {}, [f'{slot}: materias는 목록이어야 합니다.']
+
+        max_slots = BisItem(item=item, slot=slot).get_max_materia_slots()
+        materias = {}
+        errors = []
+        for materia in materias_data:
+            try:
+                slot_number = int(materia.get('slot_number'))
+            except (AttributeError, TypeError, ValueError):
+                errors.append(f'{slot}: 마테리쟈 슬롯 번호가 올바르지 않습니다.')
+                continue
+
+            materia_type = materia.get('type')
+            if materia_type not in MATERIAS:
+                errors.append(f'{slot}: 알 수 없는 마테리쟈 종류입니다: {materia_type}')
+            elif slot_number < 1 or slot_number > max_slots:
+                errors.append(f'{slot}: 이 아이템에는 최대 {max_slots}개의 마테리쟈만 장착할 수 있습니다.')
+            elif slot_number in materias:
+                errors.append(f'{slot}: 마테리쟈 슬롯 {slot_number}번이 중복되었습니다.')
+            else:
+                materias[slot_number] = materia_type
+        return materias, errors
+
+    @staticmethod
+    def _apply_items(slots_by_set, existing_by_set):
+        """슬롯 아이템 일괄 생성/수정/삭제 후 {비스 세트 ID: 아이템이 바뀐 슬롯 목록} 반환 (existing_by_set에 새 아이템 반영)"""
+        to_create = []
+        to_update = []
+        removed = []
+        for bis_set, slots in slots_by_set:
+            existing = existing_by_set[bis_set.id]
+            for slot, (item, _) in slots.items():
+                bis_item = existing.get(slot)
+                if bis_item is None:
+                    to_create.append(BisItem(bis_set=bis_set, item=item, slot=slot))
+                elif bis_item.item_id != item.id:
+                    bis_item.item = item
+                    to_update.append(bis_item)
+            removed.extend(bis_item for slot, bis_item in existing.items() if slot not in slots)
+
+        if removed:
+            # 마테리쟈는 연쇄 삭제
+            BisItem.objects.filter(pk__in=[bis_item.id for bis_item in removed]).delete()
+            for bis_item in removed:
+                del existing_by_set[bis_item.bis_set_id][bis_item.slot]
+        if to_update:
+            BisItem.objects.bulk_update(to_update, ['item'])
+        if to_create:
+            BisItem.objects.bulk_create(to_create)
+            for bis_item in to_create:
+                existing_by_set[bis_item.bis_set_id][bis_item.slot] = bis_item
+
+        changed = {bis_set.id: set() for bis_set, _ in slots_by_set}
+        for bis_item in to_create + to_update + removed:
+            changed[bis_item.bis_set_id].add(bis_item.slot)
+        return {
+            bis_set_id: [slot for slot in SLOTS if slot in slots]
+            for bis_set_id, slots in changed.items()
+        }
+
+    @staticmethod
+    def _apply_materias(slots_by_set, existing_by_set):
+        """슬롯별 마테리쟈를 요청한 구성으로 일괄 생성/수정/삭제 후 변경 여부 반환"""
+        to_create = []
+        to_update = []
+        to_delete = []
+        for bis_set, slots in slots_by_set:
+            for slot, (_, materias) in slots.items():
+                bis_item = existing_by_set[bis_set.id][slot]
+                # 새로 만든 비스 아이템은 prefetch 결과가 없음
+                current = {}
+                if getattr(bis_item, '_prefetched_objects_cache', {}).get('materias') is not None:
+                    current = {materia.slot_number: materia for materia in bis_item.materias.all()}
+
+                for slot_number, materia_type in materias.items():
+                    materia = current.get(slot_number)
+                    if materia is None:
+                        to_create.append(Materia(bis_item=bis_item, slot_number=slot_number, type=materia_type))
+                    elif materia.type != materia_type:
+                        materia.type = materia_type
+                        to_update.append(materia)
+                to_delete.extend(materia.id for slot_number, materia in current.items() if slot_number not in materias)
+
+        if to_delete:
+            Materia.objects.filter(pk__in=to_delete).delete()
+        if to_update:
+            Materia.objects.bulk_update(to_update, ['type'])
+        if to_create:
+            Materia.objects.bulk_create(to_create)
+        return bool(to_create or to_update or to_delete)
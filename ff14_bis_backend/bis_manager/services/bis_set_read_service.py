@@ -0,0 +1,72 @@
+# ff14_bis_backend/bis_manager/services/bis_set_read_service.py
+from bis_manager.constants import BIS_TYPES, ITEM_TYPES, MATERIA_TYPES
+from bis_manager.models import BisSet, BisItem, Materia
+
+BIS_TYPE_NAMES = dict(BIS_TYPES)
+SLOT_NAMES = dict(ITEM_TYPES)
+MATERIA_NAMES = dict(MATERIA_TYPES)
+
+class BisSetReadService:
+    """BisSetSerializer와 같은 형태의 비스 세트 조회 결과를 values() 조회로 만드는 서비스 클래스
+
+    세트 수와 관계없이 세트 1 + 비스 아이템(아이템 정보 포함) 1 + 마테리쟈 1, 총 3개의 쿼리를 사용하고
+    필드 객체 없이 dict를 바로 조립하므로 목록 조회에서 직렬화 비용이 크게 줄어든다.
+    """
+
+    @staticmethod
+    def to_dicts(bis_set_ids):
+        """비스 세트 ID 목록 순서대로 직렬화된 dict 목록 (없는 ID는 제외)"""
+        bis_set_ids = list(bis_set_ids)
+        if not bis_set_ids:
+            return []
+
+        sets = {}
+        for row in BisSet.objects.filter(pk__in=bis_set_ids).values(
+            'id', 'player_id', 'player__nickname', 'season_id', 'season__name', 'bis_type'
+        ):
+            sets[row['id']] = {
+                'id': row['id'],
+                'player': row['player_id'],
+                'player_nickname': row['player__nickname'],
+                'season': row['season_id'],
+                'season_name': row['season__name'],
+                'bis_type': row['bis_type'],
+                'bis_type_display': BIS_TYPE_NAMES.get(row['bis_type'], row['bis_type']),
+                'items': []
+            }
+
+        bis_items = {}
+        for row in BisItem.objects.filter(bis_set_id__in=bis_set_ids).values(
+            'id', 'bis_set_id', 'slot', 'item_id', 'item__name', 'item__type', 'item__source',
+            'item__item_level', 'item__season_id'
+        ).order_by('id'):
+            bis_item = {
+                'id': row['id'],
+                'slot': row['slot'],
+                'slot_display': SLOT_NAMES.get(row['slot'], row['slot']),
+                'item': {
+                    'id': row['item_id'],
+                    'name': row['item__name'],
+                    'type': row['item__type'],
+                    'source': row['item__source'],
+                    'item_level': row['item__item_level'],
+                    'season': row['item__season_id']
+                },
+                'materias': [],
+                'bis_set': row['bis_set_id']
+            }
+            bis_items[row['id']] = bis_item
+            sets[row['bis_set_id']]['items'].append(bis_item)
+
+        if bis_items:
+            for row in Materia.objects.filter(bis_item__bis_set_id__in=bis_set_ids).values(
+                'id', 'bis_item_id', 'type', 'slot_number'
+            ).order_by('id'):
+                bis_items[row['bis_item_id']]['materias'].append({
+                    'id': row['id'],
+                    'type': row['type'],
+                    'type_display': MATERIA_NAMES.get(row['type'], row['type']),
+                    'slot_number': row['slot_number']
+                })
+
+        return [sets[bis_set_id] for bis_set_id in bis_set_ids if bis_set_id in sets]
@@ -0,0 +1,22 @@
+# ff14_bis_backend/bis_manager/services/data_version.py
+from django.db.models import F
+from django.utils import timezone
+
+from bis_manager.models import Season
+
+def bump(*season_ids):
+    """시즌 데이터 버전 증가 (호출하는 쪽 트랜잭션과 함께 커밋/롤백됨)"""
+    season_ids = {season_id for season_id in season_ids if season_id is not None}
+    if season_ids:
+        Season.objects.filter(pk__in=season_ids).update(
+            data_version=F('data_version') + 1,
+            data_updated_at=timezone.now()
+        )
+
+def lookup(season_id):
+    """(데이터 버전, 변경 시각), 시즌이 없으면 None (쿼리 1회)"""
+    return Season.objects.filter(pk=season_id).values_list('data_version', 'data_updated_at').first()
+
+def etag(season_id, version):
+    """시즌 데이터 버전으로 만든 강한 ETag"""
+    return f'"season-{season_id}-v{version}"'
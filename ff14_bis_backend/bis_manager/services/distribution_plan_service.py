@@ -0,0 +1,180 @@
+# ff14_bis_backend/bis_manager/services/distribution_plan_service.py
+from django.db import transaction
+
+from bis_manager.constants import RAID_FLOOR_DROPS
+from bis_manager.models import (
+    DistributionPlan, DistributionPlanWeek, DistributionPlanFloor, DistributionPlanAssignment
+)
+from .distribution_service import DistributionService
+
+import logging
+logger = logging.getLogger(__name__)
+
+# 계획 요약으로 저장하는 결과 항목
+SUMMARY_KEYS = ['player_acquisitions', 'player_item_records', 'missing_items', 'target_items_per_player']
+
+class DistributionPlanService:
+    """주간 분배 계획 저장/조회를 위한 서비스 클래스"""
+
+    @staticmethod
+    def get_plan(season_id):
+        """저장된 분배 계획 조회 (주차/층/배정을 한 번에 prefetch), 없으면 None"""
+        return DistributionPlan.objects.filter(season_id=season_id).prefetch_related(
+            'weeks__floors__assignments'
+        ).first()
+
+    @staticmethod
+    def generate_and_save(season_id, weeks=12, mode='greedy', progress=None):
+        """주간 분배 계획을 생성하여 저장하고 저장된 계획을 dict로 반환
+
+        저장된 계획이 같은 우선순위/파라미터로 계산된 것이면 다시 저장하지 않는다.
+        """
+        result = DistributionService.generate_weekly_distribution_plan(season_id, weeks, mode, progress=progress)
+        if not result.get('success', False):
+            return result
+
+        # 생성된 계획 저장 (9주차 이후 수동 입력 내용은 유지)
+        plan = DistributionPlanService.get_plan(season_id)
+        if plan is None or plan.source_key != result.get('plan_key'):
+            plan = DistributionPlanService.save_plan(season_id, result, mode)
+
+        return DistributionPlanService.to_dict(plan)
+
+    @staticmethod
+    @transaction.atomic
+    def save_plan(season_id, result, mode='greedy'):
+        """generate_weekly_distribution_plan 결과를 저장
+
+        자동 계산 주차(1~8주차)는 새 결과로 교체하고, 이미 저장된 9주차 이후 수동 입력 주차는 유지한다.
+        """
+        weekly_plan = result['weekly_plan']
+
+        plan, _ = DistributionPlan.objects.update_or_create(
+            season_id=season_id,
+            defaults={
+                'mode': mode,
+                'week_count': len(weekly_plan),
+                'source_key': result.get('plan_key', ''),
+                'summary': {key: result[key] for key in SUMMARY_KEYS if key in result}
+            }
+        )
+
+        # 유지할 수동 입력 주차
+        kept_weeks = set(
+            plan.weeks.filter(week__gt=8, week__lte=len(weekly_plan)).values_list('week', flat=True)
+        )
+        plan.weeks.exclude(week__in=kept_weeks).delete()
+
+        new_weeks = [week_plan for week_plan in weekly_plan if week_plan['week'] not in kept_weeks]
+        DistributionPlanWeek.objects.bulk_create([
+            DistributionPlanWeek(
+                plan=plan,
+                week=week_plan['week'],
+                manual_input=week_plan.get('manual_input', False)
+            )
+            for week_plan in new_weeks
+        ])
+        week_rows = {
+            week.week: week
+            for week in plan.weeks.filter(week__in=[week_plan['week'] for week_plan in new_weeks])
+        }
+
+        DistributionPlanFloor.objects.bulk_create([
+            DistributionPlanFloor(week=week_rows[week_plan['week']], floor=int(floor))
+            for week_plan in new_weeks
+            for floor in week_plan['floors'].keys()
+        ])
+        floor_rows = {
+            (floor.week.week, floor.floor): floor
+            for floor in DistributionPlanFloor.objects.filter(week__in=week_rows.values()).select_related('week')
+        }
+
+        DistributionPlanAssignment.objects.bulk_create([
+            DistributionPlanService._build_assignment(floor_rows[(week_plan['week'], int(floor))], position, data)
+            for week_plan in new_weeks
+            for floor, assignments in week_plan['floors'].items()
+            for position, data in enumerate(assignments)
+        ])
+
+        logger.info(f"분배 계획 저장 완료: season_id={season_id}, 새 주차 {len(new_weeks)}개, 유지한 수동 주차 {sorted(kept_weeks)}")
+
+        return DistributionPlanService.get_plan(season_id)
+
+    @staticmethod
+    @transaction.atomic
+    def update_floor(plan, week, floor, plan_data):
+        """특정 주차/층의 배정만 수동 입력으로 교체, 해당 주차가 없으면 None"""
+        week_row = plan.weeks.filter(week=week).first()
+        if week_row is None:
+            return None
+
+        floor_row, _ = DistributionPlanFloor.objects.get_or_create(week=week_row, floor=floor)
+        floor_row.assignments.all().delete()
+        DistributionPlanAssignment.objects.bulk_create([
+            DistributionPlanService._build_assignment(floor_row, position, data)
+            for position, data in enumerate(plan_data)
+        ])
+
+        if not week_row.manual_input:
+            week_row.manual_input = True
+            week_row.save(update_fields=['manual_input'])
+
+        # 다른 프로세스에서도 변경을 알 수 있도록 계획 수정 시간 갱신
+        plan.save(update_fields=['updated_at'])
+
+        logger.info(f"분배 계획 수동 업데이트 완료: plan_id={plan.id}, week={week}, floor={floor}, 배정 {len(plan_data)}개")
+
+        return DistributionPlanService.get_plan(plan.season_id)
+
+    @staticmethod
+    def to_dict(plan):
+        """저장된 계획을 generate_weekly_distribution_plan 결과와 같은 형태로 변환"""
+        weekly_plan = []
+        for week in plan.weeks.all():
+            week_plan = {
+                'week': week.week,
+                'floors': {floor: [] for floor in RAID_FLOOR_DROPS.keys()}
+            }
+            for floor in week.floors.all():
+                week_plan['floors'][floor.floor] = [
+                    DistributionPlanService._assignment_to_dict(assignment)
+                    for assignment in floor.assignments.all()
+                ]
+            if week.manual_input:
+                week_plan['manual_input'] = True
+            weekly_plan.append(week_plan)
+
+        return {
+            'success': True,
+            'weekly_plan': weekly_plan,
+            **plan.summary,
+            'mode': plan.mode,
+            'updated_at': plan.updated_at
+        }
+
+    @staticmethod
+    def _build_assignment(floor_row, position, data):
+        return DistributionPlanAssignment(
+            floor=floor_row,
+            position=position,
+            item_type=data.get('item_type', ''),
+            player_id=data.get('player_id'),
+            player_name=data.get('player_name') or '',
+            original_priority=data.get('original_priority') or 0,
+            note=data.get('note') or '',
+            manual=bool(data.get('manual', False))
+        )
+
+    @staticmethod
+    def _assignment_to_dict(assignment):
+        data = {
+            'item_type': assignment.item_type,
+            'player_id': assignment.player_id,
+            'player_name': assignment.player_name,
+            'original_priority': assignment.original_priority
+        }
+        if assignment.note:
+            data['note'] = assignment.note
+        if assignment.manual:
+            data['manual'] = True
+        return data
@@ -1,12 +1,21 @@
 # ff14_bis_backend/bis_manager/services/distribution_service.py
+from django.core.cache import caches
+from django.db import transaction
 from django.db.models import Count, Sum, Q
-from collections import defaultdict
-import copy
+from array import array
+import hashlib
 import traceback
 
-from bis_manager.models import Season, Player, BisSet, BisItem, DistributionPriority, Item
-from bis_manager.constants import ITEM_TYPES, TOMESTONE_COSTS, PAGE_COSTS
+from bis_manager.models import Season, Player, BisSet, BisItem, DistributionPriority, Item, StalePriority
+from bis_manager.constants import RING_SLOTS, RAID_FLOOR_DROPS
 from .resource_calculation_service import ResourceCalculationService
+from .season_model import SeasonModel, PriorityTable, SLOTS, SLOT_INDEX
+from .resource_cost_table import get_cost_table
+from .weekly_allocator import WeeklyAllocator
+from .assignment_solver import solve_assignment
+from bis_manager.signals import changes_handled_by_caller
+from bis_manager import tracing
+from . import data_version, resource_needs_cache
 
 import logging
 logger = logging.getLogger(__name__)
@@ -15,10 +24,16 @@ class DistributionService:
     """아이템 분배 우선순위 계산을 위한 서비스 클래스"""
     
     @staticmethod
-    def calculate_priority_for_season(season_id, handle_rings=True):
-        """시즌의 모든 플레이어에 대한 아이템 분배 우선순위 계산"""
+    def calculate_priority_for_season(season_id, handle_rings=True, incremental=False, progress=None):
+        """시즌의 모든 플레이어에 대한 아이템 분배 우선순위 계산
+        
+        incremental=True이면 비스 변경으로 갱신 필요 표시된 아이템 타입만 다시 계산한다.
+        (기존 우선순위가 없으면 전체 계산)
+        progress가 주어지면 progress(처리한 플레이어 수, 전체 수)를 시작할 때, 플레이어별 비용 계산 중
+        일정 간격(SeasonModel.slot_costs 참고)으로, 끝날 때 호출한다.
+        """
         try:
-            logger.info(f"===== 분배 우선순위 계산 시작: 시즌 ID={season_id} =====")
+            tracing.event('priority.calculate', season_id=season_id, incremental=incremental, handle_rings=handle_rings)
             
             season = Season.objects.get(pk=season_id)
             
@@ -30,148 +45,119 @@ class DistributionService:
                     'error': '이 시즌은 우선순위분배 방식이 아닙니다.'
                 }
             
-            # 시즌에 참여 중인 모든 플레이어
-            players = Player.objects.filter(bis_sets__season=season).distinct()
-            logger.info(f"시즌 {season.name}에 참여 중인 플레이어 수: {players.count()}")
-            
-            # 각 플레이어별 필요 아이템 및 자원 계산
-            player_resources = {}
-            error_players = []
+            # 갱신 필요 표시 조회
+            stale_marks = list(StalePriority.objects.filter(season=season).values_list('id', 'player_id', 'slot'))
             
-            for player in players:
-                logger.info(f"플레이어 처리 시작: {player.nickname} (ID={player.id})")
-                try:
-                    # 최종 비스 세트 확인
-                    final_bis_exists = BisSet.objects.filter(
-                        player=player, 
-                        season=season, 
-                        bis_type='최종'
-                    ).exists()
-                    
-                    if not final_bis_exists:
-                        logger.warning(f"플레이어 {player.nickname}의 최종 비스 세트가 없습니다.")
-                        continue
-                        
-                    # 자원 계산 서비스 호출
-                    resources = ResourceCalculationService.calculate_resources_for_player(player, season)
-                    
-                    if not resources:
-                        logger.warning(f"플레이어 {player.nickname}의 자원 계산 결과가 없습니다.")
-                        continue
-                    
-                    player_resources[player.id] = {
-                        'player': player,
-                        'resources': resources,
-                        'total_cost': sum(resources.values()),  # 총 자원 비용
-                        'items': {}  # 각 슬롯별 아이템 정보
-                    }
-                    
-                    # 최종 비스 세트의 각 슬롯별 아이템 정보 수집
-                    try:
-                        final_bis = BisSet.objects.get(player=player, season=season, bis_type='최종')
-                        bis_items = BisItem.objects.filter(bis_set=final_bis)
-                        
-                        logger.info(f"플레이어 {player.nickname}의 최종 비스 아이템 수: {bis_items.count()}")
-                        
-                        for bis_item in bis_items:
-                            item_type = bis_item.slot
-                            item = bis_item.item
-                            
-                            # 각 슬롯별 아이템 정보와 비용 저장
-                            cost = 0
-                            
-                            if item.source in ['석판템', '보강석판템']:
-                                cost += TOMESTONE_COSTS.get(item_type, 0)
-                            elif item.source == '영웅레이드템':
-                                if item_type in PAGE_COSTS:
-                                    floor = PAGE_COSTS[item_type]['floor']
-                                    count = PAGE_COSTS[item_type]['count']
-                                    cost += count
-                            
-                            player_resources[player.id]['items'][item_type] = {
-                                'item': item,
-                                'cost': cost
-                            }
-                            
-                            logger.info(f"아이템 추가: {player.nickname} - {item_type} ({item.name}), 비용: {cost}")
-                    
-                    except BisSet.DoesNotExist:
-                        # 최종 비스 세트가 없는 경우
-                        logger.warning(f"플레이어 {player.nickname}의 최종 비스 세트를 찾을 수 없습니다.")
-                        error_players.append(player.nickname)
-                    except Exception as e:
-                        logger.error(f"플레이어 {player.nickname}의 비스 아이템 처리 중 오류: {str(e)}")
-                        logger.error(traceback.format_exc())
-                        error_players.append(player.nickname)
+            # item_types가 None이면 전체 재계산
+            item_types = None
+            stale_player_ids = set()
+            if incremental and DistributionPriority.objects.filter(season=season).exists():
+                item_types = DistributionService._get_stale_item_types(stale_marks, handle_rings)
+                stale_player_ids = {player_id for _, player_id, _ in stale_marks}
+                tracing.event('priority.stale_item_types', item_types=sorted(item_types))
                 
-                except Exception as e:
-                    logger.error(f"플레이어 {player.nickname} 처리 중 오류: {str(e)}")
-                    logger.error(traceback.format_exc())
-                    error_players.append(player.nickname)
+                if not item_types:
+                    return {
+                        'success': True,
+                        'priorities': {},
+                        'player_resources': {},
+                        'created_count': 0,
+                        'player_count': 0,
+                        'incremental': True,
+                        'updated_item_types': []
+                    }
+            
+            # 필요 재화 캐시 세대 토큰은 비스를 읽기 전에 조회 (계산 중 바뀐 비스가 새 토큰으로 캐시되지 않도록)
+            generations = resource_needs_cache.get_generations(
+                season.id, BisSet.objects.filter(season=season, bis_type='최종').values_list('player_id', flat=True)
+            )
+            
+            # 시즌의 비스를 플레이어 인덱스/슬롯 비트마스크 모델로 한 번에 로드 (플레이어 수와 무관하게 고정된 쿼리 수)
+            with tracing.span('priority.snapshot') as span:
+                model = SeasonModel.load(season)
+                span.set(players=len(model))
+            
+            # 모든 플레이어의 자원을 한 번에 계산 (증분 계산 시 변경된 플레이어만 일괄 저장)
+            with tracing.span('priority.resources'):
+                resources_by_player = ResourceCalculationService.calculate_resources_for_season(
+                    season, model=model, save=False, generations=generations
+                )
+                ResourceCalculationService.save_resources_bulk(season, {
+                    player_id: resources for player_id, resources in resources_by_player.items()
+                    if item_types is None or player_id in stale_player_ids
+                })
             
-            logger.info(f"총 {len(player_resources)} 명의 플레이어 자원 계산 완료")
-            logger.info(f"오류 발생한 플레이어: {error_players}")
+            # 최종 비스 세트가 있는 플레이어 (최종 비스 세트가 없는 플레이어는 제외)
+            player_indices = model.final_indices()
+            if progress is not None:
+                progress(0, len(model))
             
-            if not player_resources:
+            if not player_indices and item_types is None:
                 logger.error("계산된 플레이어 자원 데이터가 없습니다.")
                 return {
                     'success': False,
                     'error': '최종 비스 세트가 있는 플레이어가 없습니다.'
                 }
             
+            # 슬롯별 비용 열 (시즌 비용 표 기준, 시즌/버전별로 한 번만 컴파일)
+            costs = model.slot_costs(
+                get_cost_table(season),
+                progress=None if progress is None else lambda processed: progress(processed, len(model))
+            )
+            
             # 아이템 타입별 우선순위 계산
-            priorities = DistributionService._calculate_item_type_priorities(player_resources)
-            logger.info(f"우선순위 계산 결과: {len(priorities)} 개의 아이템 타입에 대한 우선순위 생성")
+            with tracing.span('priority.item_types', players=len(player_indices)):
+                priorities = DistributionService._calculate_item_type_priorities(
+                    model, costs, player_indices, item_types
+                )
             
             # 반지 우선순위 특별 처리
-            if handle_rings:
+            if handle_rings and (item_types is None or '반지' in item_types):
                 #반지1과 반지2 우선순위 통합
                 # 두 슬롯 중 하나라도 레이드 반지가 필요한 플레이어에 대한 우선순위 계산
-                ring_priorities = DistributionService._calculate_combined_ring_priorities(player_resources)
+                ring_priorities = DistributionService._calculate_combined_ring_priorities(model, costs, player_indices)
                 priorities['반지'] = ring_priorities
             
-            # 기존 우선순위 데이터 삭제 후 새로 생성
-            DistributionPriority.objects.filter(season=season).delete()
-            logger.info(f"기존 우선순위 데이터 삭제 완료")
+            if progress is not None:
+                progress(len(model), len(model))
             
-            # 우선순위 데이터 저장
-            priority_objects = []
-            created_count = 0
-            
-            for item_type, players_priority in priorities.items():
-                logger.info(f"아이템 타입 {item_type}에 대한 우선순위: {players_priority}")
-                for priority_rank, player_id in enumerate(players_priority, 1):
-                    if player_id in player_resources:  # 플레이어 데이터가 있는 경우만
-                        priority_objects.append(
-                            DistributionPriority(
-                                season=season,
-                                player=player_resources[player_id]['player'],
-                                item_type=item_type,
-                                priority=priority_rank
-                            )
-                        )
-                        created_count += 1
+            # 우선순위 데이터 저장 (기존 데이터와 비교하여 변경된 행만 반영)
+            with tracing.span('priority.save') as span, transaction.atomic():
+                write_stats = DistributionService._save_priorities(
+                    season, priorities, replace_all=item_types is None
+                )
+                
+                # 반영한 갱신 필요 표시 제거 (계산 중 새로 생긴 표시는 유지)
+                StalePriority.objects.filter(id__in=[mark_id for mark_id, _, _ in stale_marks]).delete()
+                
+                # 일괄 저장은 시그널을 보내지 않으므로 바뀐 것이 있을 때만 데이터 버전 증가
+                if stale_marks or any(write_stats.values()):
+                    data_version.bump(season.id)
+                span.set(**write_stats)
             
-            # 벌크 생성으로 성능 최적화
-            if priority_objects:
-                DistributionPriority.objects.bulk_create(priority_objects)
-                logger.info(f"총 {len(priority_objects)}개의 우선순위 객체 생성 완료")
+            created_count = sum(len(players_priority) for players_priority in priorities.values())
             
-            logger.info("===== 분배 우선순위 계산 완료 =====")
+            logger.info(
+                f"분배 우선순위 계산 완료: 시즌 ID={season.id}, 플레이어 {len(player_indices)}명, "
+                f"아이템 타입 {len(priorities)}개, 저장 {write_stats}"
+            )
             
             return {
                 'success': True,
                 'priorities': priorities,
                 'player_resources': {
-                    p_id: {
-                        'player_name': data['player'].nickname,
-                        'total_cost': data['total_cost'],
-                        'resources': data['resources']
+                    model.player_ids[index]: {
+                        'player_name': model.player_names[index],
+                        'total_cost': sum(resources_by_player[model.player_ids[index]].values()),
+                        'resources': resources_by_player[model.player_ids[index]]
                     }
-                    for p_id, data in player_resources.items()
+                    for index in player_indices
                 },
                 'created_count': created_count,
-                'player_count': len(player_resources)
+                'write_stats': write_stats,
+                'player_count': len(player_indices),
+                'incremental': item_types is not None,
+                'updated_item_types': list(priorities.keys())
             }
             
         except Season.DoesNotExist:
@@ -189,302 +175,441 @@ class DistributionService:
             }
     
     @staticmethod
-    def _calculate_combined_ring_priorities(player_resources):
-        """반지1과 반지2를 통합한 우선순위 계산"""
-        # 플레이어별로 반지1과 반지2 중 더 높은 우선순위를 가진 것을 선택
-        combined_priorities = []
-        
-        for p_id, data in player_resources.items():
-            ring1_cost = data['items'].get('반지1', {}).get('cost', 0)
-            ring2_cost = data['items'].get('반지2', {}).get('cost', 0)
-            
-            # 두 반지 중 비용이 더 높은 것 선택 (레이드 반지가 필요한 슬롯)
-            max_ring_cost = max(ring1_cost, ring2_cost)
-            
-            if max_ring_cost > 0: #레이드 반지가 필요한 경우만 포함
-                combined_priorities.append((p_id, max_ring_cost))
+    def _save_priorities(season, priorities, replace_all=True):
+        """새 우선순위를 기존 행과 비교하여 추가/변경/삭제된 행만 저장
+        
+        replace_all=True이면 priorities에 없는 아이템 타입의 기존 행도 삭제한다.
+        호출하는 쪽의 트랜잭션 안에서 실행해야 읽는 쪽이 중간 상태를 보지 않는다.
+        """
+        existing = DistributionPriority.objects.filter(season=season)
+        if not replace_all:
+            existing = existing.filter(item_type__in=list(priorities.keys()))
+        existing_rows = {(row.item_type, row.player_id): row for row in existing}
+        
+        to_create = []
+        to_update = []
+        
+        for item_type, players_priority in priorities.items():
+            for priority_rank, player_id in enumerate(players_priority, 1):
+                row = existing_rows.pop((item_type, player_id), None)
+                if row is None:
+                    to_create.append(
+                        DistributionPriority(
+                            season=season,
+                            player_id=player_id,
+                            item_type=item_type,
+                            priority=priority_rank
+                        )
+                    )
+                elif row.priority != priority_rank:
+                    row.priority = priority_rank
+                    to_update.append(row)
+        
+        # 새 우선순위에 없는 행은 삭제
+        to_delete = [row.id for row in existing_rows.values()]
         
-        # 비용에 따라 정렬 (비용이 높을수록 우선순위 높음)
-        sorted_priorities = sorted(combined_priorities, key=lambda x: x[1], reverse=True)
+        if to_delete:
+            # 행마다 데이터 버전을 증가시키지 않도록 호출하는 쪽(한 번 증가)에서 처리
+            with changes_handled_by_caller():
+                DistributionPriority.objects.filter(id__in=to_delete).delete()
+        if to_update:
+            DistributionPriority.objects.bulk_update(to_update, ['priority'])
+        if to_create:
+            DistributionPriority.objects.bulk_create(to_create)
         
-        # 플레이어 ID만 추출하여 우선순위 리스트 생성
-        return [p_id for p_id, _ in sorted_priorities]
+        return {
+            'created': len(to_create),
+            'updated': len(to_update),
+            'deleted': len(to_delete)
+        }
     
     @staticmethod
-    def _calculate_item_type_priorities(player_resources):
-        """아이템 타입별 플레이어 우선순위 계산"""
-        priorities = {}
+    def _get_stale_item_types(stale_marks, handle_rings=True):
+        """갱신 필요 표시된 슬롯으로부터 다시 계산할 아이템 타입 집합 계산"""
+        item_types = set()
+        for _, _, slot in stale_marks:
+            item_types.add(slot)
+            # 반지1/반지2 변경은 통합 반지 우선순위에도 영향
+            if handle_rings and slot in RING_SLOTS:
+                item_types.add('반지')
+        return item_types
+    
+    @staticmethod
+    def _calculate_combined_ring_priorities(model, costs, player_indices):
+        """반지1과 반지2를 통합한 우선순위 계산 (costs: SeasonModel.slot_costs의 슬롯별 비용 열)"""
+        ring1_costs = costs[SLOT_INDEX['반지1']]
+        ring2_costs = costs[SLOT_INDEX['반지2']]
         
-        logger.info(f"아이템 타입별 우선순위 계산 시작 (플레이어 수: {len(player_resources)})")
+        # 두 반지 중 비용이 더 높은 것 선택 (레이드 반지가 필요한 슬롯), 레이드 반지가 필요한 경우만 포함
+        ring_costs = {index: max(ring1_costs[index], ring2_costs[index]) for index in player_indices}
+        ranked = sorted(
+            (index for index in player_indices if ring_costs[index] > 0),
+            key=ring_costs.__getitem__, reverse=True
+        )
+        return [model.player_ids[index] for index in ranked]
+    
+    @staticmethod
+    def _calculate_item_type_priorities(model, costs, player_indices, item_types=None):
+        """아이템 타입별 플레이어 우선순위 계산 (item_types가 주어지면 해당 타입만)
         
-        # 모든 아이템 타입에 대해
-        for item_type, _ in ITEM_TYPES:
-            logger.info(f"아이템 타입 {item_type} 우선순위 계산")
-            
-            # 해당 아이템을 필요로 하는 플레이어들 정렬 (비용이 높을수록 우선순위 높음)
-            players_with_cost = []
-            
-            for p_id, data in player_resources.items():
-                if item_type in data['items']:
-                    cost = data['items'][item_type].get('cost', 0)
-                    players_with_cost.append((p_id, cost))
-                    logger.info(f"플레이어 ID {p_id} ({data['player'].nickname}): {item_type} 비용 {cost}")
-                    
-            # 비용에 따라 정렬 (비용이 높을수록 우선순위 높음)
-            sorted_players = sorted(
-                players_with_cost,
-                key=lambda x: x[1], reverse=True
+        최종 비스에 해당 슬롯이 있는 플레이어를 비용이 높은 순(같으면 플레이어 ID 순)으로 정렬한다.
+        """
+        priorities = {}
+        
+        for slot_index, item_type in enumerate(SLOTS):
+            if item_types is not None and item_type not in item_types:
+                continue
+            
+            bit = 1 << slot_index
+            column = costs[slot_index]
+            ranked = sorted(
+                (index for index in player_indices if model.final_mask[index] & bit),
+                key=column.__getitem__, reverse=True
             )
+            priorities[item_type] = [model.player_ids[index] for index in ranked]
             
-            # 플레이어 ID만 추출하여 우선순위 리스트 생성
-            priorities[item_type] = [p_id for p_id, _ in sorted_players]
-            logger.info(f"아이템 타입 {item_type} 우선순위 결과: {priorities[item_type]}")
+            if tracing.active():
+                tracing.event('priority.item_type', item_type=item_type, costs=[
+                    (model.player_ids[index], column[index]) for index in ranked
+                ])
         
-        logger.info(f"아이템 타입별 우선순위 계산 완료: {len(priorities)} 개 아이템 타입")
         return priorities
     
     @staticmethod
-    def generate_weekly_distribution_plan(season_id, weeks=12):
-        """주간 분배 계획 생성 (8주차까지 모든 플레이어가 모든 부위 1회씩 획득하도록)"""
+    def generate_weekly_distribution_plan(season_id, weeks=12, mode='greedy', progress=None):
+        """주간 분배 계획 생성 (8주차까지 모든 플레이어가 모든 부위 1회씩 획득하도록)
+        
+        우선순위가 없으면 계산 요청과 같은 시즌 단위 작업 잠금(JobService.run_single_flight)으로 먼저 계산하고,
+        progress를 우선순위 계산에 그대로 전달한다.
+        """
         try:
-            logger.info(f"주간 분배 계획 생성 시작: 시즌 ID={season_id}, 주차={weeks}")
+            tracing.event('weekly_plan.generate', season_id=season_id, weeks=weeks, mode=mode)
             
             season = Season.objects.get(pk=season_id)
             
-            # 우선순위 데이터 가져오기
-            all_priorities = DistributionPriority.objects.filter(season=season).order_by('item_type', 'priority')
-            logger.info(f"총 {all_priorities.count()}개의 우선순위 데이터 조회됨")
+            # 우선순위 데이터 가져오기 (아이템 타입, 플레이어 ID, 닉네임, 우선순위)
+            priority_rows = DistributionService._load_priority_rows(season)
             
             # 우선순위 데이터가 없으면 먼저 계산
-            if not all_priorities.exists():
-                logger.info("우선순위 데이터가 없습니다. 먼저 우선순위를 계산합니다.")
-                priority_result = DistributionService.calculate_priority_for_season(season_id)
+            if not priority_rows:
+                logger.info(f"우선순위 데이터가 없어 먼저 계산합니다: 시즌 ID={season.id}")
+                # job_service가 이 모듈을 불러오므로 여기서 불러옴
+                from .job_service import JobService
+                priority_result = JobService.run_single_flight(
+                    'calculate_priority', season.id, {'incremental': False}, progress=progress
+                )
                 if not priority_result['success']:
                     return priority_result
                 
                 # 다시 조회
-                all_priorities = DistributionPriority.objects.filter(season=season).order_by('item_type', 'priority')
-                logger.info(f"새로 계산된 우선순위 데이터: {all_priorities.count()}개")
-            
-            # 참여 플레이어 목록 가져오기
-            player_ids = list(set(all_priorities.values_list('player_id', flat=True)))
-            players = Player.objects.filter(id__in=player_ids)
+                priority_rows = DistributionService._load_priority_rows(season)
+            
+            # 같은 우선순위/파라미터로 계산한 계획이 있으면 그대로 반환
+            # (우선순위가 바뀌면 키가 달라지므로 별도 무효화가 필요 없음)
+            plan_key = DistributionService._weekly_plan_cache_key(priority_rows, weeks, mode)
+            cached_result = caches['plans'].get(plan_key)
+            tracing.event('weekly_plan.cache', priority_rows=len(priority_rows), hit=cached_result is not None)
+            if cached_result is not None:
+                return cached_result
+            
+            # 참여 플레이어/아이템 타입을 인덱스로 바꾼 우선순위 표
+            table = PriorityTable.from_rows(priority_rows)
+            
+            with tracing.span('weekly_plan.build', players=len(table), item_types=len(table.item_types)):
+                result = DistributionService._build_weekly_plan(table, weeks, mode)
+            result['success'] = True
+            result['plan_key'] = plan_key
+            caches['plans'].set(plan_key, result)
+            return result
             
-            logger.info(f"분배 참여 플레이어 수: {len(player_ids)}")
-            
-            # 아이템 타입별 우선순위 정렬
-            priorities_by_type = defaultdict(list)
-            for priority in all_priorities:
-                priorities_by_type[priority.item_type].append({
-                    'player_id': priority.player_id,
-                    'player_name': priority.player.nickname,
-                    'priority': priority.priority
-                })
-            
-            logger.info(f"아이템 타입별 우선순위 정리: {len(priorities_by_type)} 개 아이템 타입")
-            
-            # 주간 획득 가능 아이템 (기본 영웅 레이드 4층 구조)
-            weekly_items = {
-                1: ['귀걸이', '목걸이', '팔찌', '반지1', '반지2'],  # 1층 드랍
-                2: ['모자', '장갑', '신발'],  # 2층 드랍
-                3: ['상의', '하의'],  # 3층 드랍
-                4: ['무기']  # 4층 드랍
+        except Season.DoesNotExist:
+            logger.error(f"시즌 ID {season_id}를 찾을 수 없습니다.")
+            return {
+                'success': False,
+                'error': '존재하지 않는 시즌입니다.'
             }
-            
-            # 각 층별 아이템 개수 계산
-            floor_item_counts = {floor: len(items) for floor, items in weekly_items.items()}
-            total_items_per_week = sum(floor_item_counts.values())
-            
-            # 주간 분배 계획
-            weekly_plan = []
-            
-            # 총 아이템 개수
-            total_item_types = sum(len(items) for items in weekly_items.values())
-            
-            # 플레이어별 아이템 획득 기록 및 개수 (플레이어ID: {아이템타입: 획득여부})
-            player_item_records = {player_id: {item_type: False for item_type in priorities_by_type.keys()} for player_id in player_ids}
-            player_item_counts = {player_id: 0 for player_id in player_ids}
-            
-            # 8주차까지 균등 분배 계획 생성
-            first_eight_weeks = min(8, weeks)
-            
-            # 8주차까지 분배할 수 있는 총 아이템 개수
-            total_items_first_eight_weeks = first_eight_weeks * total_items_per_week
-            
-            # 플레이어별 목표 아이템 개수 (균등 분배를 위해)
-            target_items_per_player = total_items_first_eight_weeks // len(player_ids)
-            if target_items_per_player > total_item_types:
-                target_items_per_player = total_item_types  # 최대 모든 부위 1회씩만 획득 가능
-            
-            logger.info(f"8주차까지 플레이어별 목표 아이템 개수: {target_items_per_player}")
-            
-            for week in range(1, first_eight_weeks + 1):
-                logger.info(f"==== {week}주차 분배 계획 생성 (균등 분배) ====")
-                
+        except Exception as e:
+            logger.error(f"분배 계획 생성 중 예외 발생: {str(e)}")
+            logger.error(traceback.format_exc())
+            return {
+                'success': False,
+                'error': f'분배 계획 생성 중 오류가 발생했습니다: {str(e)}'
+            }
+        
+    @staticmethod
+    def _load_priority_rows(season):
+        """시즌 우선순위를 (아이템 타입, 플레이어 ID, 닉네임, 우선순위) 튜플 목록으로 조회"""
+        return list(
+            DistributionPriority.objects.filter(season=season)
+            .order_by('item_type', 'priority', 'id')
+            .values_list('item_type', 'player_id', 'player__nickname', 'priority')
+        )
+    
+    @staticmethod
+    def _weekly_plan_cache_key(priority_rows, weeks, mode):
+        """우선순위 목록과 파라미터의 내용 해시로 주간 분배 계획 캐시 키 생성"""
+        digest = hashlib.sha256(repr((priority_rows, int(weeks), mode)).encode('utf-8')).hexdigest()
+        return f"weekly_plan_{digest}"
+    
+    @staticmethod
+    def _build_weekly_plan(table, weeks, mode='greedy'):
+        """아이템 타입별 우선순위 표(PriorityTable)로 주간 분배 계획 계산 (DB 조회 없음)
+        
+        획득 기록은 플레이어 인덱스별 아이템 타입 비트마스크로 계산한 뒤 결과에서만 dict로 바꾼다.
+        
+        mode='greedy': 층/아이템 순서대로 획득 개수가 적은 플레이어에게 분배
+        mode='optimal': 아이템 타입별 8주 드롭과 플레이어를 최소 비용 배정으로 분배
+        """
+        # 주간 획득 가능 아이템 (기본 영웅 레이드 4층 구조)
+        weekly_items = RAID_FLOOR_DROPS
+        
+        # 한 주에 분배되는 총 아이템 개수
+        total_items_per_week = sum(len(items) for items in weekly_items.values())
+        
+        # 총 아이템 개수
+        total_item_types = total_items_per_week
+        
+        # 8주차까지 균등 분배 계획 생성
+        first_eight_weeks = min(8, weeks)
+        
+        # 8주차까지 분배할 수 있는 총 아이템 개수
+        total_items_first_eight_weeks = first_eight_weeks * total_items_per_week
+        
+        # 플레이어별 목표 아이템 개수 (균등 분배를 위해)
+        target_items_per_player = total_items_first_eight_weeks // len(table)
+        if target_items_per_player > total_item_types:
+            target_items_per_player = total_item_types  # 최대 모든 부위 1회씩만 획득 가능
+        
+        tracing.event('weekly_plan.target', target_items_per_player=target_items_per_player)
+        
+        if mode == 'optimal':
+            weekly_plan, acquired, counts = DistributionService._allocate_optimal(
+                table, first_eight_weeks, target_items_per_player
+            )
+        else:
+            weekly_plan, acquired, counts = DistributionService._allocate_greedy(
+                table, first_eight_weeks, target_items_per_player
+            )
+        
+        # 9주차 이후는 별도 로직 없이 빈 계획만 생성 (사용자가 직접 입력할 수 있도록)
+        if weeks > 8:
+            for week in range(9, weeks + 1):
                 week_plan = {
                     'week': week,
-                    'floors': {}
+                    'floors': {},
+                    'manual_input': True  # 수동 입력 가능 표시
                 }
                 
-                # 플레이어별 주간 획득 아이템 개수
-                weekly_player_acquisitions = {player_id: 0 for player_id in player_ids}
-                
-                # 각 층별로 아이템 분배
+                # 각 층별로 빈 계획 생성
                 for floor, item_types in weekly_items.items():
-                    logger.info(f"{floor}층 아이템 분배 시작")
-                    floor_plan = []
-                    
-                    for item_type in item_types:
-                        logger.info(f"아이템 타입 {item_type} 분배 처리")
-                        
-                        # 해당 아이템 타입에 대한 우선순위 목록
-                        type_priorities = copy.deepcopy(priorities_by_type.get(item_type, []))
-                        
-                        if not type_priorities:
-                            logger.warning(f"아이템 타입 {item_type}에 대한 우선순위 데이터가 없습니다.")
-                            continue
-                        
-                        # 아직 해당 타입의 아이템을 획득하지 않은 플레이어 중
-                        # 전체 획득 아이템 개수가 가장 적고, 우선순위가 높은 플레이어에게 분배
-                        eligible_players = [
-                            p for p in type_priorities 
-                            if not player_item_records[p['player_id']][item_type]  # 해당 타입의 아이템을 아직 획득하지 않은 플레이어
-                        ]
-                        
-                        if eligible_players:
-                            # 전체 획득 아이템 개수가 적은 순으로 정렬
-                            eligible_players.sort(key=lambda x: (
-                                player_item_counts[x['player_id']],  # 1차: 총 획득 개수가 적은 순
-                                weekly_player_acquisitions[x['player_id']],  # 2차: 이번 주 획득 개수가 적은 순
-                                x['priority']  # 3차: 원래 우선순위가 높은 순
-                            ))
-                            
-                            winner = eligible_players[0]
-                            player_id = winner['player_id']
-                            player_name = winner['player_name']
-                            
-                            # 플레이어 아이템 획득 기록 업데이트
-                            player_item_records[player_id][item_type] = True
-                            player_item_counts[player_id] += 1
-                            weekly_player_acquisitions[player_id] += 1
-                            
-                            floor_plan.append({
-                                'item_type': item_type,
-                                'player_id': player_id,
-                                'player_name': player_name,
-                                'original_priority': winner['priority']
-                            })
-                            
-                            logger.info(f"분배 결과: {item_type} -> {player_name} (원래 우선순위: {winner['priority']}, 총 획득 개수: {player_item_counts[player_id]})")
-                        else:
-                            # 모든 플레이어가 이미 해당 타입의 아이템을 획득한 경우
-                            # 원래 우선순위에 따라 분배 (단, 총 획득 개수를 고려)
-                            adjusted_priorities = []
-                            
-                            for p in type_priorities:
-                                # 이미 목표 아이템 개수를 초과한 플레이어는 제외
-                                if player_item_counts[p['player_id']] >= target_items_per_player:
-                                    continue
-                                
-                                adjusted_priorities.append(p)
-                            
-                            if adjusted_priorities:
-                                # 전체 획득 아이템 개수가 적은 순으로 정렬
-                                adjusted_priorities.sort(key=lambda x: (
-                                    player_item_counts[x['player_id']],  # 1차: 총 획득 개수가 적은 순
-                                    weekly_player_acquisitions[x['player_id']],  # 2차: 이번 주 획득 개수가 적은 순
-                                    x['priority']  # 3차: 원래 우선순위가 높은 순
-                                ))
-                                
-                                winner = adjusted_priorities[0]
-                                player_id = winner['player_id']
-                                player_name = winner['player_name']
-                                
-                                # 플레이어 아이템 획득 기록 업데이트
-                                player_item_counts[player_id] += 1
-                                weekly_player_acquisitions[player_id] += 1
-                                
-                                floor_plan.append({
-                                    'item_type': item_type,
-                                    'player_id': player_id,
-                                    'player_name': player_name,
-                                    'original_priority': winner['priority'],
-                                    'note': '이미 획득한 아이템 타입'
-                                })
-                                
-                                logger.info(f"분배 결과(중복 아이템): {item_type} -> {player_name} (총 획득 개수: {player_item_counts[player_id]})")
-                    
-                    week_plan['floors'][floor] = floor_plan
-                    logger.info(f"{floor}층 분배 완료: {len(floor_plan)}개 아이템 분배됨")
+                    week_plan['floors'][floor] = []
                 
                 weekly_plan.append(week_plan)
-                logger.info(f"{week}주차 분배 계획 생성 완료")
-                logger.info(f"플레이어별 획득 아이템 현황: {dict(player_item_counts)}")
+        
+        # 미획득 아이템 확인 (8주차까지 모든 플레이어가 모든 타입의 아이템을 획득했는지)
+        all_types = (1 << len(table.item_types)) - 1
+        missing_items = {}
+        if weeks >= 8:
+            for player_index, mask in enumerate(acquired):
+                if mask != all_types:
+                    missing_items[table.player_names[player_index]] = table.item_types_not_in(mask)
+            # 플레이어별 목록은 결과의 missing_items로 반환
+            if missing_items:
+                logger.warning(f"8주차까지 모든 아이템을 획득하지 못하는 플레이어 {len(missing_items)}명")
+        
+        # 플레이어별 최종 아이템 획득 현황 집계
+        return {
+            'weekly_plan': weekly_plan,
+            'player_acquisitions': {
+                table.player_ids[player_index]: counts[player_index]
+                for player_index in sorted(range(len(table)), key=counts.__getitem__, reverse=True)
+            },
+            'player_item_records': {
+                player_id: {
+                    'items': table.item_types_in(mask),
+                    'missing': table.item_types_not_in(mask)
+                } for player_id, mask in zip(table.player_ids, acquired)
+            },
+            'missing_items': missing_items,  # 8주차까지 미획득 아이템 정보
+            'mode': mode,
+            'target_items_per_player': target_items_per_player  # 플레이어별 목표 아이템 개수
+        }
+    
+    @staticmethod
+    def _warn_missing_priorities(missing_types):
+        """분배 중 우선순위 데이터가 없어 건너뛴 아이템 타입을 한 번에 경고"""
+        if missing_types:
+            logger.warning(f"우선순위 데이터가 없는 아이템 타입: {', '.join(sorted(missing_types))}")
+    
+    @staticmethod
+    def _assignment(table, type_index, position, duplicate):
+        """계획 결과의 분배 항목 (아이템 타입 우선순위 목록의 position번째 플레이어)"""
+        player_index = table.orders[type_index][position]
+        assignment = {
+            'item_type': table.item_types[type_index],
+            'player_id': table.player_ids[player_index],
+            'player_name': table.player_names[player_index],
+            'original_priority': table.ranks[type_index][position]
+        }
+        if duplicate:
+            assignment['note'] = '이미 획득한 아이템 타입'
+        return assignment
+    
+    @staticmethod
+    def _allocate_greedy(table, first_eight_weeks, target_items_per_player):
+        """균등 분배 - 아이템마다 (총 획득 개수, 주간 획득 개수, 우선순위)가 가장 작은 플레이어에게 분배
+        
+        (주간 계획, 플레이어 인덱스별 획득 타입 비트마스크, 플레이어 인덱스별 획득 개수) 반환
+        """
+        weekly_items = RAID_FLOOR_DROPS
+        weekly_plan = []
+        
+        # 아이템 타입별 우선순위 큐 기반 분배기
+        allocator = WeeklyAllocator(table, target_items_per_player)
+        # 우선순위 데이터가 없는 아이템 타입 (루프가 끝난 뒤 한 번만 경고)
+        missing_types = set()
+        
+        for week in range(1, first_eight_weeks + 1):
+            week_plan = {
+                'week': week,
+                'floors': {}
+            }
+            
+            # 플레이어별 주간 획득 아이템 개수 초기화
+            allocator.start_week()
             
-            # 9주차 이후는 별도 로직 없이 빈 계획만 생성 (사용자가 직접 입력할 수 있도록)
-            if weeks > 8:
-                for week in range(9, weeks + 1):
-                    logger.info(f"==== {week}주차 빈 분배 계획 생성 ====")
+            # 각 층별로 아이템 분배
+            for floor, item_types in weekly_items.items():
+                floor_plan = []
+                
+                for item_type in item_types:
+                    type_index = table.type_index.get(item_type)
+                    if type_index is None or not table.orders[type_index]:
+                        missing_types.add(item_type)
+                        continue
                     
-                    week_plan = {
-                        'week': week,
-                        'floors': {},
-                        'manual_input': True  # 수동 입력 가능 표시
-                    }
+                    # 아직 해당 타입의 아이템을 획득하지 않은 플레이어 중
+                    # 전체 획득 아이템 개수가 가장 적고, 우선순위가 높은 플레이어에게 분배
+                    # (모두 획득했다면 목표 개수 미만인 플레이어 중에서 분배)
+                    allocation = allocator.allocate(type_index)
+                    if allocation is None:
+                        continue
                     
-                    # 각 층별로 빈 계획 생성
-                    for floor, item_types in weekly_items.items():
-                        week_plan['floors'][floor] = []
+                    position, duplicate = allocation
+                    floor_plan.append(DistributionService._assignment(table, type_index, position, duplicate))
                     
-                    weekly_plan.append(week_plan)
-                    logger.info(f"{week}주차 빈 분배 계획 생성 완료")
-            
-            # 미획득 아이템 확인 (8주차까지 모든 플레이어가 모든 타입의 아이템을 획득했는지)
-            missing_items = {}
-            if weeks >= 8:
-                for player_id, item_records in player_item_records.items():
-                    missing = [item_type for item_type, acquired in item_records.items() if not acquired]
-                    if missing:
-                        player = Player.objects.get(id=player_id)
-                        missing_items[player.nickname] = missing
-                        logger.warning(f"플레이어 {player.nickname}(ID:{player_id})의 미획득 아이템: {missing}")
-            
-            # 플레이어별 최종 아이템 획득 현황 집계
-            return {
-                'success': True,
-                'weekly_plan': weekly_plan,
-                'player_acquisitions': {
-                    player_id: count 
-                    for player_id, count in sorted(
-                        player_item_counts.items(), 
-                        key=lambda x: x[1], 
-                        reverse=True
-                    )
-                },
-                'player_item_records': {
-                    player_id: {
-                        'items': [item_type for item_type, acquired in items.items() if acquired],
-                        'missing': [item_type for item_type, acquired in items.items() if not acquired]
-                    } for player_id, items in player_item_records.items()
-                },
-                'missing_items': missing_items,  # 8주차까지 미획득 아이템 정보
-                'target_items_per_player': target_items_per_player  # 플레이어별 목표 아이템 개수
-            }
+                    if tracing.active():
+                        player_index = table.orders[type_index][position]
+                        tracing.event(
+                            'weekly_plan.assign', week=week, floor=floor, item_type=item_type,
+                            player_id=table.player_ids[player_index], priority=table.ranks[type_index][position],
+                            acquired=allocator.counts[player_index], duplicate=duplicate
+                        )
+                
+                week_plan['floors'][floor] = floor_plan
             
-        except Season.DoesNotExist:
-            logger.error(f"시즌 ID {season_id}를 찾을 수 없습니다.")
-            return {
-                'success': False,
-                'error': '존재하지 않는 시즌입니다.'
-            }
-        except Exception as e:
-            logger.error(f"분배 계획 생성 중 예외 발생: {str(e)}")
-            logger.error(traceback.format_exc())
-            return {
-                'success': False,
-                'error': f'분배 계획 생성 중 오류가 발생했습니다: {str(e)}'
+            weekly_plan.append(week_plan)
+        
+        DistributionService._warn_missing_priorities(missing_types)
+        return weekly_plan, allocator.acquired, allocator.counts
+    
+    @staticmethod
+    def _allocate_optimal(table, first_eight_weeks, target_items_per_player):
+        """최적 배정 - 아이템 타입별 (주차 드롭 x 플레이어) 최소 비용 배정
+        
+        비용은 우선순위 순위와 주차의 차이 제곱에, 같은 주에 이미 배정된 아이템 수에 대한 벌점을 더한 값이다.
+        배정 문제는 최대 매칭을 보장하므로 드롭 수가 충분한 아이템 타입은 필요한 모든 플레이어가 받는다.
+        남은 드롭은 목표 개수 미만인 플레이어 중 획득 개수가 적은 순으로 분배한다.
+        반환값은 _allocate_greedy와 같다.
+        """
+        weekly_items = RAID_FLOOR_DROPS
+        weeks = range(1, first_eight_weeks + 1)
+        
+        player_count = len(table)
+        acquired = array('L', [0]) * player_count
+        counts = array('l', [0]) * player_count
+        # [플레이어 인덱스 * 주차 폭 + 주차] 같은 주에 배정된 아이템 수
+        week_span = first_eight_weeks + 1
+        weekly_loads = array('l', [0]) * (player_count * week_span)
+        
+        # 같은 주에 아이템 1개를 더 받는 벌점 (최대 순위 차이 제곱과 같은 크기)
+        load_penalty = first_eight_weeks * first_eight_weeks
+        
+        # (주차, 타입 인덱스) -> (우선순위 목록 위치, 중복 획득 여부)
+        drop_winners = {}
+        missing_types = set()
+        
+        for floor, item_types in weekly_items.items():
+            for item_type in item_types:
+                type_index = table.type_index.get(item_type)
+                if type_index is None or not table.orders[type_index]:
+                    missing_types.add(item_type)
+                    continue
+                
+                order = table.orders[type_index]
+                cost = [
+                    [
+                        (rank - week) ** 2 + load_penalty * weekly_loads[player_index * week_span + week]
+                        for week in weeks
+                    ]
+                    for rank, player_index in enumerate(order, 1)
+                ]
+                
+                for position, col in enumerate(solve_assignment(cost)):
+                    if col is None:
+                        continue
+                    week = col + 1
+                    player_index = order[position]
+                    acquired[player_index] |= 1 << type_index
+                    counts[player_index] += 1
+                    weekly_loads[player_index * week_span + week] += 1
+                    drop_winners[(week, type_index)] = (position, False)
+        
+        # 필요한 플레이어가 모두 받은 뒤 남은 드롭 분배
+        for week in weeks:
+            for floor, item_types in weekly_items.items():
+                for item_type in item_types:
+                    type_index = table.type_index.get(item_type)
+                    if type_index is None or (week, type_index) in drop_winners:
+                        continue
+                    
+                    order = table.orders[type_index]
+                    ranks = table.ranks[type_index]
+                    candidates = [
+                        (counts[player_index], weekly_loads[player_index * week_span + week], ranks[position], position)
+                        for position, player_index in enumerate(order)
+                        if counts[player_index] < target_items_per_player
+                    ]
+                    if not candidates:
+                        continue
+                    
+                    position = min(candidates)[3]
+                    player_index = order[position]
+                    counts[player_index] += 1
+                    weekly_loads[player_index * week_span + week] += 1
+                    drop_winners[(week, type_index)] = (position, True)
+        
+        weekly_plan = []
+        for week in weeks:
+            week_plan = {
+                'week': week,
+                'floors': {}
             }
+            for floor, item_types in weekly_items.items():
+                floor_plan = []
+                for item_type in item_types:
+                    type_index = table.type_index.get(item_type)
+                    if (week, type_index) not in drop_winners:
+                        continue
+                    
+                    position, duplicate = drop_winners[(week, type_index)]
+                    floor_plan.append(DistributionService._assignment(table, type_index, position, duplicate))
+                week_plan['floors'][floor] = floor_plan
+            weekly_plan.append(week_plan)
         
+        DistributionService._warn_missing_priorities(missing_types)
+        return weekly_plan, acquired, counts
+    
     @staticmethod
     def _adjust_priorities_for_fairness(type_priorities, player_acquisitions):
         """공정한 분배를 위해 우선순위 재조정"""
@@ -0,0 +1,390 @@
+# ff14_bis_backend/bis_manager/services/job_service.py
+from contextlib import nullcontext
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import timedelta
+import json
+import threading
+import time
+import traceback
+
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.utils import timezone
+
+from bis_manager.models import BackgroundJob, Season, StalePriority
+from bis_manager import tracing
+from .distribution_service import DistributionService
+from .distribution_plan_service import DistributionPlanService
+from .loot_simulation_service import LootSimulationService
+
+import logging
+logger = logging.getLogger(__name__)
+
+# 진행 중 상태 (같은 중복 방지 키로는 하나만 존재)
+INFLIGHT_STATUSES = ['pending', 'running']
+
+# 시즌 전체 결과(DistributionPriority)를 다시 쓰는 작업은 파라미터와 무관하게 시즌마다 하나만 진행
+SEASON_EXCLUSIVE_JOBS = {'calculate_priority'}
+
+class JobSubmitError(Exception):
+    """진행 중 작업 선점과 조회가 계속 엇갈려 작업을 등록하지 못함"""
+    pass
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# 같은 프로세스 안의 동시 요청은 DB 폴링 없이 Future로 결과 공유
+_local_flights = {}
+_local_flights_lock = threading.Lock()
+
+def _get_executor():
+    """프로세스 내 작업 실행기 (처음 사용할 때 생성)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'BACKGROUND_JOB_WORKERS', 2),
+                thread_name_prefix='bis-job'
+            )
+        return _executor
+
+class JobService:
+    """계산 작업을 요청 스레드 밖에서 실행하고 상태/결과를 DB에 기록하는 서비스 클래스"""
+
+    @staticmethod
+    def submit(job_type, season_id, params=None, user=None):
+        """작업 등록 후 실행 예약 (BACKGROUND_JOBS_EAGER이면 바로 실행)
+
+        같은 중복 방지 키의 작업이 이미 진행 중이면 새로 실행하지 않는다.
+        - 파라미터도 같으면 그 작업을 반환
+        - 파라미터가 다르면(예: 증분 계산 중 전체 계산 요청) 대기 작업으로 등록하고 진행 중 작업이 끝난 뒤 실행
+        선점과 조회가 계속 엇갈리면 중복 작업을 만들지 않고 JobSubmitError를 발생시킨다.
+        """
+        params = params or {}
+        key = JobService.dedupe_key(job_type, season_id, params)
+        JobService._expire_abandoned(key)
+
+        # 선점 실패 후 진행 중이던 작업이 그 사이 끝난 경우를 위해 몇 번 재시도
+        for _ in range(3):
+            job = JobService._claim(job_type, season_id, params, user, key)
+            if job is not None:
+                break
+
+            inflight = BackgroundJob.objects.filter(dedupe_key=key, status__in=INFLIGHT_STATUSES).first()
+            if inflight is not None and inflight.params == params:
+                logger.info(f"진행 중인 백그라운드 작업 재사용: job_id={inflight.id}, key={key}")
+                return inflight
+            if inflight is not None:
+                job, created = JobService._queue(job_type, season_id, params, user)
+                if not created:
+                    logger.info(f"대기 중인 백그라운드 작업 재사용: job_id={job.id}, key={key}")
+                    return job
+                logger.info(f"진행 중인 작업 뒤에 대기: job_id={job.id}, 진행 중 job_id={inflight.id}, key={key}")
+                break
+        else:
+            raise JobSubmitError('계산 작업을 시작하지 못했습니다. 잠시 후 다시 시도해주세요.')
+        logger.info(f"백그라운드 작업 등록: job_id={job.id}, 종류={job_type}, season_id={season_id}")
+
+        if getattr(settings, 'BACKGROUND_JOBS_EAGER', False):
+            JobService._execute(job.id, key)
+            job.refresh_from_db()
+        else:
+            # 작업 행이 커밋된 뒤에 실행해야 다른 스레드에서 조회 가능
+            transaction.on_commit(lambda: _get_executor().submit(JobService._run_in_worker, job.id, key))
+
+        return job
+
+    @staticmethod
+    def run_single_flight(job_type, season_id, params=None, user=None, progress=None):
+        """요청 스레드에서 작업을 실행하되, 같은 작업이 이미 진행 중이면 새로 계산하지 않고 그 결과를 기다려 공유
+
+        - 같은 프로세스: 진행 중인 Future를 기다림
+        - 다른 프로세스: DB의 진행 중 작업 행(중복 방지 키 유일 제약)이 끝날 때까지 폴링
+        - 최근 SINGLE_FLIGHT_RESULT_TTL초 안에 끝난 같은 작업이 있으면 그 결과를 반환 (갱신 필요 표시가 없을 때만)
+        결과는 파라미터까지 같은 작업끼리만 공유한다. 같은 중복 방지 키로 파라미터가 다른 작업이 진행 중이면
+        (예: 증분 계산 중 전체 계산 요청) 그 작업이 끝나기를 기다린 뒤 직접 실행한다.
+        progress가 주어지면 직접 실행할 때 작업 행과 함께 progress(처리한 수, 전체 수)도 호출한다.
+        """
+        try:
+            season_id = int(season_id)
+            if not Season.objects.filter(pk=season_id).exists():
+                return {'success': False, 'error': '존재하지 않는 시즌입니다.'}
+        except (TypeError, ValueError):
+            return {'success': False, 'error': '존재하지 않는 시즌입니다.'}
+
+        params = params or {}
+        key = JobService.dedupe_key(job_type, season_id, params)
+        flight_key = JobService.result_key(job_type, season_id, params)
+
+        recent = JobService._recent_result(key, season_id, params)
+        if recent is not None:
+            logger.info(f"최근 계산 결과 재사용: key={flight_key}")
+            return recent
+
+        with _local_flights_lock:
+            future = _local_flights.get(flight_key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                _local_flights[flight_key] = future
+
+        if not is_leader:
+            logger.info(f"같은 프로세스의 진행 중 계산 대기: key={flight_key}")
+            try:
+                return future.result(timeout=getattr(settings, 'SINGLE_FLIGHT_WAIT_TIMEOUT', 120))
+            except FutureTimeoutError:
+                return {'success': False, 'error': '진행 중인 계산이 끝나지 않았습니다. 잠시 후 다시 시도해주세요.'}
+
+        try:
+            result = JobService._run_or_wait(job_type, season_id, params, user, key, progress)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with _local_flights_lock:
+                _local_flights.pop(flight_key, None)
+
+    @staticmethod
+    def dedupe_key(job_type, season_id, params=None):
+        """동시에 하나만 진행할 작업의 중복 방지 키 (SEASON_EXCLUSIVE_JOBS는 작업 종류/시즌만, 그 외는 result_key와 같음)"""
+        if job_type in SEASON_EXCLUSIVE_JOBS:
+            return f"{job_type}:{int(season_id)}"
+        return JobService.result_key(job_type, season_id, params)
+
+    @staticmethod
+    def result_key(job_type, season_id, params=None):
+        """결과를 공유할 수 있는 작업 키 (작업 종류/시즌/파라미터)"""
+        return f"{job_type}:{int(season_id)}:{json.dumps(params or {}, sort_keys=True, ensure_ascii=False)}"
+
+    @staticmethod
+    def run(job_id, on_progress=None):
+        """작업 실행 후 결과/오류 기록 (on_progress가 주어지면 진행 상황을 함께 전달)"""
+        job = BackgroundJob.objects.get(pk=job_id)
+        BackgroundJob.objects.filter(pk=job_id).update(status='running', started_at=timezone.now())
+
+        def progress(processed, total):
+            BackgroundJob.objects.filter(pk=job_id).update(progress=processed, total=total)
+            if on_progress is not None:
+                on_progress(processed, total)
+
+        # 요청 안에서 바로 실행하면 요청 추적의 구간으로, 작업 스레드에서는 표본으로 뽑힌 경우 별도 추적으로 기록
+        traced = tracing.active() or tracing.should_sample()
+        with tracing.trace('job', job_id=job_id, job_type=job.job_type) if traced else nullcontext():
+            try:
+                handler = JobService._get_handler(job.job_type)
+                result = handler(job, progress)
+
+                if result.get('success', False):
+                    BackgroundJob.objects.filter(pk=job_id).update(
+                        status='succeeded', result=result, finished_at=timezone.now()
+                    )
+                    logger.info(f"백그라운드 작업 완료: job_id={job_id}")
+                else:
+                    BackgroundJob.objects.filter(pk=job_id).update(
+                        status='failed', error=result.get('error', '알 수 없는 오류가 발생했습니다.'),
+                        finished_at=timezone.now()
+                    )
+                    logger.warning(f"백그라운드 작업 실패: job_id={job_id}, 오류={result.get('error')}")
+
+            except Exception as e:
+                logger.error(f"백그라운드 작업 중 예외 발생: job_id={job_id}, {str(e)}")
+                logger.error(traceback.format_exc())
+                BackgroundJob.objects.filter(pk=job_id).update(
+                    status='failed', error=str(e), finished_at=timezone.now()
+                )
+
+    @staticmethod
+    def _run_in_worker(job_id, key):
+        """작업 스레드 진입점 (스레드가 연 DB 연결 정리)"""
+        try:
+            JobService._execute(job_id, key)
+        finally:
+            connections.close_all()
+
+    @staticmethod
+    def _execute(job_id, key):
+        """선점한 작업은 바로 실행하고, 대기 작업(중복 방지 키 없음)은 진행 중 작업이 끝난 뒤 선점해서 실행"""
+        if BackgroundJob.objects.filter(pk=job_id, dedupe_key__isnull=True).exists():
+            JobService._run_queued(job_id, key)
+        else:
+            JobService.run(job_id)
+
+    @staticmethod
+    def _queue(job_type, season_id, params, user):
+        """진행 중 작업 뒤에 실행할 대기 작업 (같은 파라미터의 대기 작업이 있으면 재사용) - (작업, 생성 여부) 반환"""
+        queued = BackgroundJob.objects.filter(
+            job_type=job_type, season_id=season_id, dedupe_key__isnull=True, status='pending'
+        )
+        for job in queued:
+            if job.params == params:
+                return job, False
+        return JobService._claim(job_type, season_id, params, user, None), True
+
+    @staticmethod
+    def _run_queued(job_id, key):
+        """같은 키의 진행 중 작업이 끝날 때까지 기다렸다가 대기 작업에 키를 붙여 선점하고 실행"""
+        timeout = getattr(settings, 'SINGLE_FLIGHT_WAIT_TIMEOUT', 120)
+        interval = getattr(settings, 'SINGLE_FLIGHT_POLL_INTERVAL', 0.2)
+        deadline = time.monotonic() + timeout
+
+        while True:
+            JobService._expire_abandoned(key)
+            try:
+                with transaction.atomic():
+                    claimed = BackgroundJob.objects.filter(
+                        pk=job_id, dedupe_key__isnull=True, status='pending'
+                    ).update(dedupe_key=key)
+            except IntegrityError:
+                claimed = 0
+
+            if claimed:
+                JobService.run(job_id)
+                return
+            if time.monotonic() >= deadline:
+                BackgroundJob.objects.filter(pk=job_id, status='pending').update(
+                    status='failed', error='진행 중인 계산이 끝나지 않아 작업을 시작하지 못했습니다.',
+                    finished_at=timezone.now()
+                )
+                logger.warning(f"대기 작업 시작 실패: job_id={job_id}, key={key}")
+                return
+            time.sleep(interval)
+
+    @staticmethod
+    def _run_or_wait(job_type, season_id, params, user, key, progress=None):
+        """진행 중 작업 행을 선점하면 직접 실행하고, 다른 프로세스가 선점했으면 끝날 때까지 대기"""
+        JobService._expire_abandoned(key)
+
+        # 선점 실패 후 기다리려던 작업이 그 사이 끝난 경우를 위해 몇 번 재시도
+        for _ in range(3):
+            job = JobService._claim(job_type, season_id, params, user, key)
+            if job is not None:
+                JobService.run(job.id, on_progress=progress)
+                return JobService._job_result(BackgroundJob.objects.get(pk=job.id))
+
+            inflight = BackgroundJob.objects.filter(dedupe_key=key, status__in=INFLIGHT_STATUSES).first()
+            if inflight is not None and inflight.params == params:
+                logger.info(f"다른 프로세스의 진행 중 계산 대기: job_id={inflight.id}, key={key}")
+                return JobService._wait_for(inflight.id)
+            if inflight is not None:
+                # 파라미터가 다른 작업의 결과는 공유하지 않고, 끝나기를 기다린 뒤 다시 선점
+                logger.info(f"파라미터가 다른 진행 중 계산이 끝나기를 대기: job_id={inflight.id}, key={key}")
+                if JobService._wait_until_done(inflight.id) is None:
+                    return {'success': False, 'error': '진행 중인 계산이 끝나지 않았습니다. 잠시 후 다시 시도해주세요.'}
+
+        return {'success': False, 'error': '계산 작업을 시작하지 못했습니다. 잠시 후 다시 시도해주세요.'}
+
+    @staticmethod
+    def _claim(job_type, season_id, params, user, key):
+        """진행 중 작업 행 생성 (같은 키의 진행 중 작업이 있으면 None, key가 None이면 대기 작업)"""
+        try:
+            with transaction.atomic():
+                return BackgroundJob.objects.create(
+                    job_type=job_type,
+                    season_id=season_id,
+                    params=params or {},
+                    dedupe_key=key,
+                    requested_by=user if user is not None and user.is_authenticated else None
+                )
+        except IntegrityError:
+            return None
+
+    @staticmethod
+    def _wait_for(job_id):
+        """작업이 끝날 때까지 DB 폴링 후 결과 반환"""
+        job = JobService._wait_until_done(job_id)
+        if job is None:
+            return {'success': False, 'error': '진행 중인 계산이 끝나지 않았습니다. 잠시 후 다시 시도해주세요.'}
+        return JobService._job_result(job)
+
+    @staticmethod
+    def _wait_until_done(job_id):
+        """작업이 끝날 때까지 DB 폴링 후 작업 반환 (SINGLE_FLIGHT_WAIT_TIMEOUT 안에 끝나지 않으면 None)"""
+        timeout = getattr(settings, 'SINGLE_FLIGHT_WAIT_TIMEOUT', 120)
+        interval = getattr(settings, 'SINGLE_FLIGHT_POLL_INTERVAL', 0.2)
+        deadline = time.monotonic() + timeout
+
+        while True:
+            job = BackgroundJob.objects.get(pk=job_id)
+            if job.status not in INFLIGHT_STATUSES:
+                return job
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(interval)
+
+    @staticmethod
+    def _job_result(job):
+        if job.status == 'succeeded':
+            return job.result
+        return {'success': False, 'error': job.error or '알 수 없는 오류가 발생했습니다.'}
+
+    @staticmethod
+    def _recent_result(key, season_id, params):
+        """최근 TTL 안에 끝난 같은 키/파라미터 작업의 결과 (그 뒤로 비스가 바뀌어 갱신 필요 표시가 있으면 None)"""
+        ttl = getattr(settings, 'SINGLE_FLIGHT_RESULT_TTL', 0)
+        if not ttl:
+            return None
+
+        recent_jobs = BackgroundJob.objects.filter(
+            dedupe_key=key,
+            status='succeeded',
+            finished_at__gte=timezone.now() - timedelta(seconds=ttl)
+        ).order_by('-finished_at')
+        job = next((job for job in recent_jobs if job.params == params), None)
+
+        if job is None or StalePriority.objects.filter(season_id=season_id).exists():
+            return None
+        return job.result
+
+    @staticmethod
+    def _expire_abandoned(key):
+        """프로세스 종료 등으로 끝나지 못한 오래된 진행 중 작업을 실패 처리 (유일 제약 해제)"""
+        stale_after = getattr(settings, 'SINGLE_FLIGHT_STALE_AFTER', 600)
+        expired = BackgroundJob.objects.filter(
+            dedupe_key=key,
+            status__in=INFLIGHT_STATUSES,
+            created_at__lt=timezone.now() - timedelta(seconds=stale_after)
+        ).update(
+            status='failed',
+            error='작업이 제시간에 끝나지 않아 중단된 것으로 처리했습니다.',
+            finished_at=timezone.now()
+        )
+        if expired:
+            logger.warning(f"중단된 백그라운드 작업 {expired}개 실패 처리: key={key}")
+
+    @staticmethod
+    def _get_handler(job_type):
+        handlers = {
+            'calculate_priority': JobService._calculate_priority,
+            'generate_distribution_plan': JobService._generate_distribution_plan,
+            'simulate_loot': JobService._simulate_loot,
+        }
+        return handlers[job_type]
+
+    @staticmethod
+    def _calculate_priority(job, progress):
+        return DistributionService.calculate_priority_for_season(
+            job.season_id,
+            incremental=job.params.get('incremental', False),
+            progress=progress
+        )
+
+    @staticmethod
+    def _generate_distribution_plan(job, progress):
+        return DistributionPlanService.generate_and_save(
+            job.season_id,
+            job.params.get('weeks', 12),
+            job.params.get('mode', 'greedy'),
+            progress=progress
+        )
+
+    @staticmethod
+    def _simulate_loot(job, progress):
+        return LootSimulationService.simulate_season(
+            job.season_id,
+            job.params.get('trials', 1000),
+            job.params.get('policy', 'priority'),
+            job.params.get('max_weeks', 24),
+            job.params.get('seed')
+        )
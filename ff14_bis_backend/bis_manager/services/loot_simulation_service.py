@@ -0,0 +1,267 @@
+# ff14_bis_backend/bis_manager/services/loot_simulation_service.py
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import multiprocessing
+import random
+import threading
+import traceback
+
+from django.conf import settings
+
+from bis_manager.models import Season
+from bis_manager.constants import (
+    ITEM_TYPES, RING_SLOTS, RAID_FLOOR_DROPS, RAID_FLOOR_DROP_COUNTS, WEEKLY_TOMESTONE_INCOME
+)
+from .distribution_service import DistributionService
+from .resource_calculation_service import ResourceCalculationService
+from .resource_cost_table import get_cost_table
+from .season_model import SeasonModel, SLOTS, iter_bits
+from .loot_simulator import simulate_batch
+
+import logging
+logger = logging.getLogger(__name__)
+
+# 한 번에 요청할 수 있는 최대 시행 횟수
+MAX_TRIALS = 20000
+
+# 프로세스 풀 작업 단위 (배치마다 고정된 시드를 사용하므로 워커 수와 무관하게 결과가 같음)
+BATCH_SIZE = 500
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool():
+    """프로세스 내 시뮬레이션 프로세스 풀 (처음 사용할 때 생성, 모든 요청이 공유)
+
+    요청 스레드가 여럿인 프로세스에서 fork하지 않도록 spawn으로 워커를 띄운다.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=getattr(settings, 'LOOT_SIMULATION_WORKERS', 2),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _pool
+
+class LootSimulationService:
+    """무작위 드롭/낱장/석판 교환으로 시즌을 반복 진행하여 비스 완료 주차 분포를 예측하는 서비스 클래스"""
+
+    @staticmethod
+    def simulate_season(season_id, trials=1000, policy='priority', max_weeks=24, seed=None, workers=None):
+        """시즌 루팅 시뮬레이션 실행
+
+        policy='priority': 분배 우선순위가 높은 플레이어에게 드롭 분배
+        policy='fewest': 드롭 획득 수가 가장 적은 플레이어에게 분배 (동률이면 우선순위 순)
+        policy='random': 필요한 플레이어 중 무작위 분배
+        """
+        try:
+            logger.info(f"루팅 시뮬레이션 시작: 시즌 ID={season_id}, 시행={trials}, 정책={policy}, 최대 주차={max_weeks}")
+
+            season = Season.objects.get(pk=season_id)
+            season_model = SeasonModel.load(season)
+            priority_rows = DistributionService._load_priority_rows(season)
+
+            model = LootSimulationService.build_model(season_model, priority_rows)
+            if not model['player_ids']:
+                return {
+                    'success': False,
+                    'error': '최종 비스 세트가 있는 플레이어가 없습니다.'
+                }
+
+            if seed is None:
+                seed = random.SystemRandom().randrange(2 ** 32)
+
+            player_histograms, static_histogram = LootSimulationService._run_batches(
+                model, policy, trials, max_weeks, seed, workers
+            )
+
+            players = []
+            for player_index, player_id in enumerate(model['player_ids']):
+                players.append({
+                    'player_id': player_id,
+                    'player_name': model['player_names'][player_index],
+                    **LootSimulationService._summarize(player_histograms[player_index], trials, max_weeks)
+                })
+
+            logger.info(f"루팅 시뮬레이션 완료: 시즌 ID={season_id}, 플레이어 수={len(players)}")
+
+            return {
+                'success': True,
+                'trials': trials,
+                'policy': policy,
+                'max_weeks': max_weeks,
+                'seed': seed,
+                'players': players,
+                'static': LootSimulationService._summarize(static_histogram, trials, max_weeks)
+            }
+
+        except Season.DoesNotExist:
+            logger.error(f"시즌 ID {season_id}를 찾을 수 없습니다.")
+            return {
+                'success': False,
+                'error': '존재하지 않는 시즌입니다.'
+            }
+        except Exception as e:
+            logger.error(f"루팅 시뮬레이션 중 예외 발생: {str(e)}")
+            logger.error(traceback.format_exc())
+            return {
+                'success': False,
+                'error': f'루팅 시뮬레이션 중 오류가 발생했습니다: {str(e)}'
+            }
+
+    @staticmethod
+    def build_model(season_model, priority_rows):
+        """시즌 모델과 분배 우선순위로 시뮬레이션 모델 생성 (프로세스 간 전달할 수 있도록 기본 자료형만 사용)
+
+        - needs: 플레이어별 드롭 키(레이드 부위, 강화 아이템)마다 필요한 개수
+        - tome_costs: 플레이어별 석판으로 구매해야 하는 아이템 가격 목록
+        - drop_table: 층별 (드롭 가능한 키 목록, 주간 드롭 개수)
+        - page_shops: 층별 낱장 교환 목록 [(키, 낱장 개수)]
+        - drop_orders: 키별 플레이어 인덱스 우선순위
+        비용은 시즌 비용 표를 따른다.
+        """
+        cost_table = get_cost_table(season_model.season)
+        tomestone_costs = cost_table.tomestone_costs
+        page_costs = cost_table.page_costs
+        upgrade_costs = cost_table.upgrade_costs
+
+        keys = []
+        for item_type, _ in ITEM_TYPES:
+            key = LootSimulationService._drop_key(item_type)
+            if key not in keys:
+                keys.append(key)
+        keys.extend(upgrade_costs.keys())
+        key_index = {key: index for index, key in enumerate(keys)}
+
+        player_indices = season_model.final_indices()
+        player_ids = [season_model.player_ids[index] for index in player_indices]
+        needs = []
+        tome_costs = []
+        for player_index in player_indices:
+            need = [0] * len(keys)
+            costs = []
+
+            # 출발 비스와 다른(획득해야 하는) 슬롯만
+            for slot_index in iter_bits(season_model.needed_mask[player_index]):
+                item_type = SLOTS[slot_index]
+                source = season_model.source(player_index, slot_index)
+
+                if source == '영웅레이드템' and item_type in page_costs:
+                    need[key_index[LootSimulationService._drop_key(item_type)]] += 1
+                elif source in ('석판템', '보강석판템') and item_type in tomestone_costs:
+                    costs.append(tomestone_costs[item_type])
+                    if source == '보강석판템':
+                        need[key_index[ResourceCalculationService.get_upgrade_material(item_type)]] += 1
+
+            needs.append(need)
+            tome_costs.append(costs)
+
+        floors = sorted(RAID_FLOOR_DROPS.keys())
+        drop_table = []
+        page_shops = []
+        for floor in floors:
+            drop_keys = []
+            for item_type in RAID_FLOOR_DROPS[floor]:
+                key = key_index[LootSimulationService._drop_key(item_type)]
+                if key not in drop_keys:
+                    drop_keys.append(key)
+            drop_table.append((drop_keys, RAID_FLOOR_DROP_COUNTS.get(floor, 0)))
+
+            shop = []
+            for item_type, cost in page_costs.items():
+                key = key_index[LootSimulationService._drop_key(item_type)]
+                if cost['floor'] == floor and all(key != shop_key for shop_key, _ in shop):
+                    shop.append((key, cost['count']))
+            for material, cost in upgrade_costs.items():
+                if cost['floor'] == floor:
+                    shop.append((key_index[material], cost['count']))
+            page_shops.append(shop)
+
+        # 키별 우선순위 (우선순위가 없는 플레이어는 뒤에 플레이어 ID 순으로)
+        ranked = {}
+        for item_type, player_id, _, _ in priority_rows:
+            ranked.setdefault(item_type, []).append(player_id)
+        player_index = {player_id: index for index, player_id in enumerate(player_ids)}
+
+        drop_orders = []
+        for key in keys:
+            ranking = ranked.get(key) or ranked.get(f'{key}1') or []
+            order = [player_index[player_id] for player_id in ranking if player_id in player_index]
+            order.extend(index for index in range(len(player_ids)) if index not in order)
+            drop_orders.append(order)
+
+        return {
+            'player_ids': player_ids,
+            'player_names': [season_model.player_names[index] for index in player_indices],
+            'keys': keys,
+            'needs': needs,
+            'tome_costs': tome_costs,
+            'drop_table': drop_table,
+            'page_shops': page_shops,
+            'drop_orders': drop_orders,
+            'tomestone_income': WEEKLY_TOMESTONE_INCOME
+        }
+
+    @staticmethod
+    def _drop_key(item_type):
+        """드롭 키 (반지는 한 종류가 반지1/반지2 어느 슬롯이든 채움)"""
+        return '반지' if item_type in RING_SLOTS else item_type
+
+    @staticmethod
+    def _run_batches(model, policy, trials, max_weeks, seed, workers=None):
+        """시행을 배치로 나누어 실행하고 히스토그램 합산
+
+        배치가 여러 개면 공유 프로세스 풀(LOOT_SIMULATION_WORKERS개)을 사용하고, workers가 1이면 요청 스레드에서 실행한다.
+        """
+        sizes = [min(BATCH_SIZE, trials - start) for start in range(0, trials, BATCH_SIZE)]
+        seeds = [seed * 1000003 + batch_index for batch_index in range(len(sizes))]
+
+        if workers is None:
+            workers = getattr(settings, 'LOOT_SIMULATION_WORKERS', 2)
+        workers = min(workers, len(sizes))
+
+        if workers > 1:
+            results = list(_get_pool().map(
+                simulate_batch, repeat(model), repeat(policy), sizes, repeat(max_weeks), seeds
+            ))
+        else:
+            results = [
+                simulate_batch(model, policy, size, max_weeks, batch_seed)
+                for size, batch_seed in zip(sizes, seeds)
+            ]
+
+        player_histograms = [[0] * (max_weeks + 2) for _ in model['player_ids']]
+        static_histogram = [0] * (max_weeks + 2)
+        for batch_players, batch_static in results:
+            for histogram, batch_histogram in zip(player_histograms, batch_players):
+                for week, count in enumerate(batch_histogram):
+                    histogram[week] += count
+            for week, count in enumerate(batch_static):
+                static_histogram[week] += count
+
+        return player_histograms, static_histogram
+
+    @staticmethod
+    def _summarize(histogram, trials, max_weeks):
+        """완료 주차 히스토그램 요약 (미완료가 포함되는 백분위는 None)"""
+        incomplete = histogram[max_weeks + 1]
+        completed = trials - incomplete
+
+        def percentile(ratio):
+            threshold = ratio * trials
+            cumulative = 0
+            for week in range(max_weeks + 1):
+                cumulative += histogram[week]
+                if cumulative >= threshold:
+                    return week
+            return None
+
+        return {
+            'completion_rate': round(completed / trials, 4) if trials else 0,
+            'mean_week': round(sum(week * count for week, count in enumerate(histogram[:max_weeks + 1])) / completed, 2) if completed else None,
+            'median_week': percentile(0.5),
+            'p90_week': percentile(0.9),
+            'week_distribution': {week: count for week, count in enumerate(histogram[:max_weeks + 1]) if count},
+            'incomplete': incomplete
+        }
@@ -0,0 +1,107 @@
+# ff14_bis_backend/bis_manager/services/loot_simulator.py
+import random
+
+# 프로세스 풀 워커에서도 import 할 수 있도록 Django 모델에 의존하지 않는 순수 계산 모듈
+
+def simulate_batch(model, policy, trials, max_weeks, seed):
+    """시뮬레이션 모델로 trials회의 시즌을 진행하고 완료 주차 히스토그램 반환
+
+    model은 LootSimulationService.build_model이 만든 dict이다.
+    반환값은 (플레이어별 히스토그램 목록, 공대 전체 히스토그램)이며,
+    히스토그램의 인덱스 0은 시작 시점에 이미 완료, 1~max_weeks는 완료 주차, 마지막 인덱스는 미완료 횟수이다.
+    """
+    rng = random.Random(seed)
+    player_count = len(model['player_ids'])
+    player_histograms = [[0] * (max_weeks + 2) for _ in range(player_count)]
+    static_histogram = [0] * (max_weeks + 2)
+
+    for _ in range(trials):
+        completion_weeks = run_trial(model, policy, max_weeks, rng)
+        for player_index, week in enumerate(completion_weeks):
+            player_histograms[player_index][max_weeks + 1 if week is None else week] += 1
+
+        if None in completion_weeks:
+            static_histogram[max_weeks + 1] += 1
+        else:
+            static_histogram[max(completion_weeks, default=0)] += 1
+
+    return player_histograms, static_histogram
+
+def run_trial(model, policy, max_weeks, rng):
+    """한 시즌 진행 후 플레이어별 완료 주차 목록 반환 (max_weeks 안에 완료하지 못하면 None)"""
+    player_count = len(model['player_ids'])
+    needs = [list(row) for row in model['needs']]
+    # 싼 아이템부터 구매하도록 내림차순으로 두고 뒤에서 꺼냄
+    tome_costs = [sorted(costs, reverse=True) for costs in model['tome_costs']]
+    remaining = [sum(needs[p]) + len(tome_costs[p]) for p in range(player_count)]
+    pages = [[0] * len(model['page_shops']) for _ in range(player_count)]
+    tomestones = [0] * player_count
+    received = [0] * player_count
+
+    drop_table = model['drop_table']
+    drop_orders = model['drop_orders']
+    page_shops = model['page_shops']
+    income = model['tomestone_income']
+
+    completion_weeks = [0 if remaining[p] == 0 else None for p in range(player_count)]
+    active = [p for p in range(player_count) if remaining[p]]
+
+    for week in range(1, max_weeks + 1):
+        if not active:
+            break
+
+        # 레이드 드롭 분배
+        for keys, count in drop_table:
+            for _ in range(count):
+                key = keys[rng.randrange(len(keys))]
+                winner = _pick_winner(policy, drop_orders[key], needs, key, received, rng)
+                if winner is not None:
+                    needs[winner][key] -= 1
+                    remaining[winner] -= 1
+                    received[winner] += 1
+
+        # 석판/낱장 획득 및 교환
+        still_active = []
+        for p in active:
+            costs = tome_costs[p]
+            if costs:
+                tomestones[p] += income
+                while costs and tomestones[p] >= costs[-1]:
+                    tomestones[p] -= costs.pop()
+                    remaining[p] -= 1
+
+            need = needs[p]
+            page = pages[p]
+            for floor_index, shop in enumerate(page_shops):
+                page[floor_index] += 1
+                for key, cost in shop:
+                    while need[key] and page[floor_index] >= cost:
+                        page[floor_index] -= cost
+                        need[key] -= 1
+                        remaining[p] -= 1
+
+            if remaining[p]:
+                still_active.append(p)
+            else:
+                completion_weeks[p] = week
+        active = still_active
+
+    return completion_weeks
+
+def _pick_winner(policy, order, needs, key, received, rng):
+    """드롭 아이템을 받을 플레이어 인덱스 선택 (필요한 플레이어가 없으면 None)"""
+    if policy == 'priority':
+        for p in order:
+            if needs[p][key]:
+                return p
+        return None
+
+    if policy == 'fewest':
+        winner = None
+        for p in order:
+            if needs[p][key] and (winner is None or received[p] < received[winner]):
+                winner = p
+        return winner
+
+    candidates = [p for p in order if needs[p][key]]
+    return rng.choice(candidates) if candidates else None
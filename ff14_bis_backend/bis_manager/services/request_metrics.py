@@ -0,0 +1,103 @@
+# ff14_bis_backend/bis_manager/services/request_metrics.py
+"""요청별 지연 시간/DB 시간을 뷰 액션 단위로 모으는 프로세스 내 집계 (Prometheus 텍스트 형식으로 출력)
+
+PerformanceMiddleware가 표본으로 뽑은 요청마다 observe를 호출한다.
+집계는 프로세스(워커)별로 따로 쌓이며 재시작하면 초기화된다.
+"""
+import bisect
+import threading
+
+# 지연 시간 분포 구간 상한(초)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_series = {}
+
+class _Series:
+    """(뷰, 메서드) 하나의 누적 지연 시간 분포와 DB 사용량"""
+    __slots__ = ('bucket_counts', 'count', 'duration_sum', 'db_sum', 'queries', 'statuses')
+
+    def __init__(self):
+        self.bucket_counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.duration_sum = 0.0
+        self.db_sum = 0.0
+        self.queries = 0
+        self.statuses = {}
+
+def observe(view, method, status_code, duration, db_time, query_count):
+    """요청 하나의 측정값 기록 (시간 단위는 초)"""
+    status_class = f'{status_code // 100}xx'
+    index = bisect.bisect_left(BUCKETS, duration)
+    with _lock:
+        series = _series.get((view, method))
+        if series is None:
+            series = _series[(view, method)] = _Series()
+        if index < len(BUCKETS):
+            series.bucket_counts[index] += 1
+        series.count += 1
+        series.duration_sum += duration
+        series.db_sum += db_time
+        series.queries += query_count
+        series.statuses[status_class] = series.statuses.get(status_class, 0) + 1
+
+def reset():
+    with _lock:
+        _series.clear()
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(**labels):
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+def render_prometheus():
+    """누적 집계를 Prometheus 텍스트 노출 형식(0.0.4)으로 출력"""
+    with _lock:
+        snapshot = [
+            (view, method, list(series.bucket_counts), series.count, series.duration_sum,
+             series.db_sum, series.queries, dict(series.statuses))
+            for (view, method), series in sorted(_series.items())
+        ]
+
+    lines = [
+        '# HELP bis_request_duration_seconds 뷰 액션별 요청 처리 시간',
+        '# TYPE bis_request_duration_seconds histogram',
+    ]
+    for view, method, bucket_counts, count, duration_sum, *_ in snapshot:
+        cumulative = 0
+        for upper, bucket_count in zip(BUCKETS, bucket_counts):
+            cumulative += bucket_count
+            lines.append(f'bis_request_duration_seconds_bucket{_labels(view=view, method=method, le=upper)} {cumulative}')
+        lines.append(f'bis_request_duration_seconds_bucket{_labels(view=view, method=method, le="+Inf")} {count}')
+        lines.append(f'bis_request_duration_seconds_sum{_labels(view=view, method=method)} {duration_sum:.6f}')
+        lines.append(f'bis_request_duration_seconds_count{_labels(view=view, method=method)} {count}')
+
+    lines += [
+        '# HELP bis_request_db_seconds_total 뷰 액션별 DB 쿼리 실행 시간 합계',
+        '# TYPE bis_request_db_seconds_total counter',
+    ]
+    lines += [
+        f'bis_request_db_seconds_total{_labels(view=view, method=method)} {db_sum:.6f}'
+        for view, method, _, _, _, db_sum, _, _ in snapshot
+    ]
+
+    lines += [
+        '# HELP bis_request_queries_total 뷰 액션별 DB 쿼리 수 합계',
+        '# TYPE bis_request_queries_total counter',
+    ]
+    lines += [
+        f'bis_request_queries_total{_labels(view=view, method=method)} {queries}'
+        for view, method, _, _, _, _, queries, _ in snapshot
+    ]
+
+    lines += [
+        '# HELP bis_responses_total 뷰 액션별 응답 수 (상태 코드 종류별)',
+        '# TYPE bis_responses_total counter',
+    ]
+    lines += [
+        f'bis_responses_total{_labels(view=view, method=method, status=status)} {status_count}'
+        for view, method, _, _, _, _, _, statuses in snapshot
+        for status, status_count in sorted(statuses.items())
+    ]
+    return '\n'.join(lines) + '\n'
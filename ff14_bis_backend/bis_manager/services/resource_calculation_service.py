@@ -1,6 +1,12 @@
 # ff14_bis_backend/bis_manager/services/resource_calculation_service.py
-from bis_manager.constants import TOMESTONE_COSTS, PAGE_COSTS, UPGRADE_COSTS
-from bis_manager.models import BisSet, BisItem, Item, ResourceTracking
+from django.db import transaction
+
+from bis_manager.constants import UPGRADE_MATERIALS
+from bis_manager.models import BisSet, ResourceTracking
+from .season_model import SeasonModel
+from . import resource_needs_cache, data_version
+from .resource_cost_table import get_cost_table
+from bis_manager import tracing
 
 import logging
 logger = logging.getLogger(__name__)
@@ -9,134 +15,134 @@ class ResourceCalculationService:
     """비스 세트에 필요한 재화 계산을 위한 서비스 클래스"""
     
     @staticmethod
-    def calculate_resources_for_player(player, season):
+    def calculate_resources_for_player(player, season, model=None):
         """플레이어의 최종 비스에 필요한 모든 재화 계산"""
-        logger.info(f"calculate_resources_for_player 호출: player_id={player.id}, season_id={season.id}")
-        print(f"[DEBUG] calculate_resources_for_player 호출: player_id={player.id}, season_id={season.id}")
-        
         try:
-            # 최종 비스 세트 가져오기
-            try:
-                final_bis = BisSet.objects.get(player=player, season=season, bis_type='최종')
-                logger.info(f"최종 비스 세트 찾음: id={final_bis.id}")
-                print(f"[DEBUG] 최종 비스 세트 찾음: id={final_bis.id}")
-            except BisSet.DoesNotExist:
+            resources_by_player = ResourceCalculationService.calculate_resources_for_season(
+                season, model=model, player_ids=[player.id]
+            )
+            resources = resources_by_player.get(player.id)
+            if resources is None:
                 logger.warning(f"최종 비스 세트를 찾을 수 없음: player_id={player.id}, season_id={season.id}")
-                print(f"[DEBUG] 최종 비스 세트를 찾을 수 없음: player_id={player.id}, season_id={season.id}")
                 return None
             
-            # 출발 비스 세트 가져오기 (있을 경우)
-            try:
-                start_bis = BisSet.objects.get(player=player, season=season, bis_type='출발')
-                logger.info(f"출발 비스 세트 찾음: id={start_bis.id}")
-                print(f"[DEBUG] 출발 비스 세트 찾음: id={start_bis.id}")
-            except BisSet.DoesNotExist:
-                logger.info(f"출발 비스 세트 없음: player_id={player.id}, season_id={season.id}")
-                print(f"[DEBUG] 출발 비스 세트 없음: player_id={player.id}, season_id={season.id}")
-                start_bis = None
-            
-            # 필요한 재화 초기화
-            resources = {
-                '석판': 0,
-                '낱장_1층': 0,
-                '낱장_2층': 0,
-                '낱장_3층': 0,
-                '낱장_4층': 0,
-                '경화약': 0,
-                '강화섬유': 0,
-                '무기석판': 0,
-            }
-            
-            # 최종 비스에 있는 아이템 확인
-            final_bis_items = BisItem.objects.filter(bis_set=final_bis)
-            logger.info(f"최종 비스 아이템 수: {final_bis_items.count()}")
-            print(f"[DEBUG] 최종 비스 아이템 수: {final_bis_items.count()}")
-            
-            # 출발 비스에 있는 아이템 슬롯별로 추출 (있을 경우)
-            start_bis_slots = {}
-            if start_bis:
-                for item in BisItem.objects.filter(bis_set=start_bis):
-                    start_bis_slots[item.slot] = item.item
-                logger.info(f"출발 비스 아이템 수: {len(start_bis_slots)}")
-                print(f"[DEBUG] 출발 비스 아이템 수: {len(start_bis_slots)}")
-            
-            for bis_item in final_bis_items:
-                # 출발 비스에 같은 아이템이 있다면 건너뛰기
-                if start_bis and bis_item.slot in start_bis_slots:
-                    start_item = start_bis_slots[bis_item.slot]
-                    if start_item.id == bis_item.item.id:
-                        logger.info(f"출발 비스와 동일한 아이템 건너뛰기: slot={bis_item.slot}, item_id={bis_item.item.id}")
-                        print(f"[DEBUG] 출발 비스와 동일한 아이템 건너뛰기: slot={bis_item.slot}, item_id={bis_item.item.id}")
-                        continue
-                
-                item = bis_item.item
-                item_type = bis_item.slot
-                
-                logger.info(f"아이템 처리: slot={item_type}, item_id={item.id}, name={item.name}, source={item.source}")
-                print(f"[DEBUG] 아이템 처리: slot={item_type}, item_id={item.id}, name={item.name}, source={item.source}")
-                
-                # 아이템 출처에 따라 필요한 재화 계산
-                if item.source == '보강석판템':
-                    # 석판템 + 강화 아이템 비용 추가
-                    if item_type in TOMESTONE_COSTS:
-                        resources['석판'] += TOMESTONE_COSTS[item_type]
-                    
-                        # 강화 아이템 필요 (방어구: 강화섬유, 장신구: 경화약, 무기: 무기석판)
-                        if item_type in ['모자', '상의', '장갑', '하의', '신발']:
-                            resources['강화섬유'] += 1
-                        elif item_type in ['귀걸이', '목걸이', '팔찌', '반지1', '반지2']:
-                            resources['경화약'] += 1
-                        elif item_type == '무기':
-                            resources['무기석판'] += 1
-                
-                elif item.source == '석판템':
-                    # 석판 비용만 추가
-                    if item_type in TOMESTONE_COSTS:
-                        resources['석판'] += TOMESTONE_COSTS[item_type]
-                
-                elif item.source == '영웅레이드템':
-                    # 영웅 레이드템은 낱장으로 교환 가능
-                    if item_type in PAGE_COSTS:
-                        floor = PAGE_COSTS[item_type]['floor']
-                        count = PAGE_COSTS[item_type]['count']
-                        resources[f'낱장_{floor}층'] += count
-                        logger.info(f"낱장 추가: 낱장_{floor}층 +{count}")
-                        print(f"[DEBUG] 낱장 추가: 낱장_{floor}층 +{count}")
-            
-            # 강화 아이템을 직접 낱장으로 교환할 경우 필요한 낱장 계산
-            if resources['경화약'] > 0:
-                resources['낱장_2층'] += resources['경화약'] * UPGRADE_COSTS['경화약']['count']
-                logger.info(f"경화약으로 인한 낱장_2층 추가: {resources['경화약']} * {UPGRADE_COSTS['경화약']['count']} = {resources['경화약'] * UPGRADE_COSTS['경화약']['count']}")
-                print(f"[DEBUG] 경화약으로 인한 낱장_2층 추가: {resources['경화약']} * {UPGRADE_COSTS['경화약']['count']} = {resources['경화약'] * UPGRADE_COSTS['경화약']['count']}")
-            
-            if resources['강화섬유'] > 0:
-                resources['낱장_3층'] += resources['강화섬유'] * UPGRADE_COSTS['강화섬유']['count']
-                logger.info(f"강화섬유로 인한 낱장_3층 추가: {resources['강화섬유']} * {UPGRADE_COSTS['강화섬유']['count']} = {resources['강화섬유'] * UPGRADE_COSTS['강화섬유']['count']}")
-                print(f"[DEBUG] 강화섬유로 인한 낱장_3층 추가: {resources['강화섬유']} * {UPGRADE_COSTS['강화섬유']['count']} = {resources['강화섬유'] * UPGRADE_COSTS['강화섬유']['count']}")
-            
-            if resources['무기석판'] > 0:
-                resources['낱장_2층'] += resources['무기석판'] * UPGRADE_COSTS['무기석판']['count']
-                logger.info(f"무기석판으로 인한 낱장_2층 추가: {resources['무기석판']} * {UPGRADE_COSTS['무기석판']['count']} = {resources['무기석판'] * UPGRADE_COSTS['무기석판']['count']}")
-                print(f"[DEBUG] 무기석판으로 인한 낱장_2층 추가: {resources['무기석판']} * {UPGRADE_COSTS['무기석판']['count']} = {resources['무기석판'] * UPGRADE_COSTS['무기석판']['count']}")
-            
-            # ResourceTracking 모델 업데이트
-            for resource_type, amount in resources.items():
-                ResourceTracking.objects.update_or_create(
-                    player=player,
-                    season=season,
-                    resource_type=resource_type,
-                    defaults={'total_needed': amount}
-                )
-                logger.info(f"자원 업데이트: player_id={player.id}, season_id={season.id}, resource_type={resource_type}, amount={amount}")
-                print(f"[DEBUG] 자원 업데이트: player_id={player.id}, season_id={season.id}, resource_type={resource_type}, amount={amount}")
-            
-            logger.info(f"자원 계산 완료: {resources}")
-            print(f"[DEBUG] 자원 계산 완료: {resources}")
+            tracing.event('resources.player', player_id=player.id, season_id=season.id, resources=resources)
             return resources
         
         except Exception as e:
             logger.error(f"자원 계산 중 예외 발생: {str(e)}", exc_info=True)
-            print(f"[ERROR] 자원 계산 중 예외 발생: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            raise e
\ No newline at end of file
+            raise e
+    
+    @staticmethod
+    def calculate_resources_for_season(season, model=None, player_ids=None, save=True, generations=None):
+        """시즌 플레이어들의 최종 비스에 필요한 재화를 한 번에 계산하여 {player_id: 재화} 반환
+        
+        비스가 바뀌지 않은 플레이어는 캐시된 값을 쓰고, 나머지만 시즌 모델(SeasonModel, 고정된 쿼리 수)에서 계산한다.
+        save=True이면 ResourceTracking을 한 트랜잭션에서 일괄 저장한다.
+        player_ids가 주어지면 해당 플레이어만 계산한다. 최종 비스 세트가 없는 플레이어는 결과에 없다.
+        model을 넘길 때 모델을 불러오기 전에 조회한 세대 토큰(generations)을 함께 넘기면 계산 결과를 캐시에 저장한다.
+        """
+        # 대상 플레이어 (최종 비스 세트가 있는 플레이어)
+        if model is not None:
+            target_ids = [model.player_ids[index] for index in model.final_indices()]
+            if player_ids is not None:
+                wanted = set(player_ids)
+                target_ids = [player_id for player_id in target_ids if player_id in wanted]
+        elif player_ids is not None:
+            target_ids = list(player_ids)
+        else:
+            target_ids = list(
+                BisSet.objects.filter(season=season, bis_type='최종')
+                .order_by('player_id').values_list('player_id', flat=True)
+            )
+        
+        # 세대 토큰은 비스를 읽기 전에 조회해야 캐시에 저장할 수 있음
+        # (토큰 없이 받은 모델은 그 사이 바뀐 비스를 놓쳤을 수 있으므로 캐시 조회에만 사용)
+        store = model is None or generations is not None
+        if generations is None:
+            generations = resource_needs_cache.get_generations(season.id, target_ids)
+        generations = {player_id: generations[player_id] for player_id in target_ids if player_id in generations}
+        
+        # 비스가 바뀌지 않은 플레이어는 캐시된 값 사용
+        cached = resource_needs_cache.get_many(season, generations)
+        missing_ids = [player_id for player_id in target_ids if player_id not in cached]
+        
+        computed = {}
+        if missing_ids:
+            if model is None:
+                model = SeasonModel.load(season, player_ids=missing_ids)
+            missing_ids = [
+                player_id for player_id in missing_ids
+                if player_id in model.index and model.has_final[model.index[player_id]]
+            ]
+            
+            # 플레이어별 비스 차이를 (출처, 슬롯) 칸별 개수로 만들고 비용 표와 한 번에 곱함
+            table = get_cost_table(season)
+            rows = [model.resource_row(model.index[player_id], table) for player_id in missing_ids]
+            computed = {
+                player_id: table.to_dict(total)
+                for player_id, total in zip(missing_ids, table.multiply(rows))
+            }
+            if store:
+                resource_needs_cache.set_many(season, {
+                    player_id: resources for player_id, resources in computed.items() if player_id in generations
+                }, generations)
+        
+        resources_by_player = {
+            player_id: cached.get(player_id) or computed[player_id]
+            for player_id in target_ids
+            if player_id in cached or player_id in computed
+        }
+        
+        if save:
+            ResourceCalculationService.save_resources_bulk(season, resources_by_player)
+        
+        tracing.event(
+            'resources.season', season_id=season.id, players=len(resources_by_player), cached=len(cached)
+        )
+        return resources_by_player
+    
+    @staticmethod
+    def get_upgrade_material(item_type):
+        """보강석판템 강화에 필요한 강화 아이템 (방어구: 강화섬유, 장신구: 경화약, 무기: 무기석판)"""
+        return UPGRADE_MATERIALS.get(item_type)
+    
+    @staticmethod
+    def save_resources_bulk(season, resources_by_player):
+        """{player_id: 재화}를 ResourceTracking에 일괄 저장 (한 트랜잭션, 필요량만 갱신하고 현재 보유량은 유지)
+
+        저장된 필요량과 같은 행은 건너뛰고, 바뀐 행이 있을 때만 시즌 데이터 버전을 올린다.
+        """
+        if not resources_by_player:
+            return
+        
+        stored = {
+            (player_id, resource_type): total_needed
+            for player_id, resource_type, total_needed in ResourceTracking.objects.filter(
+                season=season, player_id__in=list(resources_by_player)
+            ).values_list('player_id', 'resource_type', 'total_needed')
+        }
+        rows = [
+            ResourceTracking(
+                player_id=player_id,
+                season=season,
+                resource_type=resource_type,
+                total_needed=amount
+            )
+            for player_id, resources in resources_by_player.items()
+            for resource_type, amount in resources.items()
+            if stored.get((player_id, resource_type)) != amount
+        ]
+        if not rows:
+            return
+        
+        with transaction.atomic():
+            ResourceTracking.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['player', 'season', 'resource_type'],
+                update_fields=['total_needed']
+            )
+            # 일괄 저장은 시그널을 보내지 않음
+            data_version.bump(season.id)
+        tracing.event('resources.save', season_id=season.id, players=len(resources_by_player), rows=len(rows))
@@ -0,0 +1,181 @@
+# ff14_bis_backend/bis_manager/services/resource_cost_table.py
+from collections import OrderedDict
+from functools import lru_cache
+from types import MappingProxyType
+import threading
+
+from bis_manager.constants import (
+    ITEM_TYPES, ITEM_SOURCES, RESOURCE_TYPES, TOMESTONE_COSTS, PAGE_COSTS, UPGRADE_COSTS, UPGRADE_MATERIALS
+)
+from bis_manager.models import SeasonCost
+
+import logging
+logger = logging.getLogger(__name__)
+
+# 재화 벡터의 축 순서
+RESOURCE_KEYS = [resource_type for resource_type, _ in RESOURCE_TYPES]
+
+# 프로세스에 보관할 시즌별 컴파일된 비용 표 수
+SEASON_TABLE_CACHE_SIZE = 32
+
+_season_tables = OrderedDict()
+_season_tables_lock = threading.Lock()
+
+class ResourceCostTable:
+    """(출처, 슬롯)별 필요 재화 벡터를 미리 계산해 둔 표
+
+    칸 번호는 출처 인덱스 * 슬롯 수 + 슬롯 인덱스이며, 각 칸은 RESOURCE_KEYS 순서의 재화 벡터이다.
+    강화 아이템의 낱장 교환 비용도 벡터에 미리 더해 두므로 재화 합계는 칸별 개수와 벡터의 곱의 합이다.
+    """
+
+    def __init__(self, sources, slots, vectors, tomestone_costs=TOMESTONE_COSTS, page_costs=PAGE_COSTS,
+                 upgrade_costs=UPGRADE_COSTS):
+        self.sources = sources
+        self.slots = slots
+        self.source_index = {source: index for index, source in enumerate(sources)}
+        self.slot_index = {slot: index for index, slot in enumerate(slots)}
+        self.vectors = vectors
+        # 0이 아닌 성분만 모아 둔 희소 벡터 (곱셈 시 사용)
+        self.sparse_vectors = tuple(
+            tuple((axis, amount) for axis, amount in enumerate(vector) if amount)
+            for vector in vectors
+        )
+        # 표를 만든 비용 (읽기 전용)
+        self.tomestone_costs = MappingProxyType(dict(tomestone_costs))
+        self.page_costs = MappingProxyType({slot: MappingProxyType(dict(cost)) for slot, cost in page_costs.items()})
+        self.upgrade_costs = MappingProxyType({material: MappingProxyType(dict(cost)) for material, cost in upgrade_costs.items()})
+
+    @classmethod
+    def compile(cls, tomestone_costs=TOMESTONE_COSTS, page_costs=PAGE_COSTS, upgrade_costs=UPGRADE_COSTS):
+        """비용 상수로부터 표 생성"""
+        sources = [source for source, _ in ITEM_SOURCES]
+        slots = [slot for slot, _ in ITEM_TYPES]
+        axis = {resource_type: index for index, resource_type in enumerate(RESOURCE_KEYS)}
+
+        vectors = []
+        for source in sources:
+            for slot in slots:
+                vector = [0] * len(RESOURCE_KEYS)
+
+                if source in ('석판템', '보강석판템') and slot in tomestone_costs:
+                    vector[axis['석판']] += tomestone_costs[slot]
+
+                    # 보강석판템은 강화 아이템과 그 강화 아이템의 낱장 교환 비용 추가
+                    material = UPGRADE_MATERIALS.get(slot)
+                    if source == '보강석판템' and material:
+                        vector[axis[material]] += 1
+                        cost = upgrade_costs[material]
+                        vector[axis[f"낱장_{cost['floor']}층"]] += cost['count']
+
+                elif source == '영웅레이드템' and slot in page_costs:
+                    cost = page_costs[slot]
+                    vector[axis[f"낱장_{cost['floor']}층"]] += cost['count']
+
+                vectors.append(tuple(vector))
+
+        return cls(sources, slots, tuple(vectors), tomestone_costs, page_costs, upgrade_costs)
+
+    @classmethod
+    def from_season(cls, season):
+        """시즌 비용 표 항목으로 기본 비용을 덮어써서 표 생성 (1개의 쿼리)"""
+        tomestone_costs = dict(TOMESTONE_COSTS)
+        page_costs = {slot: dict(cost) for slot, cost in PAGE_COSTS.items()}
+        upgrade_costs = {material: dict(cost) for material, cost in UPGRADE_COSTS.items()}
+
+        for cost_type, target, floor, amount in SeasonCost.objects.filter(season=season).values_list(
+            'cost_type', 'target', 'floor', 'amount'
+        ):
+            if cost_type == 'tomestone':
+                tomestone_costs[target] = amount
+            elif cost_type == 'page':
+                page_costs[target] = {'floor': floor, 'count': amount}
+            elif cost_type == 'upgrade':
+                upgrade_costs[target] = {'floor': floor, 'count': amount}
+
+        return cls.compile(tomestone_costs, page_costs, upgrade_costs)
+
+    def cell(self, source, slot):
+        """(출처, 슬롯) 칸 번호, 표에 없는 출처/슬롯이면 None"""
+        source_index = self.source_index.get(source)
+        slot_index = self.slot_index.get(slot)
+        if source_index is None or slot_index is None:
+            return None
+        return source_index * len(self.slots) + slot_index
+
+    def vector(self, source, slot):
+        """(출처, 슬롯)의 재화 벡터 dict"""
+        cell = self.cell(source, slot)
+        if cell is None:
+            return dict.fromkeys(RESOURCE_KEYS, 0)
+        return dict(zip(RESOURCE_KEYS, self.vectors[cell]))
+
+    def slot_cost(self, source, slot):
+        """슬롯 아이템의 분배 우선순위 비용 (석판템: 석판 가격, 영웅레이드템: 낱장 개수)"""
+        if source in ('석판템', '보강석판템'):
+            return self.tomestone_costs.get(slot, 0)
+        if source == '영웅레이드템' and slot in self.page_costs:
+            return self.page_costs[slot]['count']
+        return 0
+
+    def encode(self, final_items, start_items):
+        """비스 차이(최종 - 출발)를 칸별 개수 {칸 번호: 개수}로 변환 (출발 비스와 같은 아이템은 제외)"""
+        row = {}
+        for slot, item in final_items.items():
+            start_item = start_items.get(slot)
+            if start_item is not None and start_item.id == item.id:
+                continue
+
+            cell = self.cell(item.source, slot)
+            if cell is not None:
+                row[cell] = row.get(cell, 0) + 1
+        return row
+
+    def multiply(self, rows):
+        """칸별 개수 행 목록과 표의 곱 (행마다 RESOURCE_KEYS 순서의 재화 합계 목록)"""
+        totals = []
+        for row in rows:
+            total = [0] * len(RESOURCE_KEYS)
+            for cell, count in row.items():
+                for axis, amount in self.sparse_vectors[cell]:
+                    total[axis] += count * amount
+            totals.append(total)
+        return totals
+
+    @staticmethod
+    def to_dict(total):
+        return dict(zip(RESOURCE_KEYS, total))
+
+@lru_cache(maxsize=1)
+def get_default_cost_table():
+    """기본 비용 상수로 만든 표 (프로세스당 한 번만 생성)"""
+    return ResourceCostTable.compile()
+
+def get_cost_table(season=None):
+    """시즌 비용 표 (시즌 ID와 비용 표 버전별로 한 번만 컴파일, 시즌이 없으면 기본 표)
+
+    비용 표를 수정하면 시즌의 cost_version이 올라가므로 이전 버전의 표는 더 이상 사용되지 않는다.
+    """
+    if season is None:
+        return get_default_cost_table()
+
+    key = (season.id, season.cost_version)
+    with _season_tables_lock:
+        table = _season_tables.get(key)
+        if table is not None:
+            _season_tables.move_to_end(key)
+            return table
+
+    table = ResourceCostTable.from_season(season)
+    logger.info(f"시즌 비용 표 컴파일: season_id={season.id}, 버전={season.cost_version}")
+
+    with _season_tables_lock:
+        _season_tables[key] = table
+        while len(_season_tables) > SEASON_TABLE_CACHE_SIZE:
+            _season_tables.popitem(last=False)
+    return table
+
+def invalidate_cost_table(season_id):
+    """이 프로세스에 보관된 시즌 비용 표 제거 (다른 프로세스는 cost_version 증가로 새 표를 사용)"""
+    with _season_tables_lock:
+        for key in [key for key in _season_tables if key[0] == season_id]:
+            del _season_tables[key]
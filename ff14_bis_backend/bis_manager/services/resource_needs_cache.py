@@ -0,0 +1,68 @@
+# ff14_bis_backend/bis_manager/services/resource_needs_cache.py
+"""플레이어별 필요 재화 캐시
+
+세대 토큰은 DB(ResourceNeedsToken)에 두고 비스 변경과 같은 트랜잭션에서 교체한다.
+- 커밋 전에는 다른 요청이 새 토큰을 볼 수 없으므로, 새 토큰으로 이전 비스의 값이 저장되지 않는다.
+- 롤백되면 토큰 교체도 함께 취소된다.
+- 캐시 값은 DB의 토큰을 키에 포함하므로 프로세스별 캐시를 써도 다른 프로세스의 비스 변경이 반영된다.
+"""
+import uuid
+
+from django.core.cache import caches
+
+from bis_manager.models import ResourceNeedsToken
+
+CACHE_ALIAS = 'resources'
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+def _entry_key(season, player_id, generation):
+    return f"resource_needs:{season.id}:{season.cost_version}:{player_id}:{generation}"
+
+def get_generations(season_id, player_ids):
+    """(시즌, 플레이어)별 비스 변경 세대 토큰 {player_id: 토큰} (쿼리 1회, 토큰이 없는 플레이어가 있으면 3회)
+
+    필요 재화를 계산할 비스를 읽기 전에 조회해야 한다. 토큰이 없으면 무작위 토큰을 새로 만든다.
+    """
+    player_ids = list(player_ids)
+    if not player_ids:
+        return {}
+
+    tokens = ResourceNeedsToken.objects.filter(season_id=season_id)
+    generations = dict(tokens.filter(player_id__in=player_ids).values_list('player_id', 'token'))
+    missing = [player_id for player_id in player_ids if player_id not in generations]
+    if missing:
+        ResourceNeedsToken.objects.bulk_create([
+            ResourceNeedsToken(season_id=season_id, player_id=player_id, token=uuid.uuid4().hex)
+            for player_id in missing
+        ], ignore_conflicts=True)
+        generations.update(tokens.filter(player_id__in=missing).values_list('player_id', 'token'))
+    return generations
+
+def get_many(season, generations):
+    """캐시된 필요 재화 {player_id: 재화} (없는 플레이어는 제외)"""
+    keys = {player_id: _entry_key(season, player_id, generation) for player_id, generation in generations.items()}
+    found = _cache().get_many(list(keys.values()))
+    return {player_id: found[key] for player_id, key in keys.items() if key in found}
+
+def set_many(season, resources_by_player, generations):
+    """계산 전에 조회한 세대 토큰으로 저장 (계산 중 비스가 바뀌었으면 저장한 값은 다시 읽히지 않음)"""
+    _cache().set_many({
+        _entry_key(season, player_id, generations[player_id]): resources
+        for player_id, resources in resources_by_player.items()
+    }, None)
+
+def invalidate(season_id, *player_ids):
+    """비스 변경 시 해당 (시즌, 플레이어)들의 세대 토큰 교체 (호출하는 쪽 트랜잭션과 함께 커밋/롤백, 쿼리 1회)"""
+    if not player_ids:
+        return
+    ResourceNeedsToken.objects.bulk_create(
+        [
+            ResourceNeedsToken(season_id=season_id, player_id=player_id, token=uuid.uuid4().hex)
+            for player_id in player_ids
+        ],
+        update_conflicts=True,
+        unique_fields=['season', 'player_id'],
+        update_fields=['token']
+    )
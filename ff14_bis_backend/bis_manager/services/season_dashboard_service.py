@@ -0,0 +1,139 @@
+# ff14_bis_backend/bis_manager/services/season_dashboard_service.py
+from bis_manager.constants import ITEM_TYPES, JOB_CHOICES, JOB_TYPES, RESOURCE_TYPES
+from bis_manager.models import (
+    BisSet, BisItem, Materia, DistributionPriority, ResourceTracking, ItemAcquisition, StalePriority
+)
+
+import logging
+logger = logging.getLogger(__name__)
+
+# 최근 획득 내역 기본/최대 개수
+DEFAULT_RECENT_ACQUISITIONS = 20
+MAX_RECENT_ACQUISITIONS = 100
+
+class SeasonDashboardService:
+    """시즌 화면에 필요한 데이터를 고정된 쿼리 수로 한 번에 모으는 서비스 클래스"""
+
+    @staticmethod
+    def build(season, recent=DEFAULT_RECENT_ACQUISITIONS):
+        """시즌 대시보드 데이터 (플레이어별 출발/최종 비스, 분배 우선순위, 필요 재화, 최근 획득 내역)
+
+        쿼리: 비스 세트 1 + 비스 아이템 1 + 마테리쟈 1 + 우선순위 1 + 갱신 필요 여부 1 + 재화 1 + 최근 획득 1
+        """
+        recent = max(0, min(int(recent), MAX_RECENT_ACQUISITIONS))
+        job_names = dict(JOB_CHOICES)
+        job_type_names = dict(JOB_TYPES)
+
+        players = {}
+        sets = {}
+        for bis_set in BisSet.objects.filter(season=season).select_related('player').order_by('player_id', 'bis_type'):
+            player = bis_set.player
+            if player.id not in players:
+                players[player.id] = {
+                    'id': player.id,
+                    'nickname': player.nickname,
+                    'job': player.job,
+                    'job_display': job_names.get(player.job, player.job),
+                    'job_type': player.job_type,
+                    'job_type_display': job_type_names.get(player.job_type, player.job_type),
+                    'bis_sets': {},
+                    'priorities': {},
+                    'resources': {}
+                }
+            sets[bis_set.id] = {'id': bis_set.id, 'bis_type': bis_set.bis_type, 'items': []}
+            players[player.id]['bis_sets'][bis_set.bis_type] = sets[bis_set.id]
+
+        # 슬롯 정의 순서로 정렬
+        slot_order = {slot: index for index, (slot, _) in enumerate(ITEM_TYPES)}
+        bis_items = {}
+        for row in BisItem.objects.filter(bis_set__season=season).values(
+            'id', 'bis_set_id', 'slot', 'item_id', 'item__name', 'item__type', 'item__source', 'item__item_level'
+        ):
+            bis_item = {
+                'id': row['id'],
+                'slot': row['slot'],
+                'item': {
+                    'id': row['item_id'],
+                    'name': row['item__name'],
+                    'type': row['item__type'],
+                    'source': row['item__source'],
+                    'item_level': row['item__item_level']
+                },
+                'materias': []
+            }
+            bis_items[row['id']] = bis_item
+            sets[row['bis_set_id']]['items'].append(bis_item)
+        for bis_set in sets.values():
+            bis_set['items'].sort(key=lambda bis_item: slot_order.get(bis_item['slot'], len(slot_order)))
+
+        for row in Materia.objects.filter(bis_item__bis_set__season=season).values(
+            'id', 'bis_item_id', 'type', 'slot_number'
+        ).order_by('bis_item_id', 'slot_number'):
+            bis_items[row['bis_item_id']]['materias'].append({
+                'id': row['id'], 'type': row['type'], 'slot_number': row['slot_number']
+            })
+
+        priorities = {}
+        for row in DistributionPriority.objects.filter(season=season).values(
+            'player_id', 'item_type', 'priority'
+        ).order_by('item_type', 'priority'):
+            player = players.get(row['player_id'])
+            if player is None:
+                continue
+            player['priorities'][row['item_type']] = row['priority']
+            priorities.setdefault(row['item_type'], []).append({
+                'player_id': row['player_id'],
+                'nickname': player['nickname'],
+                'priority': row['priority']
+            })
+
+        resource_order = {resource_type: index for index, (resource_type, _) in enumerate(RESOURCE_TYPES)}
+        for row in sorted(
+            ResourceTracking.objects.filter(season=season).values(
+                'player_id', 'resource_type', 'current_amount', 'total_needed'
+            ),
+            key=lambda row: resource_order.get(row['resource_type'], len(resource_order))
+        ):
+            player = players.get(row['player_id'])
+            if player is not None:
+                player['resources'][row['resource_type']] = {
+                    'current_amount': row['current_amount'],
+                    'total_needed': row['total_needed']
+                }
+
+        acquisitions = []
+        if recent:
+            acquisitions = [
+                {
+                    'id': row['id'],
+                    'raid_progress': row['raid_progress_id'],
+                    'raid_date': row['raid_progress__raid_date'],
+                    'floor': row['raid_progress__floor'],
+                    'player': row['player_id'],
+                    'player_nickname': row['player__nickname'],
+                    'item': row['item_id'],
+                    'item_name': row['item__name'],
+                    'item_type': row['item__type']
+                }
+                for row in ItemAcquisition.objects.filter(raid_progress__season=season).values(
+                    'id', 'raid_progress_id', 'raid_progress__raid_date', 'raid_progress__floor',
+                    'player_id', 'player__nickname', 'item_id', 'item__name', 'item__type'
+                ).order_by('-raid_progress__raid_date', '-raid_progress__floor', '-id')[:recent]
+            ]
+
+        logger.info(f"시즌 대시보드 생성: season_id={season.id}, 플레이어 수={len(players)}")
+
+        return {
+            'season': {
+                'id': season.id,
+                'name': season.name,
+                'start_date': season.start_date,
+                'end_date': season.end_date,
+                'is_active': season.is_active,
+                'distribution_method': season.distribution_method
+            },
+            'players': list(players.values()),
+            'priorities': priorities,
+            'priorities_stale': StalePriority.objects.filter(season=season).exists(),
+            'recent_acquisitions': acquisitions
+        }
@@ -0,0 +1,220 @@
+# ff14_bis_backend/bis_manager/services/season_model.py
+"""분배 계산용 압축 시즌 모델
+
+모델 인스턴스 대신 정수 인덱스, 슬롯 비트마스크, array 열로 시즌 비스와 우선순위를 나타낸다.
+- 플레이어: 플레이어 ID 순 정수 인덱스 (player_ids[인덱스] = 플레이어 ID)
+- 슬롯: ITEM_TYPES 순서의 비트 (11비트 마스크)
+- 출처: ITEM_SOURCES 순서의 인덱스 (없거나 모르는 출처는 -1)
+"""
+from array import array
+
+from bis_manager.constants import ITEM_TYPES, ITEM_SOURCES
+from bis_manager.models import BisSet, BisItem
+
+import logging
+logger = logging.getLogger(__name__)
+
+SLOTS = [item_type for item_type, _ in ITEM_TYPES]
+SOURCES = [source for source, _ in ITEM_SOURCES]
+SLOT_INDEX = {slot: index for index, slot in enumerate(SLOTS)}
+SOURCE_INDEX = {source: index for index, source in enumerate(SOURCES)}
+
+# 플레이어별 계산 중 진행 상황 보고 횟수 (보고마다 작업 행을 갱신하므로 플레이어마다 보고하지 않음)
+PROGRESS_STEPS = 20
+
+def iter_bits(mask):
+    """마스크에 켜진 비트 번호 (작은 번호부터)"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+class SeasonModel:
+    """시즌의 출발/최종 비스를 플레이어 인덱스와 슬롯 비트마스크로 나타낸 모델
+
+    - player_ids: array('q') 인덱스별 플레이어 ID (ID 순)
+    - player_names: 인덱스별 닉네임
+    - has_final: bytearray 최종 비스 세트 유무
+    - final_mask: array('H') 최종 비스에 아이템이 있는 슬롯
+    - needed_mask: array('H') 최종 비스 아이템이 출발 비스와 달라 획득해야 하는 슬롯
+    - final_sources: array('b') [인덱스 * 슬롯 수 + 슬롯] 최종 비스 아이템 출처
+    """
+
+    def __init__(self, season, player_ids, player_names, has_final, final_mask, needed_mask, final_sources):
+        self.season = season
+        self.player_ids = player_ids
+        self.player_names = player_names
+        self.has_final = has_final
+        self.final_mask = final_mask
+        self.needed_mask = needed_mask
+        self.final_sources = final_sources
+        self.index = {player_id: index for index, player_id in enumerate(player_ids)}
+
+    @classmethod
+    def load(cls, season, player_ids=None):
+        """시즌 모델 로드 (비스 세트 1회 + 비스 아이템 1회, 총 2개의 쿼리, 모델 인스턴스 생성 없음)"""
+        bis_sets = BisSet.objects.filter(
+            season=season,
+            bis_type__in=['최종', '출발']
+        ).order_by('player_id')
+        if player_ids is not None:
+            bis_sets = bis_sets.filter(player_id__in=player_ids)
+
+        ids = array('q')
+        names = []
+        index = {}
+        # 비스 세트 ID -> (플레이어 인덱스, 최종 여부)
+        set_targets = {}
+        for bis_set_id, player_id, nickname, bis_type in bis_sets.values_list(
+            'id', 'player_id', 'player__nickname', 'bis_type'
+        ):
+            if player_id not in index:
+                index[player_id] = len(ids)
+                ids.append(player_id)
+                names.append(nickname)
+            set_targets[bis_set_id] = (index[player_id], bis_type == '최종')
+
+        count = len(ids)
+        slot_count = len(SLOTS)
+        has_final = bytearray(count)
+        final_mask = array('H', [0]) * count
+        final_sources = array('b', [-1]) * (count * slot_count)
+        final_item_ids = array('q', [0]) * (count * slot_count)
+        start_item_ids = array('q', [0]) * (count * slot_count)
+        for player_index, is_final in set_targets.values():
+            if is_final:
+                has_final[player_index] = 1
+
+        if set_targets:
+            for bis_set_id, slot, item_id, source in BisItem.objects.filter(
+                bis_set_id__in=list(set_targets)
+            ).values_list('bis_set_id', 'slot', 'item_id', 'item__source'):
+                slot_index = SLOT_INDEX.get(slot)
+                if slot_index is None:
+                    continue
+                player_index, is_final = set_targets[bis_set_id]
+                cell = player_index * slot_count + slot_index
+                if is_final:
+                    final_mask[player_index] |= 1 << slot_index
+                    final_sources[cell] = SOURCE_INDEX.get(source, -1)
+                    final_item_ids[cell] = item_id
+                else:
+                    start_item_ids[cell] = item_id
+
+        needed_mask = array('H', (
+            sum(
+                1 << slot_index for slot_index in iter_bits(final_mask[player_index])
+                if final_item_ids[player_index * slot_count + slot_index]
+                != start_item_ids[player_index * slot_count + slot_index]
+            )
+            for player_index in range(count)
+        ))
+
+        logger.info(
+            f"시즌 모델 로드 완료: season_id={season.id}, 플레이어 수={count}, 최종 비스 세트 수={sum(has_final)}"
+        )
+        return cls(season, ids, names, has_final, final_mask, needed_mask, final_sources)
+
+    def __len__(self):
+        return len(self.player_ids)
+
+    def final_indices(self):
+        """최종 비스 세트가 있는 플레이어 인덱스 목록 (ID 순)"""
+        return [player_index for player_index, has_final in enumerate(self.has_final) if has_final]
+
+    def source(self, player_index, slot_index):
+        """최종 비스 슬롯 아이템의 출처 이름 (없거나 모르는 출처면 None)"""
+        source_index = self.final_sources[player_index * len(SLOTS) + slot_index]
+        return SOURCES[source_index] if source_index >= 0 else None
+
+    def slot_costs(self, table, progress=None):
+        """슬롯별 분배 우선순위 비용 열 [슬롯 인덱스] -> array('l') (플레이어 인덱스별, 최종 비스에 없는 슬롯은 0)
+
+        progress가 주어지면 플레이어 묶음(전체의 1/PROGRESS_STEPS)을 처리할 때마다 progress(처리한 플레이어 수)를 호출한다.
+        """
+        lookup = [[table.slot_cost(source, slot) for slot in SLOTS] for source in SOURCES]
+        slot_count = len(SLOTS)
+        columns = [array('l', [0]) * len(self) for _ in SLOTS]
+        step = max(1, len(self) // PROGRESS_STEPS)
+        for player_index, mask in enumerate(self.final_mask):
+            if progress is not None and player_index and player_index % step == 0:
+                progress(player_index)
+            base = player_index * slot_count
+            for slot_index in iter_bits(mask):
+                source_index = self.final_sources[base + slot_index]
+                if source_index >= 0:
+                    columns[slot_index][player_index] = lookup[source_index][slot_index]
+        return columns
+
+    def resource_row(self, player_index, table):
+        """획득해야 하는 슬롯을 비용 표 칸별 개수 {칸 번호: 개수}로 변환 (ResourceCostTable.encode와 같은 결과)"""
+        row = {}
+        for slot_index in iter_bits(self.needed_mask[player_index]):
+            source = self.source(player_index, slot_index)
+            cell = table.cell(source, SLOTS[slot_index]) if source else None
+            if cell is not None:
+                row[cell] = row.get(cell, 0) + 1
+        return row
+
+class PriorityTable:
+    """아이템 타입별 분배 우선순위를 플레이어 인덱스 열로 나타낸 표 (주간 분배 계획용)
+
+    - player_ids: array('q') 인덱스별 플레이어 ID
+    - player_names: 인덱스별 닉네임
+    - item_types: 아이템 타입 목록 (획득 기록 비트마스크의 비트 순서)
+    - orders[타입 인덱스]: array('l') 우선순위 목록 순 플레이어 인덱스
+    - ranks[타입 인덱스]: array('l') 같은 위치의 원래 우선순위
+    """
+
+    def __init__(self, player_ids, player_names, item_types, orders, ranks):
+        self.player_ids = player_ids
+        self.player_names = player_names
+        self.item_types = item_types
+        self.type_index = {item_type: type_index for type_index, item_type in enumerate(item_types)}
+        self.orders = orders
+        self.ranks = ranks
+
+    @classmethod
+    def from_rows(cls, priority_rows):
+        """(아이템 타입, 플레이어 ID, 닉네임, 우선순위) 튜플 목록(타입/우선순위 순)으로 생성, 플레이어는 ID 순"""
+        names = {player_id: player_name for _, player_id, player_name, _ in priority_rows}
+        player_ids = sorted(names)
+        index = {player_id: player_index for player_index, player_id in enumerate(player_ids)}
+
+        item_types = []
+        orders = []
+        ranks = []
+        for item_type, player_id, _, priority in priority_rows:
+            if not item_types or item_types[-1] != item_type:
+                item_types.append(item_type)
+                orders.append(array('l'))
+                ranks.append(array('l'))
+            orders[-1].append(index[player_id])
+            ranks[-1].append(priority)
+
+        return cls(array('q', player_ids), [names[player_id] for player_id in player_ids], item_types, orders, ranks)
+
+    @classmethod
+    def from_priorities(cls, priorities_by_type, player_ids):
+        """{아이템 타입: [{'player_id', 'player_name', 'priority'}, ...]}와 참여 플레이어 ID 목록으로 생성"""
+        index = {player_id: player_index for player_index, player_id in enumerate(player_ids)}
+        player_names = [None] * len(player_ids)
+        orders = []
+        ranks = []
+        for entries in priorities_by_type.values():
+            orders.append(array('l', (index[entry['player_id']] for entry in entries)))
+            ranks.append(array('l', (entry['priority'] for entry in entries)))
+            for entry in entries:
+                player_names[index[entry['player_id']]] = entry['player_name']
+
+        return cls(array('q', player_ids), player_names, list(priorities_by_type.keys()), orders, ranks)
+
+    def __len__(self):
+        return len(self.player_ids)
+
+    def item_types_in(self, mask):
+        """획득 기록 마스크의 아이템 타입 목록 (item_types 순서)"""
+        return [self.item_types[type_index] for type_index in iter_bits(mask)]
+
+    def item_types_not_in(self, mask):
+        return self.item_types_in(~mask & ((1 << len(self.item_types)) - 1))
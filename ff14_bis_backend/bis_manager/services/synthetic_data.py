@@ -0,0 +1,72 @@
+# ff14_bis_backend/bis_manager/services/synthetic_data.py
+"""벤치마크용 합성 시즌 데이터 생성기
+
+시즌, 슬롯/출처별 아이템, 플레이어와 출발/최종 비스 세트를 bulk_create로 만든다.
+같은 seed와 플레이어 수로 만들면 직업/비스 구성이 항상 같다. (ID와 닉네임의 시즌 번호만 다름)
+bulk_create는 시그널을 보내지 않으므로 우선순위 갱신 표시나 데이터 버전 증가 없이 생성된다.
+"""
+import random
+
+from django.db import transaction
+
+from bis_manager.constants import ITEM_TYPES
+from bis_manager.models import Season, Item, Player, BisSet, BisItem
+
+SLOTS = [item_type for item_type, _ in ITEM_TYPES]
+
+# (출처, 아이템 레벨)
+ITEM_SOURCES = [('제작템', 710), ('석판템', 730), ('보강석판템', 740), ('영웅레이드템', 740)]
+
+# 공격대 8명 구성 순서 (탱커 2, 힐러 2, 딜러 4)
+RAID_COMPOSITION = [
+    ('전사', '탱커'), ('나이트', '탱커'), ('백마도사', '힐러'), ('학자', '힐러'),
+    ('몽크', '딜러'), ('닌자', '딜러'), ('음유시인', '딜러'), ('흑마도사', '딜러'),
+]
+
+BATCH_SIZE = 2000
+
+@transaction.atomic
+def generate_season(players, seed=0, name=None):
+    """플레이어 players명과 출발/최종 비스 세트를 가진 합성 시즌 생성 후 시즌 반환
+
+    - 출발 비스: 슬롯마다 제작템(75%) 또는 석판템
+    - 최종 비스: 무기는 영웅레이드템, 나머지 슬롯은 영웅레이드템/보강석판템 반반
+    """
+    rng = random.Random(seed)
+    season = Season.objects.create(
+        name=name or f'합성 시즌 ({players}명, seed={seed})', start_date='2025-01-21', is_active=False
+    )
+
+    items = Item.objects.bulk_create([
+        Item(season=season, name=f'{slot} {source}', type=slot, source=source, item_level=level)
+        for slot in SLOTS for source, level in ITEM_SOURCES
+    ])
+    items_by_key = {(item.type, item.source): item for item in items}
+
+    player_objs = Player.objects.bulk_create([
+        Player(
+            nickname=f'합성{season.id}_{index}',
+            job=RAID_COMPOSITION[index % len(RAID_COMPOSITION)][0],
+            job_type=RAID_COMPOSITION[index % len(RAID_COMPOSITION)][1],
+        )
+        for index in range(players)
+    ], batch_size=BATCH_SIZE)
+
+    bis_sets = BisSet.objects.bulk_create([
+        BisSet(player=player, season=season, bis_type=bis_type)
+        for player in player_objs for bis_type in ('출발', '최종')
+    ], batch_size=BATCH_SIZE)
+
+    bis_items = []
+    for bis_set in bis_sets:
+        for slot in SLOTS:
+            if bis_set.bis_type == '출발':
+                source = '제작템' if rng.random() < 0.75 else '석판템'
+            elif slot == '무기':
+                source = '영웅레이드템'
+            else:
+                source = rng.choice(('영웅레이드템', '보강석판템'))
+            bis_items.append(BisItem(bis_set=bis_set, item=items_by_key[(slot, source)], slot=slot))
+    BisItem.objects.bulk_create(bis_items, batch_size=BATCH_SIZE)
+
+    return season
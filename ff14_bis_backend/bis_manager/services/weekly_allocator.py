@@ -0,0 +1,111 @@
+# ff14_bis_backend/bis_manager/services/weekly_allocator.py
+from array import array
+import heapq
+
+class WeeklyAllocator:
+    """주간 분배 계획용 아이템 타입별 우선순위 큐 (PriorityTable의 플레이어/타입 인덱스 사용)
+
+    각 아이템은 (총 획득 개수, 이번 주 획득 개수, 원래 우선순위)가 가장 작은 플레이어에게 분배된다.
+    - 해당 타입을 아직 획득하지 않은 플레이어가 있으면 그 중에서 선택
+    - 모두 획득했다면 목표 개수(target_items_per_player) 미만인 플레이어 중에서 선택
+
+    획득 개수가 바뀔 때마다 해당 플레이어의 새 항목을 큐에 넣고, 오래된 항목은 꺼낼 때 버린다.
+    (분배 1회당 O(아이템 타입 수 * log n), 목록 복사/전체 정렬 없음)
+    획득 기록은 플레이어별 아이템 타입 비트마스크(acquired), 개수는 플레이어 인덱스별 array로 둔다.
+    """
+
+    def __init__(self, table, target_items_per_player):
+        self.table = table
+        self.target_items_per_player = target_items_per_player
+
+        player_count = len(table)
+        self.acquired = array('L', [0]) * player_count
+        self.counts = array('l', [0]) * player_count
+        self.weekly = array('l', [0]) * player_count
+
+        # 플레이어별로 우선순위 목록에 등장하는 (타입 인덱스, 목록 내 위치)
+        self._player_entries = [[] for _ in range(player_count)]
+        for type_index, order in enumerate(table.orders):
+            for position, player_index in enumerate(order):
+                self._player_entries[player_index].append((type_index, position))
+        # 아이템 타입별 아직 획득하지 않은 플레이어 수
+        self._remaining = array('l', (len(order) for order in table.orders))
+
+        self._heaps = [[] for _ in table.item_types]
+        self._extra_mode = bytearray(len(table.item_types))
+
+    def start_week(self):
+        """새 주차 시작 - 주간 획득 개수 초기화 후 큐 재구성"""
+        for player_index in range(len(self.weekly)):
+            self.weekly[player_index] = 0
+
+        for type_index in range(len(self.table.item_types)):
+            self._rebuild(type_index)
+
+    def allocate(self, type_index):
+        """아이템 1개 분배 - (우선순위 목록 내 위치, 중복 획득 여부) 반환, 받을 플레이어가 없으면 None"""
+        order = self.table.orders[type_index]
+        if not order:
+            return None
+
+        # 모든 플레이어가 이미 해당 타입을 획득했다면 목표 개수 미만인 플레이어 대상으로 큐 재구성
+        if self._remaining[type_index] == 0 and not self._extra_mode[type_index]:
+            self._extra_mode[type_index] = 1
+            self._rebuild(type_index)
+
+        heap = self._heaps[type_index]
+        while heap:
+            total_count, weekly_count, _, position = heap[0]
+            player_index = order[position]
+
+            # 획득 개수가 바뀌었거나 더 이상 대상이 아닌 오래된 항목은 버림
+            if (
+                total_count != self.counts[player_index]
+                or weekly_count != self.weekly[player_index]
+                or not self._is_candidate(type_index, player_index)
+            ):
+                heapq.heappop(heap)
+                continue
+
+            duplicate = bool(self._extra_mode[type_index])
+            self._award(type_index, player_index)
+            return position, duplicate
+
+        return None
+
+    def _rebuild(self, type_index):
+        order = self.table.orders[type_index]
+        heap = [
+            self._heap_key(type_index, position)
+            for position in range(len(order))
+            if self._is_candidate(type_index, order[position])
+        ]
+        heapq.heapify(heap)
+        self._heaps[type_index] = heap
+
+    def _award(self, type_index, player_index):
+        """플레이어 아이템 획득 기록 업데이트 후 변경된 획득 개수로 큐 항목 추가"""
+        bit = 1 << type_index
+        if not self.acquired[player_index] & bit:
+            self.acquired[player_index] |= bit
+            self._remaining[type_index] -= 1
+        self.counts[player_index] += 1
+        self.weekly[player_index] += 1
+
+        for other_type, position in self._player_entries[player_index]:
+            if self._is_candidate(other_type, player_index):
+                heapq.heappush(self._heaps[other_type], self._heap_key(other_type, position))
+
+    def _is_candidate(self, type_index, player_index):
+        if self._extra_mode[type_index]:
+            return self.counts[player_index] < self.target_items_per_player
+        return not self.acquired[player_index] >> type_index & 1
+
+    def _heap_key(self, type_index, position):
+        player_index = self.table.orders[type_index][position]
+        return (
+            self.counts[player_index],  # 1차: 총 획득 개수가 적은 순
+            self.weekly[player_index],  # 2차: 이번 주 획득 개수가 적은 순
+            self.table.ranks[type_index][position],  # 3차: 원래 우선순위가 높은 순
+            position  # 동일한 경우 목록 순서
+        )
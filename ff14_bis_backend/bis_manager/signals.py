@@ -1,6 +1,18 @@
-from django.db.models.signals import post_save
+import threading
+from contextlib import contextmanager
+
+from django.db.models import F, QuerySet
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from bis_manager.models import CustomUser, Player
+from bis_manager.constants import ITEM_TYPES
+from bis_manager.models import (
+    CustomUser, Player, Season, Item, BisSet, BisItem, Materia, StalePriority, SeasonCost,
+    DistributionPriority, ResourceTracking, RaidProgress, ItemAcquisition
+)
+from bis_manager.services.resource_cost_table import invalidate_cost_table
+from bis_manager.services import resource_needs_cache, data_version
+
+ALL_SLOTS = [item_type for item_type, _ in ITEM_TYPES]
 
 @receiver(post_save, sender=CustomUser)
 def link_user_to_player(sender, instance, created, **kwargs):
@@ -17,4 +29,164 @@ def link_user_to_player(sender, instance, created, **kwargs):
                 player.save(update_fields=['user'])
         except Player.DoesNotExist:
             # 일치하는 플레이어가 없는 경우 아무것도 하지 않음
-            pass
\ No newline at end of file
+            pass
+
+_caller_handled = threading.local()
+
+@contextmanager
+def changes_handled_by_caller():
+    """
+    블록 안의 비스 아이템/마테리쟈 변경은 호출한 쪽이 갱신 필요 표시/데이터 버전 증가를 한 번에 처리
+    (일괄 수정 서비스에서 행마다 시그널 쿼리가 발생하지 않도록 사용)
+    """
+    _caller_handled.depth = getattr(_caller_handled, 'depth', 0) + 1
+    try:
+        yield
+    finally:
+        _caller_handled.depth -= 1
+
+def _handled_by_caller():
+    return getattr(_caller_handled, 'depth', 0) > 0
+
+def _deleted_by(origin, *models):
+    """삭제가 주어진 모델(인스턴스 또는 쿼리셋)에서 연쇄된 것인지 확인"""
+    if isinstance(origin, QuerySet):
+        return origin.model in models
+    return isinstance(origin, models)
+
+@receiver(post_save, sender=BisSet)
+@receiver(post_delete, sender=BisSet)
+def mark_bis_set_priorities_stale(sender, instance, **kwargs):
+    """
+    비스 세트 생성/변경/삭제 시 해당 플레이어의 모든 슬롯 우선순위를 갱신 필요로 표시하고 필요 재화 캐시 무효화
+    """
+    # 시즌 삭제로 인한 연쇄 삭제는 표시할 대상이 없음
+    if _deleted_by(kwargs.get('origin'), Season):
+        return
+    StalePriority.mark(instance.season_id, instance.player_id, ALL_SLOTS)
+    resource_needs_cache.invalidate(instance.season_id, instance.player_id)
+    data_version.bump(instance.season_id)
+
+@receiver(post_save, sender=BisItem)
+@receiver(post_delete, sender=BisItem)
+def mark_bis_item_priority_stale(sender, instance, **kwargs):
+    """
+    비스 아이템 생성/변경/삭제 시 해당 슬롯 우선순위를 갱신 필요로 표시하고 필요 재화 캐시 무효화
+    """
+    # 비스 세트/플레이어/시즌 삭제로 인한 연쇄 삭제는 비스 세트 단위에서 처리
+    if _handled_by_caller() or _deleted_by(kwargs.get('origin'), BisSet, Player, Season):
+        return
+    
+    bis_set = BisSet.objects.filter(pk=instance.bis_set_id).values('season_id', 'player_id').first()
+    if bis_set is None:
+        return
+    
+    # update_fields 없이 기존 아이템을 저장하면 슬롯이 바뀌었을 수 있으므로 전체 슬롯 표시
+    update_fields = kwargs.get('update_fields')
+    if 'created' in kwargs and not kwargs['created'] and not update_fields:
+        slots = ALL_SLOTS
+    else:
+        slots = [instance.slot]
+    StalePriority.mark(bis_set['season_id'], bis_set['player_id'], slots)
+    resource_needs_cache.invalidate(bis_set['season_id'], bis_set['player_id'])
+    data_version.bump(bis_set['season_id'])
+
+@receiver(post_save, sender=Item)
+def mark_item_priorities_stale(sender, instance, created, **kwargs):
+    """
+    아이템 출처 등이 변경되면 해당 아이템을 사용하는 모든 비스 슬롯을 갱신 필요로 표시하고 필요 재화 캐시 무효화
+    """
+    if created:
+        return
+    
+    bis_slots = list(BisItem.objects.filter(item=instance).values_list(
+        'bis_set__season_id', 'bis_set__player_id', 'slot'
+    ))
+    StalePriority.objects.bulk_create(
+        [StalePriority(season_id=season_id, player_id=player_id, slot=slot) for season_id, player_id, slot in bis_slots],
+        ignore_conflicts=True
+    )
+    changed_players = {}
+    for season_id, player_id, _ in bis_slots:
+        changed_players.setdefault(season_id, set()).add(player_id)
+    for season_id, player_ids in changed_players.items():
+        resource_needs_cache.invalidate(season_id, *player_ids)
+    # 비스 세트 응답에 아이템 정보가 포함되므로 아이템 시즌의 데이터 버전도 증가
+    data_version.bump(instance.season_id, *{season_id for season_id, _, _ in bis_slots})
+
+@receiver(post_save, sender=SeasonCost)
+@receiver(post_delete, sender=SeasonCost)
+def bump_season_cost_version(sender, instance, **kwargs):
+    """
+    시즌 비용 표 변경 시 비용 표 버전을 올리고 시즌 전체 우선순위를 갱신 필요로 표시
+    """
+    # 시즌 삭제로 인한 연쇄 삭제는 갱신할 대상이 없음
+    if _deleted_by(kwargs.get('origin'), Season):
+        return
+    
+    Season.objects.filter(pk=instance.season_id).update(cost_version=F('cost_version') + 1)
+    invalidate_cost_table(instance.season_id)
+    data_version.bump(instance.season_id)
+    
+    player_ids = BisSet.objects.filter(season_id=instance.season_id, bis_type='최종').values_list('player_id', flat=True)
+    StalePriority.objects.bulk_create(
+        [StalePriority(season_id=instance.season_id, player_id=player_id, slot=slot) for player_id in player_ids for slot in ALL_SLOTS],
+        ignore_conflicts=True
+    )
+
+
+@receiver(post_save, sender=Materia)
+@receiver(post_delete, sender=Materia)
+def bump_materia_data_version(sender, instance, **kwargs):
+    """
+    마테리쟈 변경 시 시즌 데이터 버전 증가
+    """
+    # 상위 객체 삭제로 인한 연쇄 삭제는 상위 객체에서 처리
+    if _handled_by_caller() or _deleted_by(kwargs.get('origin'), BisItem, BisSet, Item, Player, Season):
+        return
+    
+    season_id = BisItem.objects.filter(pk=instance.bis_item_id).values_list('bis_set__season_id', flat=True).first()
+    data_version.bump(season_id)
+
+@receiver(post_save, sender=DistributionPriority)
+@receiver(post_delete, sender=DistributionPriority)
+@receiver(post_save, sender=ResourceTracking)
+@receiver(post_delete, sender=ResourceTracking)
+@receiver(post_save, sender=RaidProgress)
+@receiver(post_delete, sender=RaidProgress)
+def bump_season_data_version(sender, instance, **kwargs):
+    """
+    시즌 소속 데이터(우선순위/재화/레이드 진행) 변경 시 시즌 데이터 버전 증가
+    """
+    if _handled_by_caller() or _deleted_by(kwargs.get('origin'), Season):
+        return
+    data_version.bump(instance.season_id)
+
+@receiver(post_save, sender=ItemAcquisition)
+@receiver(post_delete, sender=ItemAcquisition)
+def bump_acquisition_data_version(sender, instance, **kwargs):
+    """
+    아이템 획득 기록 변경 시 레이드 진행 시즌의 데이터 버전 증가
+    """
+    if _deleted_by(kwargs.get('origin'), RaidProgress, Season):
+        return
+    
+    season_id = RaidProgress.objects.filter(pk=instance.raid_progress_id).values_list('season_id', flat=True).first()
+    data_version.bump(season_id)
+
+@receiver(post_save, sender=Player)
+def bump_player_data_version(sender, instance, created, **kwargs):
+    """
+    플레이어 정보(닉네임/직업) 변경 시 플레이어가 참여한 시즌의 데이터 버전 증가
+    """
+    if created:
+        return
+    data_version.bump(*BisSet.objects.filter(player=instance).values_list('season_id', flat=True).distinct())
+
+@receiver(post_save, sender=Season)
+def bump_season_info_data_version(sender, instance, created, **kwargs):
+    """
+    시즌 정보 변경 시 시즌 데이터 버전 증가
+    """
+    if not created:
+        data_version.bump(instance.id)
@@ -1,3 +1,1818 @@
-from django.test import TestCase
+import json
+import os
+import random
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from unittest.mock import patch
 
-# Create your tests here.
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from bis_manager.constants import ITEM_TYPES, RAID_FLOOR_DROPS, TOMESTONE_COSTS, PAGE_COSTS, UPGRADE_COSTS
+from bis_manager.models import (
+    Season, Item, Player, BisSet, BisItem, Materia, DistributionPriority, ResourceTracking, StalePriority,
+    ResourceNeedsToken, CustomUser, RaidProgress, ItemAcquisition, DistributionPlan, DistributionPlanAssignment,
+    BackgroundJob, SeasonCost, Schedule
+)
+from bis_manager.middleware import QueryBudgetExceeded, get_view_budget
+from bis_manager.services.distribution_service import DistributionService
+from bis_manager.services.resource_calculation_service import ResourceCalculationService
+from bis_manager.services.season_model import SeasonModel, PriorityTable
+from bis_manager.services.resource_cost_table import ResourceCostTable, RESOURCE_KEYS, get_cost_table
+from bis_manager.services.assignment_solver import solve_assignment
+from bis_manager.services.distribution_plan_service import DistributionPlanService
+from bis_manager.services import loot_simulation_service
+from bis_manager.services.loot_simulation_service import LootSimulationService
+from bis_manager.services.job_service import JobService, JobSubmitError
+from bis_manager.services.bis_import_service import BisImportService
+from bis_manager.services import request_metrics
+from bis_manager.services.synthetic_data import generate_season
+from bis_manager import tracing
+from bis_manager.serializers import BisSetSerializer
+from bis_manager.views import SeasonViewSet
+
+SLOTS = [item_type for item_type, _ in ITEM_TYPES]
+JOBS = ['전사', '나이트', '백마도사', '학자', '몽크', '용기사', '음유시인', '흑마도사']
+
+
+class SeasonFixtureMixin:
+    """시즌, 슬롯별 아이템, 출발/최종 비스 세트를 가진 플레이어를 만드는 테스트 도우미"""
+
+    def create_season(self, name='테스트 시즌'):
+        season = Season.objects.create(name=name, start_date='2025-01-21')
+        items = {}
+        for slot in SLOTS:
+            for source, level in [('제작템', 710), ('석판템', 730), ('보강석판템', 740), ('영웅레이드템', 740)]:
+                items[(slot, source)] = Item.objects.create(
+                    season=season, name=f'{slot} {source}', type=slot, source=source, item_level=level
+                )
+        return season, items
+
+    def create_player(self, season, items, index, final_sources=None, start_source='제작템'):
+        """final_sources: {slot: source} (기본값은 짝수 슬롯 영웅레이드템, 홀수 슬롯 보강석판템)"""
+        player = Player.objects.create(nickname=f'플레이어{season.id}_{index}', job=JOBS[index % len(JOBS)])
+        start_bis = BisSet.objects.create(player=player, season=season, bis_type='출발')
+        final_bis = BisSet.objects.create(player=player, season=season, bis_type='최종')
+
+        if final_sources is None:
+            final_sources = {
+                slot: '영웅레이드템' if (i + index) % 2 == 0 else '보강석판템'
+                for i, slot in enumerate(SLOTS)
+            }
+
+        for slot in SLOTS:
+            BisItem.objects.create(bis_set=start_bis, item=items[(slot, start_source)], slot=slot)
+            if slot in final_sources:
+                BisItem.objects.create(bis_set=final_bis, item=items[(slot, final_sources[slot])], slot=slot)
+        return player
+
+
+class SeasonModelTests(SeasonFixtureMixin, TestCase):
+    def test_load_uses_fixed_number_of_queries(self):
+        season, items = self.create_season()
+        for index in range(3):
+            self.create_player(season, items, index)
+
+        with self.assertNumQueries(2):
+            small = SeasonModel.load(season)
+
+        for index in range(3, 12):
+            self.create_player(season, items, index)
+
+        with self.assertNumQueries(2):
+            large = SeasonModel.load(season)
+
+        self.assertEqual(len(small), 3)
+        self.assertEqual(len(large), 12)
+        self.assertEqual(len(large.final_indices()), 12)
+
+    def test_load_matches_bis_items(self):
+        season, items = self.create_season()
+        for index in range(5):
+            self.create_player(season, items, index, start_source='제작템' if index % 2 else '석판템')
+        player = Player.objects.create(nickname='출발만', job='전사')
+        BisSet.objects.create(player=player, season=season, bis_type='출발')
+
+        with self.assertNumQueries(2):
+            model = SeasonModel.load(season)
+        table = get_cost_table(season)
+        bis_items = {'최종': {}, '출발': {}}
+        for bis_item in BisItem.objects.filter(bis_set__season=season).select_related('bis_set', 'item'):
+            bis_items[bis_item.bis_set.bis_type].setdefault(bis_item.bis_set.player_id, {})[bis_item.slot] = bis_item.item
+
+        self.assertEqual(
+            list(model.player_ids), sorted(BisSet.objects.filter(season=season).values_list('player_id', flat=True).distinct())
+        )
+        self.assertEqual([model.player_ids[i] for i in model.final_indices()], sorted(bis_items['최종']))
+        for index in model.final_indices():
+            player_id = model.player_ids[index]
+            final_items = bis_items['최종'][player_id]
+            self.assertEqual(
+                [SLOTS[slot] for slot in range(len(SLOTS)) if model.final_mask[index] >> slot & 1],
+                [slot for slot in SLOTS if slot in final_items]
+            )
+            self.assertEqual(
+                model.resource_row(index, table), table.encode(final_items, bis_items['출발'].get(player_id, {}))
+            )
+        # 최종 비스 세트가 없는 플레이어는 모델에 있지만 계산 대상이 아님
+        self.assertIn(player.id, model.index)
+        self.assertNotIn(model.index[player.id], model.final_indices())
+        self.assertEqual(model.final_mask[model.index[player.id]], 0)
+
+    def test_priority_table_from_rows_matches_entries(self):
+        rng = random.Random(11)
+        priorities_by_type, player_ids = random_priorities(rng, 12)
+        rows = [
+            (item_type, entry['player_id'], entry['player_name'], entry['priority'])
+            for item_type in sorted(priorities_by_type)
+            for entry in priorities_by_type[item_type]
+        ]
+
+        from_rows = DistributionService._build_weekly_plan(PriorityTable.from_rows(rows), 12)
+        from_entries = DistributionService._build_weekly_plan(
+            PriorityTable.from_priorities(dict(sorted(priorities_by_type.items())), player_ids), 12
+        )
+
+        self.assertEqual(from_rows['weekly_plan'], from_entries['weekly_plan'])
+        self.assertEqual(from_rows['player_item_records'], from_entries['player_item_records'])
+
+
+class ResourceCalculationTests(SeasonFixtureMixin, TestCase):
+    def test_resources_match_sources(self):
+        season, items = self.create_season()
+        player = self.create_player(season, items, 0, final_sources={
+            '무기': '영웅레이드템',
+            '상의': '보강석판템',
+            '귀걸이': '석판템',
+            '반지1': '보강석판템',
+        })
+
+        resources = ResourceCalculationService.calculate_resources_for_player(player, season)
+
+        self.assertEqual(resources['낱장_4층'], 8)
+        self.assertEqual(resources['석판'], 825 + 375 + 375)
+        self.assertEqual(resources['강화섬유'], 1)
+        self.assertEqual(resources['경화약'], 1)
+        self.assertEqual(resources['낱장_3층'], 4)
+        self.assertEqual(resources['낱장_2층'], 3)
+        self.assertEqual(
+            ResourceTracking.objects.get(player=player, season=season, resource_type='석판').total_needed,
+            825 + 375 + 375
+        )
+
+    def test_items_shared_with_start_set_are_free(self):
+        season, items = self.create_season()
+        player = self.create_player(season, items, 0, final_sources={slot: '제작템' for slot in SLOTS})
+
+        resources = ResourceCalculationService.calculate_resources_for_player(player, season)
+
+        self.assertEqual(sum(resources.values()), 0)
+
+    def test_season_calculation_writes_in_fixed_number_of_queries(self):
+        season, items = self.create_season()
+        players = [self.create_player(season, items, index) for index in range(6)]
+
+        # 대상 플레이어 1 + 세대 토큰 1 + 시즌 모델 2 + 저장된 필요량 1 + 저장 트랜잭션(savepoint 생성/해제) 2 + upsert 1 + 데이터 버전 1
+        with self.assertNumQueries(9):
+            resources_by_player = ResourceCalculationService.calculate_resources_for_season(season)
+
+        self.assertEqual(set(resources_by_player), {player.id for player in players})
+        self.assertEqual(ResourceTracking.objects.filter(season=season).count(), 6 * 8)
+
+    def test_unchanged_players_are_served_from_cache(self):
+        season, items = self.create_season()
+        players = [self.create_player(season, items, index) for index in range(3)]
+        first = ResourceCalculationService.calculate_resources_for_season(season, save=False)
+
+        # 대상 플레이어 + 세대 토큰 조회만 발생
+        with self.assertNumQueries(2):
+            second = ResourceCalculationService.calculate_resources_for_season(season, save=False)
+        with self.assertNumQueries(1):
+            single = ResourceCalculationService.calculate_resources_for_season(season, player_ids=[players[0].id], save=False)
+
+        self.assertEqual(first, second)
+        self.assertEqual(single, {players[0].id: first[players[0].id]})
+
+    def test_bis_edits_invalidate_cached_needs(self):
+        season, items = self.create_season()
+        player = self.create_player(season, items, 0, final_sources={'무기': '석판템'})
+        ResourceCalculationService.calculate_resources_for_season(season)
+
+        bis_item = BisItem.objects.get(bis_set__player=player, bis_set__bis_type='최종', slot='무기')
+        bis_item.item = items[('무기', '영웅레이드템')]
+        bis_item.save()
+        after_bis_edit = ResourceCalculationService.calculate_resources_for_season(season)[player.id]
+
+        raid_weapon = items[('무기', '영웅레이드템')]
+        raid_weapon.source = '석판템'
+        raid_weapon.save()
+        after_item_edit = ResourceCalculationService.calculate_resources_for_season(season)[player.id]
+
+        self.assertEqual((after_bis_edit['석판'], after_bis_edit['낱장_4층']), (0, 8))
+        self.assertEqual((after_item_edit['석판'], after_item_edit['낱장_4층']), (500, 0))
+
+    def test_generation_tokens_follow_database_transactions(self):
+        season, items = self.create_season()
+        player = self.create_player(season, items, 0, final_sources={'무기': '석판템'})
+        before = ResourceCalculationService.calculate_resources_for_season(season, save=False)[player.id]
+        bis_item = BisItem.objects.get(bis_set__player=player, bis_set__bis_type='최종', slot='무기')
+
+        # 롤백된 비스 변경은 토큰 교체도 취소되어 캐시된 값을 계속 사용
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            bis_item.item = items[('무기', '영웅레이드템')]
+            bis_item.save()
+            raise RuntimeError
+        with self.assertNumQueries(2):
+            ResourceCalculationService.calculate_resources_for_season(season, save=False)
+
+        # 다른 프로세스가 커밋한 변경처럼 캐시를 거치지 않고 바뀐 비스와 토큰도 반영
+        BisItem.objects.filter(pk=bis_item.pk).update(item=items[('무기', '영웅레이드템')])
+        ResourceNeedsToken.objects.filter(season=season, player_id=player.id).update(token='다른프로세스')
+        after = ResourceCalculationService.calculate_resources_for_season(season, save=False)[player.id]
+
+        self.assertEqual(before['석판'], TOMESTONE_COSTS['무기'])
+        self.assertEqual(after['석판'], 0)
+
+    def test_season_calculation_keeps_current_amount(self):
+        season, items = self.create_season()
+        player = self.create_player(season, items, 0)
+        ResourceTracking.objects.create(player=player, season=season, resource_type='석판', current_amount=300)
+
+        resources_by_player = ResourceCalculationService.calculate_resources_for_season(season)
+
+        tracking = ResourceTracking.objects.get(player=player, season=season, resource_type='석판')
+        self.assertEqual(tracking.current_amount, 300)
+        self.assertEqual(tracking.total_needed, resources_by_player[player.id]['석판'])
+
+    def test_calculate_needs_without_player_covers_season(self):
+        season, items = self.create_season()
+        for index in range(3):
+            self.create_player(season, items, index)
+        client = APIClient()
+        client.force_authenticate(CustomUser.objects.create_user(username='needs', password='pw', user_type='admin'))
+
+        response = client.post('/api/resources/calculate_needs/', {'season': season.id}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['players']), 3)
+
+
+def reference_resources(final_items, start_items):
+    """이전 분기 방식의 재화 계산 (비용 표 비교용)"""
+    resources = dict.fromkeys(RESOURCE_KEYS, 0)
+    for item_type, item in final_items.items():
+        start_item = start_items.get(item_type)
+        if start_item is not None and start_item.id == item.id:
+            continue
+        if item.source == '보강석판템':
+            if item_type in TOMESTONE_COSTS:
+                resources['석판'] += TOMESTONE_COSTS[item_type]
+                if item_type in ['모자', '상의', '장갑', '하의', '신발']:
+                    resources['강화섬유'] += 1
+                elif item_type in ['귀걸이', '목걸이', '팔찌', '반지1', '반지2']:
+                    resources['경화약'] += 1
+                elif item_type == '무기':
+                    resources['무기석판'] += 1
+        elif item.source == '석판템':
+            if item_type in TOMESTONE_COSTS:
+                resources['석판'] += TOMESTONE_COSTS[item_type]
+        elif item.source == '영웅레이드템':
+            if item_type in PAGE_COSTS:
+                resources[f"낱장_{PAGE_COSTS[item_type]['floor']}층"] += PAGE_COSTS[item_type]['count']
+    resources['낱장_2층'] += resources['경화약'] * UPGRADE_COSTS['경화약']['count']
+    resources['낱장_3층'] += resources['강화섬유'] * UPGRADE_COSTS['강화섬유']['count']
+    resources['낱장_2층'] += resources['무기석판'] * UPGRADE_COSTS['무기석판']['count']
+    return resources
+
+
+class ResourceCostTableTests(SeasonFixtureMixin, TestCase):
+    def test_upgrade_exchange_is_folded_into_vector(self):
+        table = ResourceCostTable.compile()
+
+        self.assertEqual(
+            table.vector('보강석판템', '반지1'),
+            {**dict.fromkeys(RESOURCE_KEYS, 0), '석판': 375, '경화약': 1, '낱장_2층': 3}
+        )
+        self.assertEqual(sum(table.vector('제작템', '무기').values()), 0)
+
+    def test_matches_reference_on_random_sets(self):
+        season, items = self.create_season()
+        sources = ['제작템', '석판템', '보강석판템', '영웅레이드템']
+        rng = random.Random(12)
+        table = ResourceCostTable.compile()
+
+        for _ in range(50):
+            final_items = {slot: items[(slot, rng.choice(sources))] for slot in SLOTS if rng.random() < 0.9}
+            start_items = {slot: items[(slot, rng.choice(sources))] for slot in SLOTS if rng.random() < 0.5}
+
+            total = table.multiply([table.encode(final_items, start_items)])[0]
+            self.assertEqual(table.to_dict(total), reference_resources(final_items, start_items))
+
+
+class SeasonCostTableTests(SeasonFixtureMixin, TestCase):
+    def setUp(self):
+        self.season, self.items = self.create_season()
+        self.player = self.create_player(self.season, self.items, 0, final_sources={
+            '무기': '석판템', '상의': '영웅레이드템', '반지1': '보강석판템'
+        })
+
+    def test_season_costs_override_defaults(self):
+        SeasonCost.objects.create(season=self.season, cost_type='tomestone', target='무기', amount=1000)
+        SeasonCost.objects.create(season=self.season, cost_type='page', target='상의', floor=3, amount=7)
+        SeasonCost.objects.create(season=self.season, cost_type='upgrade', target='경화약', floor=1, amount=2)
+        self.season.refresh_from_db()
+
+        resources = ResourceCalculationService.calculate_resources_for_season(self.season)[self.player.id]
+
+        self.assertEqual(self.season.cost_version, 3)
+        self.assertEqual(resources['석판'], 1000 + 375)
+        self.assertEqual(resources['낱장_3층'], 7)
+        self.assertEqual((resources['낱장_1층'], resources['낱장_2층']), (2, 0))
+
+    def test_compiled_table_is_reused_until_edit(self):
+        table = get_cost_table(self.season)
+        with self.assertNumQueries(0):
+            self.assertIs(get_cost_table(self.season), table)
+
+        cost = SeasonCost.objects.create(season=self.season, cost_type='tomestone', target='무기', amount=600)
+        self.season.refresh_from_db()
+        self.assertEqual(get_cost_table(self.season).tomestone_costs['무기'], 600)
+
+        cost.delete()
+        self.season.refresh_from_db()
+        self.assertEqual(get_cost_table(self.season).tomestone_costs['무기'], 500)
+
+    def test_cost_edit_marks_season_priorities_stale(self):
+        DistributionService.calculate_priority_for_season(self.season.id)
+        self.assertFalse(StalePriority.objects.filter(season=self.season).exists())
+
+        SeasonCost.objects.create(season=self.season, cost_type='tomestone', target='무기', amount=1000)
+
+        self.assertEqual(
+            StalePriority.objects.filter(season=self.season, player_id=self.player.id).count(), len(SLOTS)
+        )
+
+
+class ResourceSummaryTests(TestCase):
+    def setUp(self):
+        self.season = Season.objects.create(name='요약 시즌', start_date='2025-01-21')
+        other_season = Season.objects.create(name='다른 시즌', start_date='2025-01-21')
+        tank = Player.objects.create(nickname='탱커', job='전사')
+        healer = Player.objects.create(nickname='힐러', job='백마도사')
+        for player, needed, current in [(tank, 1000, 400), (healer, 500, 600)]:
+            ResourceTracking.objects.create(
+                player=player, season=self.season, resource_type='석판', total_needed=needed, current_amount=current
+            )
+            ResourceTracking.objects.create(
+                player=player, season=self.season, resource_type='낱장_4층', total_needed=8, current_amount=0
+            )
+        ResourceTracking.objects.create(player=tank, season=other_season, resource_type='석판', total_needed=9999)
+
+    def test_summary_aggregates_in_one_query(self):
+        client = APIClient()
+        with self.assertNumQueries(1):
+            response = client.get('/api/resources/summary/', {'season': self.season.id})
+
+        resources = {row['resource_type']: row for row in response.json()['resources']}
+        self.assertEqual([row['resource_type'] for row in response.json()['resources']], ['석판', '낱장_4층'])
+        self.assertEqual(resources['석판']['total_needed'], 1500)
+        self.assertEqual(resources['석판']['current_amount'], 1000)
+        self.assertEqual(resources['석판']['completion_ratio'], round(1000 / 1500, 4))
+        self.assertEqual(resources['낱장_4층']['remaining'], 16)
+        self.assertEqual(resources['낱장_4층']['player_count'], 2)
+
+    def test_summary_filters_by_job_type(self):
+        response = APIClient().get('/api/resources/summary/', {'season': self.season.id, 'job_type': '힐러'})
+
+        resources = {row['resource_type']: row for row in response.json()['resources']}
+        self.assertEqual(resources['석판']['total_needed'], 500)
+        self.assertEqual(resources['석판']['completion_ratio'], 1)
+
+    def test_unknown_job_type_is_rejected(self):
+        response = APIClient().get('/api/resources/summary/', {'job_type': '레인저'})
+
+        self.assertEqual(response.status_code, 400)
+
+
+class BisSetBulkEditTests(SeasonFixtureMixin, TestCase):
+    def setUp(self):
+        self.season, self.items = self.create_season()
+        self.player = Player.objects.create(nickname='일괄편집', job='전사')
+        self.bis_set = BisSet.objects.create(player=self.player, season=self.season, bis_type='최종')
+        self.client = APIClient()
+        self.client.force_authenticate(CustomUser.objects.create_user(username='bulk', password='pw', user_type='admin'))
+        StalePriority.objects.all().delete()
+
+    def put(self, items):
+        return self.client.put(f'/api/bis-sets/{self.bis_set.id}/bulk/', {'items': items}, format='json')
+
+    def full_set(self, source='영웅레이드템'):
+        return [
+            {
+                'slot': slot,
+                'item_id': self.items[(slot, source)].id,
+                'materias': [{'slot_number': 1, 'type': '무략'}]
+            }
+            for slot in SLOTS
+        ]
+
+    def test_full_set_is_written_in_fixed_number_of_queries(self):
+        # 비스 세트 1 + 아이템 1 + 트랜잭션(savepoint 생성/해제) 2 + 기존 아이템 1
+        # + 아이템/마테리쟈 생성 2 + 갱신 필요 표시 1 + 캐시 토큰 1 + 데이터 버전 1 + 응답용 조회(세트/아이템/아이템 정보/마테리쟈) 4
+        with self.assertNumQueries(14):
+            response = self.put(self.full_set())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['items']), len(SLOTS))
+        self.assertEqual(Materia.objects.filter(bis_item__bis_set=self.bis_set).count(), len(SLOTS))
+        self.assertEqual(
+            set(StalePriority.objects.filter(player_id=self.player.id).values_list('slot', flat=True)), set(SLOTS)
+        )
+
+    def test_changes_replace_items_and_materias(self):
+        self.put(self.full_set())
+        StalePriority.objects.all().delete()
+        weapon_id = BisItem.objects.get(bis_set=self.bis_set, slot='무기').id
+
+        items = [entry for entry in self.full_set() if entry['slot'] != '신발']
+        items[0]['materias'] = [{'slot_number': 1, 'type': '야망'}, {'slot_number': 2, 'type': '심안'}]
+        items[1]['item_id'] = self.items[('모자', '제작템')].id
+        response = self.put(items)
+
+        self.assertEqual(response.status_code, 200)
+        weapon = BisItem.objects.get(bis_set=self.bis_set, slot='무기')
+        self.assertEqual(weapon.id, weapon_id)
+        self.assertEqual(
+            dict(weapon.materias.values_list('slot_number', 'type')), {1: '야망', 2: '심안'}
+        )
+        self.assertEqual(BisItem.objects.get(bis_set=self.bis_set, slot='모자').item.source, '제작템')
+        self.assertFalse(BisItem.objects.filter(bis_set=self.bis_set, slot='신발').exists())
+        self.assertEqual(
+            set(StalePriority.objects.filter(player_id=self.player.id).values_list('slot', flat=True)), {'모자', '신발'}
+        )
+
+    def test_invalid_set_is_rejected_without_changes(self):
+        items = self.full_set()
+        items[0]['materias'] = [{'slot_number': slot_number, 'type': '무략'} for slot_number in range(1, 4)]
+        items[1]['item_id'] = self.items[('상의', '영웅레이드템')].id
+        items[10]['item_id'] = items[9]['item_id']
+
+        response = self.put(items)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.json()['errors']), 3)
+        self.assertFalse(BisItem.objects.filter(bis_set=self.bis_set).exists())
+
+    def test_regular_user_cannot_replace_other_players_set(self):
+        client = APIClient()
+        client.force_authenticate(CustomUser.objects.create_user(
+            username='other', password='pw', user_type='regular', nickname='다른사람'
+        ))
+
+        response = client.put(f'/api/bis-sets/{self.bis_set.id}/bulk/', {'items': self.full_set()}, format='json')
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(BisItem.objects.filter(bis_set=self.bis_set).exists())
+
+        client.force_authenticate(CustomUser.objects.create_user(
+            username='owner', password='pw', user_type='regular', nickname='일괄편집'
+        ))
+        response = client.put(f'/api/bis-sets/{self.bis_set.id}/bulk/', {'items': self.full_set()}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_bulk_edit_invalidates_cached_resources(self):
+        start_set = BisSet.objects.create(player=self.player, season=self.season, bis_type='출발')
+        BisItem.objects.create(bis_set=start_set, item=self.items[('무기', '제작템')], slot='무기')
+        self.put([{'slot': '무기', 'item_id': self.items[('무기', '영웅레이드템')].id}])
+        before = ResourceCalculationService.calculate_resources_for_player(self.player, self.season)
+
+        self.put([{'slot': '무기', 'item_id': self.items[('무기', '석판템')].id}])
+        after = ResourceCalculationService.calculate_resources_for_player(self.player, self.season)
+
+        self.assertEqual(before['석판'], 0)
+        self.assertEqual(after['석판'], TOMESTONE_COSTS['무기'])
+
+
+class BisImportTests(SeasonFixtureMixin, TestCase):
+    ENGLISH_SLOTS = ['Weapon', 'Head', 'Body', 'Hands', 'Legs', 'Feet', 'Ears', 'Neck', 'Wrist', 'RingLeft', 'RingRight']
+
+    def setUp(self):
+        self.season, self.items = self.create_season()
+
+    def export(self, nickname, source='영웅레이드템', bis_type='최종'):
+        return {
+            'player': nickname,
+            'job': '전사',
+            'bis_type': bis_type,
+            'gear': {
+                english: {
+                    'name': f'{slot} {source}',
+                    'item_level': self.items[(slot, source)].item_level,
+                    'materia': ['무략 마테리쟈 XII', '야망 마테리쟈 XII'] if slot == '무기' else []
+                }
+                for english, slot in zip(self.ENGLISH_SLOTS, SLOTS)
+            }
+        }
+
+    def test_static_is_imported_in_fixed_number_of_queries(self):
+        for index in range(4):
+            Player.objects.create(nickname=f'공대원{index}', job='전사')
+        data = {'sets': [self.export(f'공대원{index}', bis_type=bis_type) for index in range(4) for bis_type in ('출발', '최종')]}
+
+        # 시즌 1 + 아이템 색인 1 + 플레이어 1 + 트랜잭션 2 + 기존 세트 1 + 세트 생성 1 + 데이터 버전 1
+        # + 쓰기 트랜잭션 2 + 기존 아이템 1 + 아이템/마테리쟈 생성 2 + 갱신 필요 표시 1 + 캐시 토큰 1 + 데이터 버전 1 (세트 수와 무관)
+        with self.assertNumQueries(16):
+            result = BisImportService.import_sets(self.season.id, data)
+
+        self.assertTrue(result['success'], result)
+        self.assertEqual(BisItem.objects.filter(bis_set__season=self.season).count(), 8 * len(SLOTS))
+        self.assertEqual(
+            sorted(Materia.objects.filter(bis_item__slot='무기').values_list('type', flat=True).distinct()), ['무략', '야망']
+        )
+
+    def test_reimport_updates_existing_set_and_creates_players(self):
+        BisImportService.import_sets(self.season.id, self.export('새공대원'))
+        result = BisImportService.import_sets(self.season.id, self.export('새공대원', source='석판템'))
+
+        self.assertEqual((result['players_created'], result['sets'][0]['created']), (0, False))
+        self.assertEqual(result['sets'][0]['changed_slots'], SLOTS)
+        self.assertEqual(Player.objects.get(nickname='새공대원').job_type, '탱커')
+        self.assertEqual(BisSet.objects.filter(player__nickname='새공대원').count(), 1)
+        self.assertEqual(
+            set(BisItem.objects.filter(bis_set__player__nickname='새공대원').values_list('item__source', flat=True)), {'석판템'}
+        )
+
+    def test_unmatched_gear_rejects_whole_import(self):
+        broken = self.export('공대원B')
+        broken['gear']['Head']['item_level'] = 999
+        data = {'sets': [self.export('공대원A'), broken]}
+
+        result = BisImportService.import_sets(self.season.id, data)
+
+        self.assertFalse(result['success'])
+        self.assertEqual(len(result['errors']), 1)
+        self.assertFalse(Player.objects.filter(nickname__startswith='공대원').exists())
+
+    def test_management_command_loads_files_in_one_batch(self):
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for index in range(2):
+                path = os.path.join(directory, f'set{index}.json')
+                with open(path, 'w', encoding='utf-8') as export_file:
+                    json.dump(self.export(f'명령{index}'), export_file, ensure_ascii=False)
+                paths.append(path)
+
+            call_command('import_bis_sets', *paths, season=self.season.id, stdout=open(os.devnull, 'w'))
+
+        self.assertEqual(BisSet.objects.filter(player__nickname__startswith='명령').count(), 2)
+
+    def test_regular_user_can_only_import_own_sets(self):
+        client = APIClient()
+        client.force_authenticate(CustomUser.objects.create_user(
+            username='importer', password='pw', user_type='regular', nickname='본인'
+        ))
+
+        response = client.post('/api/bis-sets/import/', {
+            'season': self.season.id, 'data': {'sets': [self.export('본인'), self.export('남')]}
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        response = client.post('/api/bis-sets/import/', {
+            'season': self.season.id, 'data': self.export('본인')
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(BisSet.objects.filter(player__nickname='본인').exists())
+
+
+class SeasonDashboardTests(SeasonFixtureMixin, TestCase):
+    def setUp(self):
+        self.season, self.items = self.create_season()
+        self.players = [self.create_player(self.season, self.items, index) for index in range(2)]
+
+    def add_player_with_history(self, index):
+        player = self.create_player(self.season, self.items, index)
+        weapon = BisItem.objects.get(bis_set__player=player, bis_set__bis_type='최종', slot='무기')
+        Materia.objects.create(bis_item=weapon, type='무략', slot_number=1)
+        raid = RaidProgress.objects.create(season=self.season, raid_date=f'2025-02-{index + 1:02d}', floor=4)
+        ItemAcquisition.objects.create(raid_progress=raid, player=player, item=self.items[('무기', '영웅레이드템')])
+        return player
+
+    def get_dashboard(self):
+        return APIClient().get(f'/api/seasons/{self.season.id}/dashboard/')
+
+    def test_query_count_does_not_grow_with_players(self):
+        DistributionService.calculate_priority_for_season(self.season.id)
+        ResourceCalculationService.calculate_resources_for_season(self.season)
+
+        # 데이터 버전 1 + 시즌 1 + 비스 세트 1 + 비스 아이템 1 + 마테리쟈 1 + 우선순위 1 + 재화 1 + 최근 획득 1 + 갱신 필요 여부 1
+        with self.assertNumQueries(9):
+            self.get_dashboard()
+
+        for index in range(2, 6):
+            self.add_player_with_history(index)
+        DistributionService.calculate_priority_for_season(self.season.id)
+        ResourceCalculationService.calculate_resources_for_season(self.season)
+
+        with self.assertNumQueries(9):
+            response = self.get_dashboard()
+
+        data = response.json()
+        self.assertEqual(len(data['players']), 6)
+        self.assertEqual(len(data['recent_acquisitions']), 4)
+        self.assertEqual(data['recent_acquisitions'][0]['raid_date'], '2025-02-06')
+        self.assertFalse(data['priorities_stale'])
+
+    def test_payload_is_grouped_per_player(self):
+        player = self.add_player_with_history(2)
+        DistributionService.calculate_priority_for_season(self.season.id)
+        ResourceCalculationService.calculate_resources_for_season(self.season)
+
+        data = self.get_dashboard().json()
+        entry = next(entry for entry in data['players'] if entry['id'] == player.id)
+
+        self.assertEqual(set(entry['bis_sets']), {'출발', '최종'})
+        final_items = entry['bis_sets']['최종']['items']
+        self.assertEqual([bis_item['slot'] for bis_item in final_items], SLOTS)
+        self.assertEqual(final_items[0]['materias'][0]['type'], '무략')
+        self.assertEqual(
+            entry['resources']['석판']['total_needed'],
+            ResourceTracking.objects.get(player=player, season=self.season, resource_type='석판').total_needed
+        )
+        self.assertEqual(
+            [row['player_id'] for row in data['priorities']['무기']],
+            list(DistributionPriority.objects.filter(season=self.season, item_type='무기').order_by('priority').values_list('player_id', flat=True))
+        )
+
+
+class SeasonDataVersionTests(SeasonFixtureMixin, TestCase):
+    def setUp(self):
+        self.season, self.items = self.create_season()
+        self.players = [self.create_player(self.season, self.items, index) for index in range(2)]
+        self.client = APIClient()
+
+    def data_version(self):
+        return Season.objects.values_list('data_version', flat=True).get(pk=self.season.id)
+
+    def test_unchanged_list_returns_304_with_one_query(self):
+        url = f'/api/bis-sets/?season={self.season.id}'
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        bis_item = BisItem.objects.filter(bis_set__player=self.players[0], slot='무기').first()
+        Materia.objects.create(bis_item=bis_item, type='무략', slot_number=1)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_priority_list_returns_304_for_unchanged_season(self):
+        DistributionService.calculate_priority_for_season(self.season.id)
+        url = f'/api/distribution-priorities/?season={self.season.id}'
+        response = self.client.get(url)
+        etag = response['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        DistributionPriority.objects.filter(season=self.season).delete()
+        DistributionService.calculate_priority_for_season(self.season.id)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_detail_and_dashboard_honor_if_none_match(self):
+        bis_set = BisSet.objects.filter(season=self.season).first()
+        for url in [f'/api/bis-sets/{bis_set.id}/', f'/api/seasons/{self.season.id}/dashboard/', f'/api/seasons/{self.season.id}/']:
+            etag = self.client.get(url)['ETag']
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304, url)
+
+    def test_bulk_writes_bump_version_only_when_data_changes(self):
+        DistributionService.calculate_priority_for_season(self.season.id)
+        version = self.data_version()
+
+        DistributionService.calculate_priority_for_season(self.season.id)
+        self.assertEqual(self.data_version(), version)
+
+        raid = RaidProgress.objects.create(season=self.season, raid_date='2025-02-01', floor=4)
+        ItemAcquisition.objects.create(raid_progress=raid, player=self.players[0], item=self.items[('무기', '영웅레이드템')])
+        self.assertEqual(self.data_version(), version + 2)
+
+        ResourceTracking.objects.filter(season=self.season).delete()
+        version = self.data_version()
+        ResourceCalculationService.calculate_resources_for_season(self.season)
+        self.assertEqual(self.data_version(), version + 1)
+
+
+class BisSetReadPathTests(SeasonFixtureMixin, TestCase):
+    def setUp(self):
+        self.season, self.items = self.create_season()
+        self.players = [self.create_player(self.season, self.items, index) for index in range(3)]
+        weapon = BisItem.objects.filter(bis_set__player=self.players[0], slot='무기').first()
+        Materia.objects.create(bis_item=weapon, type='무략', slot_number=1)
+        self.client = APIClient()
+
+    def test_list_matches_serializer_output(self):
+        response = self.client.get(f'/api/bis-sets/?season={self.season.id}')
+
+        expected = BisSetSerializer(BisSet.objects.filter(season=self.season).order_by('id'), many=True).data
+        self.assertEqual(response.json()['count'], 6)
+        self.assertEqual(response.json()['results'], json.loads(json.dumps(expected)))
+
+    def test_list_query_count_does_not_grow_with_sets(self):
+        # 데이터 버전 1 + 시즌 필터 검증 1 + 전체 개수 1 + 페이지 ID 1 + 세트 1 + 비스 아이템 1 + 마테리쟈 1
+        with self.assertNumQueries(7):
+            self.client.get(f'/api/bis-sets/?season={self.season.id}')
+
+        for index in range(3, 8):
+            self.create_player(self.season, self.items, index)
+
+        with self.assertNumQueries(7):
+            response = self.client.get(f'/api/bis-sets/?season={self.season.id}')
+        self.assertEqual(len(response.json()['results']), 10)
+
+    def test_retrieve_matches_serializer_output(self):
+        bis_set = BisSet.objects.filter(player=self.players[0], bis_type='최종').get()
+
+        response = self.client.get(f'/api/bis-sets/{bis_set.id}/')
+
+        self.assertEqual(response.json(), json.loads(json.dumps(BisSetSerializer(bis_set).data)))
+        self.assertEqual(self.client.get('/api/bis-sets/999999/').status_code, 404)
+
+
+@override_settings(QUERY_BUDGET_ENABLED=True, QUERY_BUDGET_RAISE=True)
+class QueryBudgetTests(SeasonFixtureMixin, TestCase):
+    """공대 한 시즌 분량의 데이터로 모든 API 엔드포인트가 ViewSet에 선언된 쿼리 예산 안에서 응답하는지 검증"""
+
+    def setUp(self):
+        self.season, self.items = self.create_season()
+        self.players = [self.create_player(self.season, self.items, index) for index in range(8)]
+
+        materia_types = ['무략', '야망', '신속', '투지']
+        Materia.objects.bulk_create([
+            Materia(bis_item=bis_item, type=materia_types[(bis_item.id + slot_number) % 4], slot_number=slot_number)
+            for bis_item in BisItem.objects.filter(bis_set__season=self.season, bis_set__bis_type='최종')
+            for slot_number in (1, 2)
+        ])
+        DistributionService.calculate_priority_for_season(self.season.id)
+        ResourceCalculationService.calculate_resources_for_season(self.season)
+
+        for week in range(4):
+            for floor in (1, 2, 3, 4):
+                raid = RaidProgress.objects.create(season=self.season, raid_date=f'2025-02-{week * 7 + floor:02d}', floor=floor)
+                for offset, slot in enumerate(SLOTS[floor:floor + 2]):
+                    ItemAcquisition.objects.create(
+                        raid_progress=raid, player=self.players[(week + offset) % 8], item=self.items[(slot, '영웅레이드템')]
+                    )
+
+        self.admin = CustomUser.objects.create_user(username='budget', password='pw', user_type='admin')
+        self.member = CustomUser.objects.create_user(username='member', password='pw', user_type='user')
+        start = timezone.now()
+        for index in range(6):
+            Schedule.objects.create(
+                title=f'레이드 {index}', start_time=start + timedelta(days=index), end_time=start + timedelta(days=index, hours=2),
+                creator=self.admin if index % 2 else self.member, is_admin_schedule=bool(index % 2)
+            )
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def request(self, method, url, data=None):
+        response = getattr(self.client, method)(url, data, format='json' if method != 'get' else None)
+        self.assertLess(response.status_code, 300, url)
+        # 예산을 넘으면 미들웨어가 QueryBudgetExceeded를 발생시킴
+        name, budget = get_view_budget(response.wsgi_request)
+        self.assertIsNotNone(budget, f'{name} 액션에 쿼리 예산이 없습니다.')
+        self.assertLessEqual(response.wsgi_request.query_stats.count, budget)
+        return response
+
+    def test_read_endpoints_stay_within_budget(self):
+        season_id = self.season.id
+        player_id = self.players[0].id
+        bis_set_id = BisSet.objects.filter(player=self.players[0], bis_type='최종').values_list('id', flat=True).get()
+        bis_item_id = BisItem.objects.filter(bis_set_id=bis_set_id).values_list('id', flat=True).first()
+        raid_id = RaidProgress.objects.filter(season=self.season).values_list('id', flat=True).first()
+
+        for url, params in [
+            ('/api/seasons/', None),
+            (f'/api/seasons/{season_id}/', None),
+            (f'/api/seasons/{season_id}/active_players/', None),
+            (f'/api/seasons/{season_id}/dashboard/', None),
+            ('/api/items/', {'season': season_id}),
+            (f'/api/items/{self.items[("무기", "영웅레이드템")].id}/', None),
+            ('/api/items/count/', {'season': season_id}),
+            ('/api/players/', None),
+            (f'/api/players/{player_id}/', None),
+            (f'/api/players/{player_id}/bis_sets/', {'season': season_id}),
+            ('/api/bis-sets/', {'season': season_id}),
+            (f'/api/bis-sets/{bis_set_id}/', None),
+            ('/api/bis-items/', {'bis_set': bis_set_id}),
+            (f'/api/bis-items/{bis_item_id}/', None),
+            ('/api/raid-progress/', {'season': season_id}),
+            (f'/api/raid-progress/{raid_id}/', None),
+            ('/api/item-acquisitions/', None),
+            ('/api/distribution-priorities/', {'season': season_id}),
+            ('/api/resources/', {'season': season_id}),
+            ('/api/resources/summary/', {'season': season_id}),
+            ('/api/schedules/', None),
+            ('/api/schedules/my_schedules/', None),
+            ('/api/jobs/', None),
+        ]:
+            self.request('get', url, params)
+
+    def test_write_endpoints_stay_within_budget(self):
+        season_id = self.season.id
+        bis_set = BisSet.objects.get(player=self.players[0], bis_type='최종')
+        weapon = BisItem.objects.get(bis_set=bis_set, slot='무기')
+
+        self.request('post', '/api/distribution-priorities/calculate/', {'season': season_id})
+        self.request('post', '/api/distribution-priorities/generate_distribution_plan/', {'season': season_id, 'weeks': 12})
+        self.request('get', '/api/distribution-priorities/distribution_plan/', {'season': season_id})
+        self.request('post', '/api/resources/calculate_needs/', {'season': season_id})
+        self.request('put', f'/api/bis-sets/{bis_set.id}/bulk/', {'items': [
+            {'slot': '무기', 'item_id': self.items[('무기', '보강석판템')].id, 'materias': [{'slot_number': 1, 'type': '무략'}]}
+        ]})
+        self.request('post', f'/api/bis-items/{weapon.id}/remove_all_materias/')
+        self.request('post', f'/api/bis-items/{weapon.id}/add_materia/', {'type': '야망', 'slot_number': 1})
+        self.request('post', f'/api/bis-sets/{bis_set.id}/add_item/', {'item_id': self.items[('모자', '석판템')].id, 'slot': '모자'})
+        self.request('post', '/api/bis-sets/import/', {'season': season_id, 'data': {'sets': [{
+            'player': self.players[1].nickname, 'bis_type': '출발',
+            'gear': [{'slot': 'Weapon', 'name': '무기 제작템', 'item_level': 710, 'materia': ['무략']}]
+        }]}})
+        self.request('post', '/api/distribution-priorities/simulate/', {'season': season_id, 'trials': 20, 'seed': 1})
+        self.request('post', '/api/distribution-priorities/update_distribution_plan/', {
+            'season': season_id, 'week': 9, 'floor': 4,
+            'plan_data': [{'item_type': '무기', 'player_id': self.players[2].id, 'player_name': self.players[2].nickname, 'original_priority': 0, 'manual': True}]
+        })
+
+    def test_crud_endpoints_stay_within_budget(self):
+        season_id = self.season.id
+
+        for url, data, changes in [
+            ('/api/seasons/', {'name': '새 시즌', 'start_date': '2025-06-01'}, {'name': '수정'}),
+            ('/api/items/', {'season': season_id, 'name': '새 무기', 'type': '무기', 'source': '제작템', 'item_level': 700}, {'name': '수정'}),
+            ('/api/players/', {'nickname': '새 플레이어', 'job': '전사', 'job_type': '탱커'}, {'job': '나이트'}),
+            ('/api/raid-progress/', {'season': season_id, 'raid_date': '2025-03-01', 'floor': 1}, {'notes': '수정'}),
+            ('/api/schedules/', {'title': '새 일정', 'start_time': '2025-03-01T20:00:00Z', 'end_time': '2025-03-01T22:00:00Z'}, {'title': '수정'}),
+        ]:
+            created = self.request('post', url, data).json()
+            self.request('patch', f"{url}{created['id']}/", changes)
+            self.request('delete', f"{url}{created['id']}/")
+
+        player = self.request('post', '/api/players/', {'nickname': '세트 플레이어', 'job': '전사', 'job_type': '탱커'}).json()
+        bis_set = self.request('post', '/api/bis-sets/', {'player': player['id'], 'season': season_id, 'bis_type': '최종'}).json()
+        bis_item = self.request('post', '/api/bis-items/', {
+            'bis_set': bis_set['id'], 'item_id': self.items[('무기', '영웅레이드템')].id, 'slot': '무기'
+        }).json()
+        self.request('patch', f"/api/bis-items/{bis_item['id']}/", {'item_id': self.items[('무기', '석판템')].id})
+        self.request('delete', f"/api/bis-items/{bis_item['id']}/")
+        self.request('delete', f"/api/bis-sets/{bis_set['id']}/")
+
+        priority = DistributionPriority.objects.filter(season=self.season).first()
+        self.request('patch', f'/api/distribution-priorities/{priority.id}/', {'priority': 3})
+        resource = ResourceTracking.objects.filter(season=self.season).first()
+        self.request('patch', f'/api/resources/{resource.id}/', {'current_amount': 100})
+
+    def test_exceeding_budget_raises_in_tests(self):
+        with patch.dict(SeasonViewSet.query_budgets, {'list': 0}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get('/api/seasons/')
+
+    @override_settings(QUERY_BUDGET_RAISE=False)
+    def test_exceeding_budget_only_logs_when_not_raising(self):
+        with patch.dict(SeasonViewSet.query_budgets, {'list': 0}):
+            with self.assertLogs('bis_manager.middleware', level='WARNING') as logs:
+                response = self.client.get('/api/seasons/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('SeasonViewSet.list', logs.output[0])
+
+
+@override_settings(PERFORMANCE_SAMPLE_RATE=1.0)
+class PerformanceMiddlewareTests(SeasonFixtureMixin, TestCase):
+    def setUp(self):
+        request_metrics.reset()
+        self.season, self.items = self.create_season()
+        self.create_player(self.season, self.items, 0)
+        self.admin = APIClient()
+        self.admin.force_authenticate(CustomUser.objects.create_user(username='metrics', password='pw', user_type='admin'))
+
+    def test_server_timing_header_splits_request_time(self):
+        response = APIClient().get('/api/bis-sets/', {'season': self.season.id})
+
+        timing = dict(
+            (entry.split(';')[0], entry) for entry in response['Server-Timing'].split(', ')
+        )
+        self.assertEqual(set(timing), {'db', 'view', 'render', 'total'})
+        self.assertIn(f'desc="{response.wsgi_request.query_stats.count} queries"', timing['db'])
+
+    def test_metrics_endpoint_reports_per_view_histograms(self):
+        client = APIClient()
+        client.get('/api/bis-sets/', {'season': self.season.id})
+        client.get('/api/bis-sets/', {'season': self.season.id})
+        client.get('/api/seasons/999999/')
+
+        response = self.admin.get('/api/_metrics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('bis_request_duration_seconds_count{view="BisSetViewSet.list",method="GET"} 2', body)
+        self.assertIn('bis_request_duration_seconds_bucket{view="BisSetViewSet.list",method="GET",le="+Inf"} 2', body)
+        self.assertIn('bis_responses_total{view="SeasonViewSet.retrieve",method="GET",status="4xx"} 1', body)
+
+    def test_metrics_endpoint_is_admin_only(self):
+        self.assertIn(APIClient().get('/api/_metrics').status_code, (401, 403))
+
+        member = APIClient()
+        member.force_authenticate(CustomUser.objects.create_user(username='member', password='pw', user_type='user'))
+        self.assertEqual(member.get('/api/_metrics').status_code, 403)
+
+    @override_settings(PERFORMANCE_SAMPLE_RATE=0)
+    def test_nothing_is_recorded_when_sampling_is_off(self):
+        response = APIClient().get('/api/bis-sets/', {'season': self.season.id})
+
+        self.assertFalse(response.has_header('Server-Timing'))
+        self.assertNotIn('BisSetViewSet.list', request_metrics.render_prometheus())
+
+
+class TracingTests(SeasonFixtureMixin, TestCase):
+    def setUp(self):
+        self.season, self.items = self.create_season()
+        self.create_player(self.season, self.items, 0)
+        self.client = APIClient()
+        self.client.force_authenticate(CustomUser.objects.create_user(username='tracing', password='pw', user_type='admin'))
+
+    def traced_request(self, method, path, data):
+        with self.assertLogs('bis_manager.tracing', level='INFO') as logs:
+            response = getattr(self.client, method)(path, data, format='json')
+        self.assertEqual(len(logs.records), 1)
+        return response, json.loads(logs.records[0].getMessage())
+
+    def test_span_and_event_are_noops_outside_a_trace(self):
+        self.assertFalse(tracing.active())
+        with tracing.span('outside', value=1) as span:
+            span.set(more=2)
+        tracing.event('outside')
+        self.assertFalse(tracing.active())
+
+    @override_settings(TRACING_SAMPLE_RATE=1.0, BACKGROUND_JOBS_EAGER=True)
+    def test_sampled_request_logs_one_structured_line(self):
+        response, trace = self.traced_request(
+            'post', '/api/distribution-priorities/calculate/', {'season': self.season.id}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(trace['trace'], 'request')
+        self.assertEqual(trace['view'], 'DistributionPriorityViewSet.calculate')
+        self.assertEqual(trace['status'], 200)
+        spans = {record['span']: record for record in trace['records'] if 'span' in record}
+        self.assertIn('job', spans)
+        self.assertEqual(spans['priority.save']['depth'], spans['job']['depth'] + 1)
+        self.assertIn('duration_ms', spans['priority.save'])
+        events = [record['event'] for record in trace['records'] if 'event' in record]
+        self.assertIn('priority.request', events)
+        self.assertIn('priority.item_type', events)
+
+    @override_settings(TRACING_SAMPLE_RATE=1.0)
+    def test_permission_and_model_events_are_recorded(self):
+        bis_set = BisSet.objects.filter(season=self.season, bis_type='출발').first()
+        response, trace = self.traced_request(
+            'post', f'/api/bis-sets/{bis_set.id}/add_item/', {'item_id': self.items[('모자', '석판템')].id, 'slot': '모자'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        events = [record['event'] for record in trace['records'] if 'event' in record]
+        self.assertIn('permission.bis_set', events)
+        self.assertIn('bis_item.save', events)
+
+    @override_settings(TRACING_SAMPLE_RATE=1.0)
+    def test_manual_plan_update_records_count_not_payload(self):
+        response, trace = self.traced_request('post', '/api/distribution-priorities/update_distribution_plan/', {
+            'season': self.season.id, 'week': 9, 'floor': 4,
+            'plan_data': [{'item_type': '무기', 'player_id': None, 'player_name': '수동입력메모', 'manual': True}]
+        })
+
+        self.assertEqual(response.status_code, 200)
+        events = {record['event']: record for record in trace['records'] if 'event' in record}
+        self.assertEqual(events['weekly_plan.manual_update']['assignments'], 1)
+        self.assertNotIn('plan_data', events['weekly_plan.manual_update'])
+        self.assertNotIn('수동입력메모', json.dumps(trace, ensure_ascii=False))
+
+    @override_settings(TRACING_SAMPLE_RATE=0)
+    def test_nothing_is_logged_when_sampling_is_off(self):
+        with patch.object(tracing.logger, 'info') as log_info:
+            self.client.get('/api/bis-sets/', {'season': self.season.id})
+        log_info.assert_not_called()
+
+
+class PriorityCalculationTests(SeasonFixtureMixin, TestCase):
+    def test_priorities_follow_slot_cost(self):
+        season, items = self.create_season()
+        raid = self.create_player(season, items, 0, final_sources={'무기': '영웅레이드템', '반지1': '영웅레이드템'})
+        tome = self.create_player(season, items, 1, final_sources={'무기': '석판템', '반지2': '석판템'})
+
+        result = DistributionService.calculate_priority_for_season(season.id)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['player_count'], 2)
+        # 석판 비용(500)이 낱장 개수(8)보다 크므로 석판템 플레이어가 우선
+        self.assertEqual(result['priorities']['무기'], [tome.id, raid.id])
+        self.assertEqual(result['priorities']['반지'], [tome.id, raid.id])
+        self.assertEqual(
+            DistributionPriority.objects.get(season=season, player=raid, item_type='무기').priority, 2
+        )
+
+    def test_missing_item_types_are_warned_once_per_plan(self):
+        season, items = self.create_season()
+        for index in range(2):
+            self.create_player(season, items, index, final_sources={'무기': '영웅레이드템'})
+        DistributionService.calculate_priority_for_season(season.id)
+
+        for mode in ('greedy', 'optimal'):
+            with self.assertLogs('bis_manager.services.distribution_service', level='WARNING') as logs:
+                result = DistributionService.generate_weekly_distribution_plan(season.id, mode=mode)
+
+            self.assertTrue(result['success'])
+            missing = [record for record in logs.records if '우선순위 데이터가 없는' in record.getMessage()]
+            self.assertEqual(len(missing), 1, mode)
+
+    def test_progress_is_reported_during_player_pass(self):
+        season = generate_season(60)
+        calls = []
+
+        result = DistributionService.calculate_priority_for_season(
+            season.id, progress=lambda processed, total: calls.append((processed, total))
+        )
+
+        self.assertTrue(result['success'])
+        self.assertEqual(calls[0], (0, 60))
+        self.assertEqual(calls[-1], (60, 60))
+        self.assertGreater(len(calls), 10)
+        self.assertEqual([processed for processed, _ in calls], sorted(processed for processed, _ in calls))
+
+    def test_model_resource_queries_do_not_grow_with_roster(self):
+        season, items = self.create_season()
+        for index in range(8):
+            self.create_player(season, items, index)
+        get_cost_table(season)
+        ResourceNeedsToken.objects.all().delete()
+        caches['resources'].clear()
+
+        # 불러온 시즌 모델을 넘기면 BiS 조회 없이 세대 토큰 조회만 발생 (토큰이 없으면 생성 포함 3회)
+        model = SeasonModel.load(season)
+        with self.assertNumQueries(3):
+            first = ResourceCalculationService.calculate_resources_for_season(season, model=model, save=False)
+        caches['resources'].clear()
+        with self.assertNumQueries(1):
+            second = ResourceCalculationService.calculate_resources_for_season(season, model=model, save=False)
+
+        self.assertEqual(len(first), 8)
+        self.assertEqual(first, second)
+        for player_id, resources in first.items():
+            final_items = {
+                bis_item.slot: bis_item.item
+                for bis_item in BisItem.objects.filter(bis_set__player_id=player_id, bis_set__bis_type='최종').select_related('item')
+            }
+            start_items = {
+                bis_item.slot: bis_item.item
+                for bis_item in BisItem.objects.filter(bis_set__player_id=player_id, bis_set__bis_type='출발').select_related('item')
+            }
+            self.assertEqual(resources, reference_resources(final_items, start_items))
+
+
+class IncrementalPriorityTests(SeasonFixtureMixin, TestCase):
+    def setUp(self):
+        self.season, self.items = self.create_season()
+        self.players = [self.create_player(self.season, self.items, index) for index in range(4)]
+        DistributionService.calculate_priority_for_season(self.season.id)
+
+    def test_full_calculation_clears_stale_marks(self):
+        self.assertFalse(StalePriority.objects.filter(season=self.season).exists())
+
+    def test_bis_item_change_marks_slot(self):
+        bis_item = BisItem.objects.get(bis_set__player=self.players[0], bis_set__bis_type='최종', slot='모자')
+        bis_item.item = self.items[('모자', '석판템')]
+        bis_item.save(update_fields=['item'])
+
+        marks = list(StalePriority.objects.filter(season=self.season).values_list('player_id', 'slot'))
+        self.assertEqual(marks, [(self.players[0].id, '모자')])
+
+    def test_incremental_recalculation_only_touches_changed_item_types(self):
+        untouched_ids = set(
+            DistributionPriority.objects.filter(season=self.season).exclude(item_type='반지1')
+            .exclude(item_type='반지').values_list('id', flat=True)
+        )
+
+        # 보강석판템(375) -> 제작템(비용 0)으로 바꾸면 우선순위가 가장 낮아짐
+        bis_item = BisItem.objects.get(bis_set__player=self.players[0], bis_set__bis_type='최종', slot='반지1')
+        bis_item.item = self.items[('반지1', '제작템')]
+        bis_item.save(update_fields=['item'])
+
+        result = DistributionService.calculate_priority_for_season(self.season.id, incremental=True)
+
+        self.assertTrue(result['incremental'])
+        self.assertEqual(sorted(result['updated_item_types']), ['반지', '반지1'])
+        self.assertEqual(result['priorities']['반지1'][-1], self.players[0].id)
+        self.assertEqual(
+            DistributionPriority.objects.get(season=self.season, player=self.players[0], item_type='반지1').priority, 4
+        )
+        self.assertTrue(untouched_ids <= set(DistributionPriority.objects.values_list('id', flat=True)))
+        self.assertFalse(StalePriority.objects.filter(season=self.season).exists())
+
+        # 변경 사항이 없으면 아무 것도 다시 계산하지 않음
+        result = DistributionService.calculate_priority_for_season(self.season.id, incremental=True)
+        self.assertEqual(result['updated_item_types'], [])
+
+    def test_deleting_final_set_removes_player_from_rankings(self):
+        BisSet.objects.get(player=self.players[1], season=self.season, bis_type='최종').delete()
+
+        DistributionService.calculate_priority_for_season(self.season.id, incremental=True)
+
+        self.assertFalse(DistributionPriority.objects.filter(season=self.season, player=self.players[1]).exists())
+        self.assertEqual(
+            sorted(DistributionPriority.objects.filter(season=self.season, item_type='무기').values_list('priority', flat=True)),
+            [1, 2, 3]
+        )
+
+    def test_deleting_season_does_not_leave_marks(self):
+        self.season.delete()
+        self.assertFalse(StalePriority.objects.exists())
+
+
+class PriorityUpsertTests(SeasonFixtureMixin, TestCase):
+    def setUp(self):
+        self.season, self.items = self.create_season()
+        self.players = [self.create_player(self.season, self.items, index) for index in range(4)]
+
+    def test_recalculation_without_changes_writes_nothing(self):
+        first = DistributionService.calculate_priority_for_season(self.season.id)
+        ids = set(DistributionPriority.objects.values_list('id', flat=True))
+
+        second = DistributionService.calculate_priority_for_season(self.season.id)
+
+        self.assertEqual(first['write_stats']['created'], first['created_count'])
+        self.assertEqual(second['write_stats'], {'created': 0, 'updated': 0, 'deleted': 0})
+        self.assertEqual(ids, set(DistributionPriority.objects.values_list('id', flat=True)))
+
+    def test_changed_ranks_are_updated_in_place(self):
+        DistributionService.calculate_priority_for_season(self.season.id)
+        row = DistributionPriority.objects.get(season=self.season, player=self.players[0], item_type='반지1')
+        other = DistributionPriority.objects.get(season=self.season, player=self.players[2], item_type='반지1')
+
+        bis_item = BisItem.objects.get(bis_set__player=self.players[0], bis_set__bis_type='최종', slot='반지1')
+        bis_item.item = self.items[('반지1', '제작템')]
+        bis_item.save(update_fields=['item'])
+
+        result = DistributionService.calculate_priority_for_season(self.season.id)
+
+        row.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(row.priority, 4)
+        self.assertEqual(other.priority, 1)
+        self.assertEqual(result['write_stats']['created'], 0)
+        self.assertEqual(result['write_stats']['deleted'], 0)
+
+    def test_rows_for_removed_players_are_deleted(self):
+        DistributionService.calculate_priority_for_season(self.season.id)
+        BisSet.objects.get(player=self.players[3], season=self.season, bis_type='최종').delete()
+
+        result = DistributionService.calculate_priority_for_season(self.season.id)
+
+        self.assertGreater(result['write_stats']['deleted'], 0)
+        self.assertFalse(DistributionPriority.objects.filter(player=self.players[3]).exists())
+
+    def test_deleted_rows_do_not_bump_version_per_row(self):
+        DistributionService.calculate_priority_for_season(self.season.id)
+        version = Season.objects.values_list('data_version', flat=True).get(pk=self.season.id)
+
+        # 기존 행 조회 1 + 삭제 대상 조회 1 + 삭제 1 (행마다 데이터 버전 증가 없음)
+        with self.assertNumQueries(3):
+            stats = DistributionService._save_priorities(self.season, {}, replace_all=True)
+
+        self.assertGreater(stats['deleted'], 0)
+        self.assertFalse(DistributionPriority.objects.filter(season=self.season).exists())
+        self.assertEqual(Season.objects.values_list('data_version', flat=True).get(pk=self.season.id), version)
+
+
+def reference_weekly_plan(priorities_by_type, player_ids, weeks):
+    """기존 정렬 기반 주간 분배 알고리즘 (차등 테스트용 기준 구현)"""
+    import copy
+
+    total_items_per_week = sum(len(items) for items in RAID_FLOOR_DROPS.values())
+    player_item_records = {p: {t: False for t in priorities_by_type.keys()} for p in player_ids}
+    player_item_counts = {p: 0 for p in player_ids}
+    first_eight_weeks = min(8, weeks)
+    target = min(first_eight_weeks * total_items_per_week // len(player_ids), total_items_per_week)
+    weekly_plan = []
+
+    for week in range(1, first_eight_weeks + 1):
+        week_plan = {'week': week, 'floors': {}}
+        weekly = {p: 0 for p in player_ids}
+        for floor, item_types in RAID_FLOOR_DROPS.items():
+            floor_plan = []
+            for item_type in item_types:
+                type_priorities = copy.deepcopy(priorities_by_type.get(item_type, []))
+                if not type_priorities:
+                    continue
+                eligible = [p for p in type_priorities if not player_item_records[p['player_id']][item_type]]
+                note = None
+                if not eligible:
+                    eligible = [p for p in type_priorities if player_item_counts[p['player_id']] < target]
+                    note = '이미 획득한 아이템 타입'
+                if not eligible:
+                    continue
+                eligible.sort(key=lambda x: (player_item_counts[x['player_id']], weekly[x['player_id']], x['priority']))
+                winner = eligible[0]
+                player_item_records[winner['player_id']][item_type] = True
+                player_item_counts[winner['player_id']] += 1
+                weekly[winner['player_id']] += 1
+                assignment = {
+                    'item_type': item_type,
+                    'player_id': winner['player_id'],
+                    'player_name': winner['player_name'],
+                    'original_priority': winner['priority'],
+                }
+                if note:
+                    assignment['note'] = note
+                floor_plan.append(assignment)
+            week_plan['floors'][floor] = floor_plan
+        weekly_plan.append(week_plan)
+
+    return weekly_plan, player_item_records, player_item_counts
+
+
+def random_priorities(rng, player_count):
+    """무작위 로스터의 아이템 타입별 우선순위 목록 생성"""
+    player_ids = list(range(1, player_count + 1))
+    priorities_by_type = {}
+    for item_type in SLOTS + ['반지']:
+        if rng.random() < 0.1:
+            continue
+        needers = [p for p in player_ids if rng.random() < 0.8]
+        rng.shuffle(needers)
+        priorities_by_type[item_type] = [
+            {'player_id': p, 'player_name': f'P{p}', 'priority': rank}
+            for rank, p in enumerate(needers, 1)
+        ]
+    involved = {e['player_id'] for entries in priorities_by_type.values() for e in entries}
+    return priorities_by_type, [p for p in player_ids if p in involved]
+
+
+class WeeklyAllocatorDifferentialTests(TestCase):
+    def test_matches_reference_on_random_rosters(self):
+        rng = random.Random(20250121)
+        for trial in range(200):
+            player_count = rng.choice([1, 2, 5, 8, 8, 8, 12, 24, 60])
+            weeks = rng.choice([4, 8, 12])
+            priorities_by_type, player_ids = random_priorities(rng, player_count)
+            if not player_ids:
+                continue
+
+            expected_plan, expected_records, expected_counts = reference_weekly_plan(
+                priorities_by_type, player_ids, weeks
+            )
+            result = DistributionService._build_weekly_plan(PriorityTable.from_priorities(priorities_by_type, player_ids), weeks)
+
+            with self.subTest(trial=trial):
+                self.assertEqual(result['weekly_plan'][:min(8, weeks)], expected_plan)
+                self.assertEqual(result['player_acquisitions'], {
+                    p: c for p, c in sorted(expected_counts.items(), key=lambda x: x[1], reverse=True)
+                })
+                self.assertEqual(
+                    {p: r['items'] for p, r in result['player_item_records'].items()},
+                    {p: [t for t, acquired in r.items() if acquired] for p, r in expected_records.items()}
+                )
+
+    def test_plan_from_database(self):
+        season = Season.objects.create(name='분배 시즌', start_date='2025-01-21')
+        players = [Player.objects.create(nickname=f'분배{i}', job='전사') for i in range(8)]
+        for item_type in SLOTS:
+            for rank, player in enumerate(players, 1):
+                DistributionPriority.objects.create(season=season, player=player, item_type=item_type, priority=rank)
+
+        result = DistributionService.generate_weekly_distribution_plan(season.id, 12)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(len(result['weekly_plan']), 12)
+        self.assertEqual(result['missing_items'], {})
+        self.assertTrue(all(count == 11 for count in result['player_acquisitions'].values()))
+
+
+class OptimalPlanTests(TestCase):
+    def assert_valid_plan(self, result, priorities_by_type):
+        """모든 드롭이 우선순위 목록의 플레이어에게 한 번씩만 배정되었는지 확인"""
+        for week_plan in result['weekly_plan']:
+            for floor, assignments in week_plan['floors'].items():
+                item_types = [a['item_type'] for a in assignments]
+                self.assertEqual(len(item_types), len(set(item_types)))
+                for assignment in assignments:
+                    self.assertIn(
+                        assignment['player_id'],
+                        [e['player_id'] for e in priorities_by_type[assignment['item_type']]]
+                    )
+
+    def test_solver_finds_minimum_cost(self):
+        cost = [[4, 1, 3], [2, 0, 5], [3, 2, 2]]
+        self.assertEqual(solve_assignment(cost), [1, 0, 2])
+        # 직사각 행렬 (행이 더 많은 경우 일부 행은 배정되지 않음)
+        self.assertEqual(solve_assignment([[1], [0], [5]]), [None, 0, None])
+
+    def test_full_static_gets_full_coverage(self):
+        rng = random.Random(7)
+        priorities_by_type = {}
+        for item_type in SLOTS:
+            players = list(range(1, 9))
+            rng.shuffle(players)
+            priorities_by_type[item_type] = [
+                {'player_id': p, 'player_name': f'P{p}', 'priority': rank} for rank, p in enumerate(players, 1)
+            ]
+
+        result = DistributionService._build_weekly_plan(PriorityTable.from_priorities(priorities_by_type, list(range(1, 9))), 12, mode='optimal')
+
+        self.assertEqual(result['mode'], 'optimal')
+        self.assertEqual(result['missing_items'], {})
+        self.assertEqual(set(result['player_acquisitions'].values()), {11})
+        self.assert_valid_plan(result, priorities_by_type)
+        # 같은 주에 한 플레이어에게 아이템이 몰리지 않아야 함
+        for week_plan in result['weekly_plan'][:8]:
+            winners = [a['player_id'] for floor in week_plan['floors'].values() for a in floor]
+            self.assertLessEqual(max(winners.count(p) for p in set(winners)), 2)
+
+    def test_coverage_matches_greedy_on_random_rosters(self):
+        rng = random.Random(99)
+        for trial in range(30):
+            priorities_by_type, player_ids = random_priorities(rng, rng.choice([4, 8, 12]))
+            if not player_ids:
+                continue
+            greedy = DistributionService._build_weekly_plan(PriorityTable.from_priorities(priorities_by_type, player_ids), 8)
+            optimal = DistributionService._build_weekly_plan(PriorityTable.from_priorities(priorities_by_type, player_ids), 8, mode='optimal')
+
+            with self.subTest(trial=trial):
+                self.assert_valid_plan(optimal, priorities_by_type)
+                covered = lambda result: sum(len(r['items']) for r in result['player_item_records'].values())
+                self.assertGreaterEqual(covered(optimal), covered(greedy))
+
+    def test_large_roster(self):
+        rng = random.Random(3)
+        priorities_by_type, player_ids = random_priorities(rng, 300)
+
+        result = DistributionService._build_weekly_plan(PriorityTable.from_priorities(priorities_by_type, player_ids), 12, mode='optimal')
+
+        self.assert_valid_plan(result, priorities_by_type)
+        self.assertEqual(
+            sum(len(floor) for week in result['weekly_plan'] for floor in week['floors'].values()),
+            sum(8 for floor in RAID_FLOOR_DROPS.values() for t in floor if priorities_by_type.get(t))
+        )
+
+
+class DistributionPlanPersistenceTests(TestCase):
+    def setUp(self):
+        self.season = Season.objects.create(name='계획 시즌', start_date='2025-01-21')
+        self.players = [Player.objects.create(nickname=f'계획{i}', job='전사') for i in range(8)]
+        for item_type in SLOTS:
+            for rank, player in enumerate(self.players, 1):
+                DistributionPriority.objects.create(season=self.season, player=player, item_type=item_type, priority=rank)
+
+        self.admin = CustomUser.objects.create_user(username='leader', password='pw', user_type='admin')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def generate(self):
+        response = self.client.post(
+            '/api/distribution-priorities/generate_distribution_plan/',
+            {'season': self.season.id, 'weeks': 12}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_generated_plan_is_persisted(self):
+        generated = self.generate()
+        expected = DistributionService.generate_weekly_distribution_plan(self.season.id, 12)
+
+        self.assertEqual(len(generated['weekly_plan']), 12)
+        self.assertEqual(
+            generated['weekly_plan'][0]['floors']['4'],
+            expected['weekly_plan'][0]['floors'][4]
+        )
+
+        response = self.client.get('/api/distribution-priorities/distribution_plan/', {'season': self.season.id})
+        self.assertEqual(response.json()['weekly_plan'], generated['weekly_plan'])
+
+    def test_invalid_weeks_are_rejected(self):
+        for weeks in ('abc', None, 0, 53):
+            response = self.client.post(
+                '/api/distribution-priorities/generate_distribution_plan/',
+                {'season': self.season.id, 'weeks': weeks}, format='json'
+            )
+
+            self.assertEqual(response.status_code, 400, weeks)
+            self.assertIn('주차 수', response.json()['error'])
+        self.assertFalse(DistributionPlan.objects.filter(season=self.season).exists())
+
+    def test_numeric_string_weeks_are_accepted(self):
+        response = self.client.post(
+            '/api/distribution-priorities/generate_distribution_plan/',
+            {'season': self.season.id, 'weeks': '8'}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['weekly_plan']), 8)
+
+    def test_plan_read_uses_fixed_number_of_queries(self):
+        self.generate()
+
+        with self.assertNumQueries(4):
+            plan = DistributionPlanService.get_plan(self.season.id)
+            DistributionPlanService.to_dict(plan)
+
+    def test_manual_update_touches_only_one_floor(self):
+        self.generate()
+        untouched = set(DistributionPlanAssignment.objects.values_list('id', flat=True))
+
+        response = self.client.post('/api/distribution-priorities/update_distribution_plan/', {
+            'season': self.season.id,
+            'week': 9,
+            'floor': 4,
+            'plan_data': [{
+                'item_type': '무기', 'player_id': self.players[2].id,
+                'player_name': self.players[2].nickname, 'original_priority': 0, 'manual': True
+            }]
+        }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        week_nine = response.json()['updated_plan']['weekly_plan'][8]
+        self.assertTrue(week_nine['manual_input'])
+        self.assertEqual(week_nine['floors']['4'][0]['player_id'], self.players[2].id)
+        self.assertEqual(
+            set(DistributionPlanAssignment.objects.values_list('id', flat=True)) - untouched,
+            set(DistributionPlanAssignment.objects.filter(floor__week__week=9).values_list('id', flat=True))
+        )
+
+        # 다시 생성해도 9주차 이후 수동 입력은 유지
+        regenerated = self.generate()
+        self.assertEqual(regenerated['weekly_plan'][8]['floors']['4'][0]['player_id'], self.players[2].id)
+        self.assertEqual(DistributionPlan.objects.count(), 1)
+
+    def test_weeks_up_to_eight_cannot_be_edited(self):
+        response = self.client.post('/api/distribution-priorities/update_distribution_plan/', {
+            'season': self.season.id, 'week': 3, 'floor': 1, 'plan_data': []
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class WeeklyPlanMemoizationTests(TestCase):
+    def setUp(self):
+        caches['plans'].clear()
+        self.season = Season.objects.create(name='캐시 시즌', start_date='2025-01-21')
+        self.players = [Player.objects.create(nickname=f'캐시{i}', job='전사') for i in range(8)]
+        for item_type in SLOTS:
+            for rank, player in enumerate(self.players, 1):
+                DistributionPriority.objects.create(season=self.season, player=player, item_type=item_type, priority=rank)
+
+    def test_repeated_request_is_served_from_cache(self):
+        first = DistributionService.generate_weekly_distribution_plan(self.season.id, 12)
+
+        # 시즌 조회 + 우선순위 조회만 발생
+        with self.assertNumQueries(2):
+            second = DistributionService.generate_weekly_distribution_plan(self.season.id, 12)
+
+        self.assertEqual(first, second)
+
+    def test_parameters_and_priority_changes_miss_the_cache(self):
+        first = DistributionService.generate_weekly_distribution_plan(self.season.id, 12)
+        optimal = DistributionService.generate_weekly_distribution_plan(self.season.id, 12, 'optimal')
+        self.assertNotEqual(first['plan_key'], optimal['plan_key'])
+
+        DistributionPriority.objects.filter(season=self.season, item_type='무기', priority=1).update(priority=9)
+        changed = DistributionService.generate_weekly_distribution_plan(self.season.id, 12)
+
+        self.assertNotEqual(first['plan_key'], changed['plan_key'])
+
+
+class LootSimulationTests(SeasonFixtureMixin, TestCase):
+    def setUp(self):
+        self.season, self.items = self.create_season()
+
+    def test_tomestone_only_set_completes_on_fixed_week(self):
+        crafted = self.create_player(self.season, self.items, 0, final_sources={slot: '제작템' for slot in SLOTS})
+        tome = self.create_player(self.season, self.items, 1, final_sources={slot: '석판템' for slot in SLOTS})
+
+        result = LootSimulationService.simulate_season(self.season.id, trials=20, seed=1, workers=1)
+
+        self.assertTrue(result['success'])
+        players = {player['player_id']: player for player in result['players']}
+        self.assertEqual(players[crafted.id]['week_distribution'], {0: 20})
+        # 석판 총 5510개를 주간 450개씩 모으면 13주차에 완료
+        self.assertEqual(players[tome.id]['week_distribution'], {13: 20})
+        self.assertEqual(result['static']['median_week'], 13)
+
+    def test_results_do_not_depend_on_worker_count(self):
+        for index in range(4):
+            self.create_player(self.season, self.items, index)
+
+        single = LootSimulationService.simulate_season(self.season.id, trials=600, policy='random', seed=7, workers=1)
+        pooled = LootSimulationService.simulate_season(self.season.id, trials=600, policy='random', seed=7, workers=2)
+
+        self.assertEqual(single, pooled)
+        self.assertEqual(sum(single['players'][0]['week_distribution'].values()) + single['players'][0]['incomplete'], 600)
+
+    def test_requests_share_one_spawned_pool(self):
+        for index in range(2):
+            self.create_player(self.season, self.items, index)
+
+        with patch.object(loot_simulation_service, '_pool', None), \
+                patch.object(loot_simulation_service, 'ProcessPoolExecutor', wraps=ProcessPoolExecutor) as pool_class:
+            for _ in range(2):
+                result = LootSimulationService.simulate_season(self.season.id, trials=1000, seed=5, workers=2)
+                self.assertTrue(result['success'])
+            loot_simulation_service._pool.shutdown()
+
+        # 요청마다 풀을 만들지 않고, 요청 스레드에서 fork하지 않음
+        self.assertEqual(pool_class.call_count, 1)
+        self.assertEqual(pool_class.call_args.kwargs['mp_context'].get_start_method(), 'spawn')
+
+    def test_priority_policy_favors_top_ranked_player(self):
+        raid_sources = {slot: '영웅레이드템' for slot in SLOTS}
+        first = self.create_player(self.season, self.items, 0, final_sources=raid_sources)
+        second = self.create_player(self.season, self.items, 1, final_sources=raid_sources)
+        for item_type in SLOTS + ['반지']:
+            DistributionPriority.objects.create(season=self.season, player=second, item_type=item_type, priority=1)
+            DistributionPriority.objects.create(season=self.season, player=first, item_type=item_type, priority=2)
+
+        result = LootSimulationService.simulate_season(self.season.id, trials=200, seed=3, workers=1)
+
+        players = {player['player_id']: player for player in result['players']}
+        self.assertLess(players[second.id]['mean_week'], players[first.id]['mean_week'])
+
+    def test_invalid_policy_is_rejected(self):
+        client = APIClient()
+        client.force_authenticate(CustomUser.objects.create_user(username='sim', password='pw', user_type='admin'))
+
+        response = client.post(
+            '/api/distribution-priorities/simulate/',
+            {'season': self.season.id, 'policy': 'loot-council'}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+
+# 즉시 실행하는 작업의 쿼리는 요청 쿼리 예산에 포함하지 않음
+@override_settings(BACKGROUND_JOBS_EAGER=True, QUERY_BUDGET_ENABLED=False)
+class BackgroundJobTests(SeasonFixtureMixin, TestCase):
+    def setUp(self):
+        self.season, self.items = self.create_season()
+        self.players = [self.create_player(self.season, self.items, index) for index in range(3)]
+        self.client = APIClient()
+        self.client.force_authenticate(CustomUser.objects.create_user(username='jobs', password='pw', user_type='admin'))
+
+    def test_async_calculate_returns_job_with_progress_and_result(self):
+        response = self.client.post(
+            '/api/distribution-priorities/calculate/?async=1', {'season': self.season.id}, format='json'
+        )
+        self.assertEqual(response.status_code, 202)
+
+        job = self.client.get(f"/api/jobs/{response.json()['job_id']}/").json()
+        self.assertEqual(job['status'], 'succeeded')
+        self.assertEqual((job['progress'], job['total']), (3, 3))
+        self.assertEqual(job['result']['player_count'], 3)
+        self.assertTrue(DistributionPriority.objects.filter(season=self.season).exists())
+
+    def test_async_plan_generation_persists_plan(self):
+        response = self.client.post(
+            '/api/distribution-priorities/generate_distribution_plan/?async=1',
+            {'season': self.season.id, 'weeks': '12'}, format='json'
+        )
+        self.assertEqual(response.status_code, 202)
+
+        job = BackgroundJob.objects.get(pk=response.json()['job_id'])
+        self.assertEqual(job.status, 'succeeded')
+        self.assertEqual(len(job.result['weekly_plan']), 12)
+        self.assertEqual(job.params['weeks'], 12)
+        self.assertTrue(DistributionPlan.objects.filter(season=self.season).exists())
+
+    def test_async_simulation_records_result(self):
+        response = self.client.post(
+            '/api/distribution-priorities/simulate/?async=1',
+            {'season': self.season.id, 'trials': 20, 'seed': 1}, format='json'
+        )
+        self.assertEqual(response.status_code, 202)
+
+        job = BackgroundJob.objects.get(pk=response.json()['job_id'])
+        self.assertEqual(job.job_type, 'simulate_loot')
+        self.assertEqual(job.status, 'succeeded')
+        # JSON 저장으로 주차 키는 문자열이 됨
+        expected = LootSimulationService.simulate_season(self.season.id, trials=20, seed=1, workers=1)
+        self.assertEqual(job.result, json.loads(json.dumps(expected)))
+
+    def test_failed_calculation_is_recorded(self):
+        self.season.distribution_method = '먹고빠지기'
+        self.season.save()
+
+        response = self.client.post(
+            '/api/distribution-priorities/calculate/?async=1', {'season': self.season.id}, format='json'
+        )
+
+        job = BackgroundJob.objects.get(pk=response.json()['job_id'])
+        self.assertEqual(job.status, 'failed')
+        self.assertIn('우선순위분배', job.error)
+
+    @override_settings(BACKGROUND_JOBS_EAGER=False)
+    def test_job_is_dispatched_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(
+                '/api/distribution-priorities/calculate/?async=1', {'season': self.season.id}, format='json'
+            )
+
+        self.assertEqual(response.json()['status'], 'pending')
+        self.assertEqual(len(callbacks), 1)
+
+
+class SingleFlightTests(SeasonFixtureMixin, TestCase):
+    def setUp(self):
+        self.season, self.items = self.create_season()
+        self.players = [self.create_player(self.season, self.items, index) for index in range(3)]
+        self.key = JobService.dedupe_key('calculate_priority', self.season.id, {'incremental': False})
+
+    def calculate(self):
+        return JobService.run_single_flight('calculate_priority', self.season.id, {'incremental': False})
+
+    def test_burst_reuses_recent_result(self):
+        first = self.calculate()
+        second = self.calculate()
+
+        self.assertTrue(first['success'])
+        self.assertEqual(first, second)
+        self.assertEqual(BackgroundJob.objects.filter(dedupe_key=self.key).count(), 1)
+
+    def test_bis_change_skips_recent_result(self):
+        self.calculate()
+        bis_item = BisItem.objects.filter(bis_set__player=self.players[0], bis_set__bis_type='최종', slot='무기').get()
+        bis_item.item = self.items[('무기', '제작템')]
+        bis_item.save()
+
+        self.calculate()
+
+        self.assertEqual(BackgroundJob.objects.filter(dedupe_key=self.key).count(), 2)
+
+    @override_settings(SINGLE_FLIGHT_WAIT_TIMEOUT=0.2, SINGLE_FLIGHT_POLL_INTERVAL=0.05)
+    def test_inflight_calculation_is_awaited_not_repeated(self):
+        BackgroundJob.objects.create(
+            job_type='calculate_priority', season=self.season, status='running', dedupe_key=self.key
+        )
+
+        result = self.calculate()
+
+        self.assertFalse(result['success'])
+        self.assertEqual(BackgroundJob.objects.filter(dedupe_key=self.key).count(), 1)
+        self.assertFalse(DistributionPriority.objects.filter(season=self.season).exists())
+
+    def test_abandoned_inflight_job_is_taken_over(self):
+        abandoned = BackgroundJob.objects.create(
+            job_type='calculate_priority', season=self.season, status='running', dedupe_key=self.key
+        )
+        BackgroundJob.objects.filter(pk=abandoned.pk).update(created_at=timezone.now() - timedelta(hours=1))
+
+        result = self.calculate()
+
+        self.assertTrue(result['success'])
+        abandoned.refresh_from_db()
+        self.assertEqual(abandoned.status, 'failed')
+
+    def test_async_submissions_share_one_job(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            first = JobService.submit('calculate_priority', self.season.id, {'incremental': False})
+            second = JobService.submit('calculate_priority', str(self.season.id), {'incremental': False})
+
+        self.assertEqual(first.id, second.id)
+        self.assertEqual(len(callbacks), 1)
+
+    def test_full_and_incremental_runs_share_season_guard(self):
+        client = APIClient()
+        client.force_authenticate(CustomUser.objects.create_user(username='guard', password='pw', user_type='admin'))
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            for incremental in ('false', True, '1'):
+                response = client.post(
+                    '/api/distribution-priorities/calculate/?async=1',
+                    {'season': self.season.id, 'incremental': incremental}, format='json'
+                )
+                self.assertEqual(response.status_code, 202)
+
+        # 전체 계산이 시즌 키를 선점하고, 파라미터가 다른 증분 계산은 하나의 대기 작업으로 합쳐짐
+        job = BackgroundJob.objects.get(dedupe_key=self.key)
+        self.assertEqual(job.params, {'incremental': False})
+        queued = BackgroundJob.objects.get(dedupe_key__isnull=True)
+        self.assertEqual((queued.params, queued.status), ({'incremental': True}, 'pending'))
+        self.assertEqual(len(callbacks), 2)
+
+    def test_recent_result_is_not_shared_across_params(self):
+        BackgroundJob.objects.create(
+            job_type='calculate_priority', season=self.season, params={'incremental': True}, status='succeeded',
+            dedupe_key=self.key, result={'success': True, 'incremental': True}, finished_at=timezone.now()
+        )
+
+        result = self.calculate()
+
+        self.assertTrue(result['success'])
+        self.assertFalse(result['incremental'])
+        self.assertTrue(DistributionPriority.objects.filter(season=self.season).exists())
+
+    @override_settings(SINGLE_FLIGHT_WAIT_TIMEOUT=0.2, SINGLE_FLIGHT_POLL_INTERVAL=0.05)
+    def test_full_run_waits_behind_incremental_run_instead_of_sharing(self):
+        inflight = BackgroundJob.objects.create(
+            job_type='calculate_priority', season=self.season, params={'incremental': True},
+            status='running', dedupe_key=self.key
+        )
+
+        # 증분 계산이 끝나지 않으면 그 결과를 받지 않고 시간 초과
+        self.assertFalse(self.calculate()['success'])
+        with self.captureOnCommitCallbacks():
+            queued = JobService.submit('calculate_priority', self.season.id, {'incremental': False})
+        self.assertIsNone(queued.dedupe_key)
+
+        # 증분 계산이 끝나면 대기 작업이 시즌 키를 선점해서 직접 실행
+        BackgroundJob.objects.filter(pk=inflight.pk).update(status='succeeded', finished_at=timezone.now())
+        JobService._execute(queued.id, self.key)
+
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.dedupe_key), ('succeeded', self.key))
+        self.assertEqual(queued.result['player_count'], 3)
+
+    @override_settings(SINGLE_FLIGHT_WAIT_TIMEOUT=0.2, SINGLE_FLIGHT_POLL_INTERVAL=0.05)
+    def test_plan_without_priorities_calculates_under_season_guard(self):
+        running = BackgroundJob.objects.create(
+            job_type='calculate_priority', season=self.season, params={'incremental': False},
+            status='running', dedupe_key=self.key
+        )
+
+        # 진행 중인 계산과 동시에 우선순위를 쓰지 않고 그 결과를 기다림
+        self.assertFalse(DistributionService.generate_weekly_distribution_plan(self.season.id)['success'])
+        self.assertFalse(DistributionPriority.objects.filter(season=self.season).exists())
+
+        BackgroundJob.objects.filter(pk=running.pk).update(status='failed', finished_at=timezone.now())
+        self.assertTrue(DistributionService.generate_weekly_distribution_plan(self.season.id)['success'])
+        self.assertEqual(BackgroundJob.objects.filter(dedupe_key=self.key, status='succeeded').count(), 1)
+
+    def test_submit_never_creates_unguarded_duplicate(self):
+        with patch.object(JobService, '_claim', return_value=None):
+            with self.assertRaises(JobSubmitError):
+                JobService.submit('calculate_priority', self.season.id, {'incremental': False})
+
+        self.assertFalse(BackgroundJob.objects.exists())
+
+
+class BenchmarkTests(TestCase):
+    def bis_layout(self, season):
+        """ID와 무관한 (플레이어 순번, 비스 종류, 슬롯, 출처) 목록"""
+        return [
+            (nickname.rsplit('_', 1)[1], bis_type, slot, source)
+            for nickname, bis_type, slot, source in BisItem.objects.filter(bis_set__season=season).order_by(
+                'bis_set__player_id', 'bis_set__bis_type', 'slot'
+            ).values_list('bis_set__player__nickname', 'bis_set__bis_type', 'slot', 'item__source')
+        ]
+
+    def test_generator_is_deterministic_per_seed(self):
+        first = generate_season(10, seed=3)
+        second = generate_season(10, seed=3)
+        other = generate_season(10, seed=4)
+
+        self.assertEqual(Player.objects.filter(bis_sets__season=first).distinct().count(), 10)
+        self.assertEqual(len(self.bis_layout(first)), 10 * 2 * len(SLOTS))
+        self.assertEqual(self.bis_layout(first), self.bis_layout(second))
+        self.assertNotEqual(self.bis_layout(first), self.bis_layout(other))
+
+    def test_benchmark_writes_baseline_and_checks_regressions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            call_command('benchmark_services', players='8', baseline=path, write_baseline=True, stdout=open(os.devnull, 'w'))
+
+            with open(path, encoding='utf-8') as baseline_file:
+                baseline = json.load(baseline_file)
+            steps = baseline['sizes']['8']
+            self.assertEqual(set(steps), {'generate', 'priority', 'weekly_plan', 'resources'})
+            self.assertGreater(steps['priority']['queries'], 0)
+            self.assertGreater(steps['priority']['peak_kib'], 0)
+            # 생성한 데이터는 모두 롤백
+            self.assertFalse(Season.objects.exists())
+
+            call_command('benchmark_services', players='8', baseline=path, check=True, tolerance=100, stdout=open(os.devnull, 'w'))
+
+            steps['priority']['queries'] = 1
+            with open(path, 'w', encoding='utf-8') as baseline_file:
+                json.dump(baseline, baseline_file)
+            with self.assertRaisesRegex(CommandError, '8명 priority 쿼리'):
+                call_command('benchmark_services', players='8', baseline=path, check=True, tolerance=100, stdout=open(os.devnull, 'w'))
@@ -0,0 +1,137 @@
+"""요청/작업 단위 구조화 추적
+
+이름 있는 구간(span)과 이벤트(event)에 필드를 붙여 기록하고, 추적이 끝나면 JSON 한 줄로 로그에 남긴다.
+- 추적 중이 아니면 span/event는 스레드 로컬 값 하나만 확인하고 돌아간다. (문자열 포맷팅, 로그 레코드 생성 없음)
+- 추적은 TracingMiddleware(요청)와 JobService(백그라운드 작업)가 TRACING_SAMPLE_RATE 비율로 시작한다.
+- 필드 값은 출력할 때 한 번만 변환되므로 호출하는 쪽에서 미리 문자열로 만들지 않는다.
+  필드 계산 자체가 비싸면 active()로 먼저 확인한다.
+
+    with tracing.span('priority.calculate', season_id=season.id) as span:
+        ...
+        span.set(players=len(players))
+    tracing.event('bis_item.save', id=self.id, slot=self.slot)
+"""
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+import logging
+logger = logging.getLogger(__name__)
+
+# 추적 하나에 기록하는 최대 항목 수 (넘친 항목은 개수만 기록)
+MAX_RECORDS = 2000
+
+_local = threading.local()
+
+class _NoopSpan:
+    """추적 중이 아닐 때 span이 돌려주는 공유 객체"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **fields):
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+class Trace:
+    """추적 하나의 기록 (시각은 추적 시작 기준 ms)"""
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+        self.started = time.perf_counter()
+        self.records = []
+        self.dropped = 0
+        self.depth = 0
+
+    def elapsed_ms(self, now=None):
+        return round(((now or time.perf_counter()) - self.started) * 1000, 3)
+
+    def add(self, record):
+        if len(self.records) < MAX_RECORDS:
+            self.records.append(record)
+        else:
+            self.dropped += 1
+
+    def to_dict(self):
+        data = {'trace': self.name, 'duration_ms': self.elapsed_ms(), **self.fields, 'records': self.records}
+        if self.dropped:
+            data['dropped'] = self.dropped
+        return data
+
+class _Span:
+    __slots__ = ('trace', 'record', 'started')
+
+    def __init__(self, trace, name, fields):
+        self.trace = trace
+        self.record = {'span': name, **fields}
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        self.record['at_ms'] = self.trace.elapsed_ms(self.started)
+        self.record['depth'] = self.trace.depth
+        self.trace.add(self.record)
+        self.trace.depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.trace.depth -= 1
+        self.record['duration_ms'] = round((time.perf_counter() - self.started) * 1000, 3)
+        if exc_type is not None:
+            self.record['error'] = exc_type.__name__
+        return False
+
+    def set(self, **fields):
+        """구간이 끝나기 전에 알게 된 필드 추가"""
+        self.record.update(fields)
+
+def active():
+    """현재 스레드가 추적 중인지 여부"""
+    return getattr(_local, 'trace', None) is not None
+
+def span(name, **fields):
+    """with 블록을 이름 있는 구간으로 기록 (추적 중이 아니면 아무것도 하지 않음)"""
+    trace = getattr(_local, 'trace', None)
+    if trace is None:
+        return _NOOP_SPAN
+    return _Span(trace, name, fields)
+
+def event(name, **fields):
+    """현재 시각의 이벤트 기록 (추적 중이 아니면 아무것도 하지 않음)"""
+    trace = getattr(_local, 'trace', None)
+    if trace is None:
+        return
+    trace.add({'event': name, 'at_ms': trace.elapsed_ms(), 'depth': trace.depth, **fields})
+
+def should_sample():
+    """TRACING_SAMPLE_RATE(0~1) 비율로 새 추적을 시작할지 결정 (0이면 항상 False)"""
+    rate = getattr(settings, 'TRACING_SAMPLE_RATE', 0)
+    return rate > 0 and (rate >= 1 or random.random() < rate)
+
+@contextmanager
+def trace(name, **fields):
+    """블록 안의 구간/이벤트를 모아 끝날 때 JSON 한 줄로 로그 출력
+
+    이미 추적 중이면(예: 요청 안에서 바로 실행한 작업) 새 추적 대신 현재 추적의 구간으로 기록한다.
+    """
+    if active():
+        with span(name, **fields):
+            yield _local.trace
+        return
+
+    current = Trace(name, fields)
+    _local.trace = current
+    try:
+        yield current
+    finally:
+        _local.trace = None
+        logger.info(json.dumps(current.to_dict(), ensure_ascii=False, default=str))
@@ -5,4 +5,6 @@ from .bis_views import BisSetViewSet, BisItemViewSet
 from .raid_views import RaidProgressViewSet, ItemAcquisitionViewSet, DistributionPriorityViewSet
 from .resource_views import ResourceTrackingViewSet
 from .auth_views import RegisterView, UserDetailView, LogoutView, UserProfileUpdateView
-from .schedule_views import ScheduleViewSet
\ No newline at end of file
+from .schedule_views import ScheduleViewSet
+from .job_views import BackgroundJobViewSet
+from .metrics_views import MetricsView
\ No newline at end of file
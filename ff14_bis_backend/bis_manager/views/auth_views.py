@@ -8,6 +8,7 @@ from django.contrib.auth import get_user_model
 from rest_framework.decorators import action
 
 from bis_manager.serializers import UserSerializer, RegisterSerializer, UserProfileUpdateSerializer
+from bis_manager import tracing
 
 import logging
 logger = logging.getLogger(__name__)
@@ -36,9 +37,8 @@ class UserProfileUpdateView(generics.UpdateAPIView):
         return self.request.user
     
     def update(self, request, *args, **kwargs):
-        # 요청 데이터 로깅
-        logger.info(f"Update profile request data: {request.data}")
-        print(f"Update profile request data: {request.data}")
+        # 비밀번호 등 값은 남기지 않고 변경 요청한 필드 이름만 기록
+        tracing.event('profile.update', user_id=request.user.id, fields=sorted(request.data.keys()))
         
         partial = kwargs.pop('partial', True)
         instance = self.get_object()
@@ -52,7 +52,6 @@ class UserProfileUpdateView(generics.UpdateAPIView):
         else:
             # 유효성 검사 오류 로깅
             logger.error(f"Serializer validation errors: {serializer.errors}")
-            print(f"Serializer validation errors: {serializer.errors}")
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 class LogoutView(APIView):
@@ -7,29 +7,121 @@ from django.db import transaction
 from bis_manager.models import BisSet, BisItem, Materia, Item
 from bis_manager.serializers import BisSetSerializer, BisItemSerializer, MateriaSerializer
 from bis_manager.permissions import IsBisSetOwnerOrAdmin
+from bis_manager.views.mixins import SeasonVersionedMixin
+from bis_manager.services.bis_set_bulk_service import BisSetBulkService
+from bis_manager.services.bis_import_service import BisImportService
+from bis_manager.services.bis_set_read_service import BisSetReadService
+from bis_manager.services import data_version
+from bis_manager.signals import changes_handled_by_caller
+from bis_manager import tracing
+
+import json
 
 import logging
 logger = logging.getLogger(__name__)
 
-class BisSetViewSet(viewsets.ModelViewSet):
+class BisSetViewSet(SeasonVersionedMixin, viewsets.ModelViewSet):
     queryset = BisSet.objects.all()
     serializer_class = BisSetSerializer
+    # QueryBudgetMiddleware가 검사하는 액션별 최대 쿼리 수
+    query_budgets = {
+        'list': 9, 'retrieve': 7, 'create': 9, 'destroy': 7,
+        'bulk': 22, 'import_sets': 18, 'add_item': 16
+    }
     permission_classes = [IsBisSetOwnerOrAdmin]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['player', 'season', 'bis_type']
     
+    def get_queryset(self):
+        # 권한 검사와 직렬화에서 사용하는 플레이어/시즌을 함께 조회
+        return super().get_queryset().select_related('player', 'season')
+    
+    def list(self, request, *args, **kwargs):
+        """비스 세트 목록 (BisSetSerializer와 같은 형태를 values() 조회로 조립, 페이지 크기와 무관하게 고정된 쿼리 수)"""
+        return self.versioned_response(request, self.get_list_season_version(request), lambda: self._fast_list(request))
+    
+    def retrieve(self, request, *args, **kwargs):
+        """비스 세트 상세 (목록과 같은 조회 경로 사용)"""
+        return self.versioned_response(
+            request,
+            self.get_object_season_version(kwargs.get('pk')),
+            lambda: Response(BisSetReadService.to_dicts([self.get_object().id])[0])
+        )
+    
+    def _fast_list(self, request):
+        # 페이지는 ID로만 나누고 세트 내용은 한 번에 조립
+        queryset = self.filter_queryset(BisSet.objects.order_by('id')).values_list('id', flat=True)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(BisSetReadService.to_dicts(page))
+        return Response(BisSetReadService.to_dicts(queryset))
+    
+    @action(detail=True, methods=['put'])
+    def bulk(self, request, pk=None):
+        """비스 세트의 모든 슬롯과 마테리쟈를 한 번에 교체
+        
+        요청 형식: {"items": [{"slot": "무기", "item_id": 1, "materias": [{"slot_number": 1, "type": "무략"}]}]}
+        요청에 없는 슬롯은 비워지며, 변경된 비스 세트 전체를 반환한다.
+        """
+        bis_set = self.get_object()
+
+        # 권한 추가 검사 - user.nickname과 player.nickname 비교
+        if not request.user.is_staff and not request.user.user_type == 'admin':
+            if not request.user.nickname or request.user.nickname != bis_set.player.nickname:
+                return Response(
+                    {'error': '본인의 캐릭터 비스 세트만 수정할 수 있습니다. 프로필에서 닉네임을 확인해주세요.'},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+
+        result = BisSetBulkService.apply(bis_set, request.data.get('items'))
+        if not result.get('success', False):
+            return Response(
+                {'error': result.get('error'), 'errors': result.get('errors', [])},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response(BisSetSerializer(result['bis_set']).data)
+    
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_sets(self, request):
+        """장비 플래너 내보내기 JSON으로 비스 세트 가져오기
+        
+        요청 형식: {"season": 시즌 ID, "data": 내보내기 JSON} 또는 multipart의 season, file(JSON 파일)
+        dry_run=true이면 검증만 수행한다. 관리자가 아니면 본인 닉네임의 세트만 가져올 수 있다.
+        """
+        season_id = request.data.get('season')
+        if not season_id:
+            return Response({'error': '시즌 ID를 입력해주세요.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        export_file = request.FILES.get('file')
+        if export_file is not None:
+            try:
+                data = json.load(export_file)
+            except ValueError:
+                return Response({'error': 'JSON 파일을 읽을 수 없습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            data = request.data.get('data')
+        
+        allowed_players = None
+        if not request.user.is_staff and not request.user.user_type == 'admin':
+            allowed_players = [request.user.nickname] if request.user.nickname else []
+        
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true')
+        result = BisImportService.import_sets(season_id, data, dry_run=dry_run, allowed_players=allowed_players)
+        if not result.get('success', False):
+            return Response(
+                {'error': result.get('error'), 'errors': result.get('errors', [])},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response(result)
+    
     @action(detail=True, methods=['post'])
     @transaction.atomic
     def add_item(self, request, pk=None):
         """비스 세트에 아이템 추가 - 각 비스 세트는 독립적으로 처리"""
         bis_set = self.get_object()
-        logger.info(f"add_item 호출: BisSet ID={pk}, bis_type={bis_set.bis_type}")
-        
-        # 디버깅 정보 추가
-        logger.info(f"사용자: {request.user.username}, 닉네임: {request.user.nickname}")
-        logger.info(f"플레이어: {bis_set.player.nickname}, ID: {bis_set.player.id}")
-        logger.info(f"권한 검사: {request.user.nickname == bis_set.player.nickname}")
-        logger.info(f"사용자 타입: {request.user.user_type}, 관리자 여부: {request.user.is_staff}")
+        tracing.event('bis_set.add_item', bis_set_id=bis_set.id, bis_type=bis_set.bis_type, user_id=request.user.id)
         
         # 권한 추가 검사 - user.nickname과 player.nickname 비교
         if not request.user.is_staff and not request.user.user_type == 'admin':
@@ -86,7 +178,6 @@ class BisSetViewSet(viewsets.ModelViewSet):
                     existing_item.item = item
                     # 수정된 필드만 저장
                     existing_item.save(update_fields=['item'])
-                    logger.info(f"기존 아이템 업데이트: BisItem ID={existing_item.id}, Item ID={item.id}")
                     created = False
                 else:
                     # 새 아이템 생성 - 명시적으로 현재 비스 세트에만 추가
@@ -96,7 +187,6 @@ class BisSetViewSet(viewsets.ModelViewSet):
                         slot=slot
                     )
                     bis_item.save()
-                    logger.info(f"새 아이템 생성: BisSet ID={bis_set.id}, Item ID={item.id}")
                     created = True
             except Exception as e:
                 logger.error(f"아이템 추가 중 오류 발생: {str(e)}")
@@ -112,8 +202,13 @@ class BisSetViewSet(viewsets.ModelViewSet):
         })
 
 class BisItemViewSet(viewsets.ModelViewSet):
-    queryset = BisItem.objects.all()
+    queryset = BisItem.objects.select_related('item', 'bis_set').prefetch_related('materias')
     serializer_class = BisItemSerializer
+    # QueryBudgetMiddleware가 검사하는 액션별 최대 쿼리 수
+    query_budgets = {
+        'list': 6, 'retrieve': 4, 'create': 12, 'update': 12, 'partial_update': 12, 'destroy': 9,
+        'add_materia': 8, 'remove_all_materias': 9
+    }
     permission_classes = [IsBisSetOwnerOrAdmin]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['bis_set', 'slot']
@@ -160,9 +255,6 @@ class BisItemViewSet(viewsets.ModelViewSet):
         """비스 아이템의 모든 마테리쟈 제거"""
         bis_item = self.get_object()
         
-        # 로깅 추가
-        logger.info(f"remove_all_materias 호출: BisItem ID={bis_item.id}")
-        
         # 권한 체크 - 본인 캐릭터의 비스 세트인지 확인
         if not request.user.is_staff and not request.user.user_type == 'admin':
             if not request.user.nickname or request.user.nickname != bis_item.bis_set.player.nickname:
@@ -175,10 +267,13 @@ class BisItemViewSet(viewsets.ModelViewSet):
             # 트랜잭션으로 처리하여 일관성 유지
             with transaction.atomic():
                 # 해당 BisItem에 연결된 모든 마테리쟈 삭제
-                materias_count = bis_item.materias.count()
-                bis_item.materias.all().delete()
+                # 마테리쟈별 시그널 대신 시즌 데이터 버전을 한 번만 증가
+                with changes_handled_by_caller():
+                    materias_count, _ = bis_item.materias.all().delete()
+                if materias_count:
+                    data_version.bump(bis_item.bis_set.season_id)
                 
-                logger.info(f"마테리쟈 {materias_count}개 삭제 완료: BisItem ID={bis_item.id}")
+                tracing.event('bis_item.remove_all_materias', bis_item_id=bis_item.id, removed=materias_count)
                 
                 return Response({
                     'status': '성공',
@@ -8,7 +8,11 @@ from bis_manager.serializers import ItemSerializer, ItemDetailSerializer
 from bis_manager.permissions import IsAdminOrReadOnly
 
 class ItemViewSet(viewsets.ModelViewSet):
-    queryset = Item.objects.all()
+    queryset = Item.objects.select_related('season')
+    # QueryBudgetMiddleware가 검사하는 액션별 최대 쿼리 수
+    query_budgets = {
+        'list': 5, 'retrieve': 3, 'create': 4, 'update': 6, 'partial_update': 6, 'destroy': 6, 'count': 4
+    }
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['season', 'type', 'source', 'item_level']
@@ -0,0 +1,16 @@
+from rest_framework import viewsets
+from django_filters.rest_framework import DjangoFilterBackend
+
+from bis_manager.models import BackgroundJob
+from bis_manager.serializers import BackgroundJobSerializer
+from bis_manager.permissions import IsAdminOrReadOnly
+
+class BackgroundJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """백그라운드 작업 상태/결과 조회 API"""
+    queryset = BackgroundJob.objects.all()
+    serializer_class = BackgroundJobSerializer
+    # QueryBudgetMiddleware가 검사하는 액션별 최대 쿼리 수
+    query_budgets = {'list': 3, 'retrieve': 3}
+    permission_classes = [IsAdminOrReadOnly]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['season', 'job_type', 'status']
@@ -0,0 +1,12 @@
+from django.http import HttpResponse
+from rest_framework.views import APIView
+
+from bis_manager.permissions import IsAdminUser
+from bis_manager.services import request_metrics
+
+class MetricsView(APIView):
+    """뷰 액션별 요청 지연 시간 분포와 DB 사용량 (Prometheus 텍스트 형식, 관리자 전용)"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(request_metrics.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,61 @@
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from bis_manager.services import data_version
+
+class SeasonVersionedMixin:
+    """시즌 데이터 버전으로 조회 응답에 ETag/Last-Modified를 붙이는 ViewSet 믹스인
+
+    If-None-Match(또는 If-Modified-Since)가 현재 버전과 같으면 ORM 조회/직렬화 없이 304를 반환한다.
+    - 목록: season 쿼리 파라미터가 있을 때만 적용
+    - 상세: season_lookup 경로로 객체의 시즌 버전을 찾음
+    season_lookup이 None이면 객체 자체가 시즌이며, 목록(시즌 목록)에는 적용하지 않는다.
+    """
+    season_lookup = 'season'
+
+    def list(self, request, *args, **kwargs):
+        version = self.get_list_season_version(request)
+        return self.versioned_response(request, version, lambda: super(SeasonVersionedMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        version = self.get_object_season_version(kwargs.get(self.lookup_url_kwarg or self.lookup_field))
+        return self.versioned_response(request, version, lambda: super(SeasonVersionedMixin, self).retrieve(request, *args, **kwargs))
+
+    def get_list_season_version(self, request):
+        """season 쿼리 파라미터 시즌의 (시즌 ID, 데이터 버전, 변경 시각), 적용 대상이 아니면 None"""
+        season_id = request.query_params.get('season')
+        if not self.season_lookup or not season_id or not str(season_id).isdigit():
+            return None
+        found = data_version.lookup(season_id)
+        return (int(season_id),) + found if found is not None else None
+
+    def get_object_season_version(self, pk):
+        """객체의 (시즌 ID, 데이터 버전, 변경 시각), 객체가 없으면 None (쿼리 1회)"""
+        prefix = f'{self.season_lookup}__' if self.season_lookup else ''
+        try:
+            return self.queryset.model.objects.filter(pk=pk).values_list(
+                f'{prefix}id', f'{prefix}data_version', f'{prefix}data_updated_at'
+            ).first()
+        except (TypeError, ValueError):
+            return None
+
+    def versioned_response(self, request, version, build):
+        """version이 있으면 조건부 요청을 처리하고 응답에 검증 헤더 추가 (version이 None이면 build 결과 그대로)"""
+        if version is None:
+            return build()
+
+        season_id, current, updated_at = version
+        etag = data_version.etag(season_id, current)
+        last_modified = int(updated_at.timestamp()) if updated_at else None
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            return not_modified
+
+        response = build()
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
@@ -4,11 +4,16 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
 from bis_manager.models import Player, BisSet
-from bis_manager.serializers import PlayerSerializer, PlayerCreateSerializer, BisSetSerializer
+from bis_manager.serializers import PlayerSerializer, PlayerCreateSerializer
 from bis_manager.permissions import IsAdminOrReadOnly
+from bis_manager.services.bis_set_read_service import BisSetReadService
 
 class PlayerViewSet(viewsets.ModelViewSet):
     queryset = Player.objects.all()
+    # QueryBudgetMiddleware가 검사하는 액션별 최대 쿼리 수
+    query_budgets = {
+        'list': 4, 'retrieve': 3, 'create': 4, 'update': 5, 'partial_update': 5, 'destroy': 9, 'bis_sets': 7
+    }
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['job', 'job_type']
@@ -33,5 +38,5 @@ class PlayerViewSet(viewsets.ModelViewSet):
         if bis_type:
             bis_sets = bis_sets.filter(bis_type=bis_type)
         
-        serializer = BisSetSerializer(bis_sets, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        # BisSetSerializer와 같은 형태를 고정된 쿼리 수로 조립
+        return Response(BisSetReadService.to_dicts(bis_sets.order_by('id').values_list('id', flat=True)))
\ No newline at end of file
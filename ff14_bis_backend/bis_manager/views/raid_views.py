@@ -1,98 +1,196 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from django_filters.rest_framework import DjangoFilterBackend
 
 from bis_manager.models import RaidProgress, ItemAcquisition, DistributionPriority, Season
 from bis_manager.serializers import RaidProgressSerializer,ItemAcquisitionSerializer, DistributionPrioritySerializer
 from bis_manager.permissions import IsAdminOrReadOnly
+from bis_manager.views.mixins import SeasonVersionedMixin
+from bis_manager.constants import DISTRIBUTION_PLAN_MODES, LOOT_SIMULATION_POLICIES
 from bis_manager.services.distribution_service import DistributionService
+from bis_manager.services.distribution_plan_service import DistributionPlanService
+from bis_manager.services.job_service import JobService, JobSubmitError
+from bis_manager.services.loot_simulation_service import LootSimulationService, MAX_TRIALS
+from bis_manager import tracing
 
 import traceback
-from django.core.cache import cache
 
 import logging
 logger = logging.getLogger(__name__)
 
-class RaidProgressViewSet(viewsets.ModelViewSet):
-    queryset = RaidProgress.objects.all()
+class RaidProgressViewSet(SeasonVersionedMixin, viewsets.ModelViewSet):
+    queryset = RaidProgress.objects.select_related('season').prefetch_related(
+        'acquisitions__player', 'acquisitions__item'
+    )
     serializer_class = RaidProgressSerializer
+    # QueryBudgetMiddleware가 검사하는 액션별 최대 쿼리 수
+    query_budgets = {
+        'list': 9, 'retrieve': 7, 'create': 7, 'update': 7, 'partial_update': 7, 'destroy': 7
+    }
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['season', 'floor', 'raid_date']
 
 class ItemAcquisitionViewSet(viewsets.ModelViewSet):
-    queryset = ItemAcquisition.objects.all()
+    queryset = ItemAcquisition.objects.select_related('player', 'item')
     serializer_class = ItemAcquisitionSerializer
+    # QueryBudgetMiddleware가 검사하는 액션별 최대 쿼리 수
+    query_budgets = {'list': 4, 'retrieve': 3}
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['raid_progress', 'player', 'item']
 
-class DistributionPriorityViewSet(viewsets.ModelViewSet):
-    queryset = DistributionPriority.objects.all()
+class DistributionPriorityViewSet(SeasonVersionedMixin, viewsets.ModelViewSet):
+    queryset = DistributionPriority.objects.select_related('player')
     serializer_class = DistributionPrioritySerializer
+    # QueryBudgetMiddleware가 검사하는 액션별 최대 쿼리 수
+    query_budgets = {
+        'list': 5, 'retrieve': 4, 'update': 6, 'partial_update': 6,
+        'calculate': 29, 'generate_distribution_plan': 24, 'simulate': 6,
+        'distribution_plan': 6, 'update_distribution_plan': 18
+    }
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['season', 'player', 'item_type']
     
-    def list(self, request, *args, **kwargs):
-        """우선순위 목록 조회 시 로깅 추가"""
-        logger.info(f"우선순위 목록 조회 요청: {request.query_params}")
-        queryset = self.filter_queryset(self.get_queryset())
-        logger.info(f"필터링된 우선순위 개수: {queryset.count()}")
-        
-        # 페이징 관련 디버깅
-        page_size = request.query_params.get('page_size', self.paginator.page_size)
-        logger.info(f"요청된 페이지 크기: {page_size}")
-        
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            logger.info(f"반환할 우선순위 데이터 수: {len(serializer.data)}")
-            return self.get_paginated_response(serializer.data)
-
-        serializer = self.get_serializer(queryset, many=True)
-        logger.info(f"반환할 우선순위 데이터 수 (페이징 없음): {len(serializer.data)}")
-        return Response(serializer.data)
+    def _is_async(self, request):
+        """?async=1 (또는 요청 본문의 async) 지정 여부"""
+        value = request.query_params.get('async', request.data.get('async', False))
+        return str(value).lower() in ('1', 'true')
+    
+    def _submit_job(self, request, job_type, season_id, params):
+        """백그라운드 작업 등록 후 202 응답 반환"""
+        if not Season.objects.filter(pk=season_id).exists():
+            return Response({'error': '존재하지 않는 시즌입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            job = JobService.submit(job_type, season_id, params, request.user)
+        except JobSubmitError as e:
+            return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        
+        return Response({
+            'success': True,
+            'job_id': str(job.id),
+            'status': job.status,
+            'status_url': reverse('backgroundjob-detail', args=[job.id], request=request)
+        }, status=status.HTTP_202_ACCEPTED)
     
     @action(detail=False, methods=['post'])
     def calculate(self, request):
         """우선순위 분배 계산 API"""
         season_id = request.data.get('season')
         handle_rings = request.data.get('handle_rings', True) # 반지 특별 처리 여부
+        incremental = str(request.data.get('incremental', False)).lower() in ('1', 'true') # 변경된 아이템 타입만 다시 계산
         
         if not season_id:
             return Response({'error': '시즌 ID를 입력해주세요.'}, status=status.HTTP_400_BAD_REQUEST)
         
-        logger.info(f"우선순위 계산 요청: season_id={season_id}, handle_rings={handle_rings}")
+        tracing.event('priority.request', season_id=season_id, handle_rings=handle_rings, incremental=incremental)
+        
+        # 비동기 모드: 작업 ID를 바로 반환하고 백그라운드에서 계산
+        if self._is_async(request):
+            return self._submit_job(request, 'calculate_priority', season_id, {'incremental': incremental})
         
-        # 분배 서비스 호출
-        result = DistributionService.calculate_priority_for_season(season_id)
+        # 분배 서비스 호출 (같은 시즌 계산이 진행 중이면 새로 계산하지 않고 그 결과를 공유)
+        result = JobService.run_single_flight('calculate_priority', season_id, {'incremental': incremental}, request.user)
         
         if not result.get('success', False):
             logger.error(f"우선순위 계산 실패: {result.get('error', '알 수 없는 오류')}")
             return Response({'error': result.get('error', '알 수 없는 오류가 발생했습니다.')}, status=status.HTTP_400_BAD_REQUEST)
         
-        logger.info(f"우선순위 계산 성공: {result.get('created_count', 0)}개 생성됨, 플레이어 수: {result.get('player_count', 0)}")
         return Response(result)
     
     @action(detail=False, methods=['post'])
     def generate_distribution_plan(self, request):
         """주간 분배 계획 생성 API"""
         season_id = request.data.get('season')
-        weeks = request.data.get('weeks', 12) # 기본값 12주
+        mode = request.data.get('mode', 'greedy') # greedy: 균등 분배, optimal: 최적 배정
         
         if not season_id:
             return Response({'error': '시즌 ID를 입력해주세요.'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # 분배 서비스 호출
-        result = DistributionService.generate_weekly_distribution_plan(season_id, weeks)
+        # 동기/비동기 모두 같은 정수 주차로 계산 (기본값 12주)
+        try:
+            weeks = int(request.data.get('weeks', 12))
+        except (TypeError, ValueError):
+            return Response({'error': '주차 수는 정수여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if not 1 <= weeks <= 52:
+            return Response({'error': '주차 수는 1~52 사이여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if mode not in dict(DISTRIBUTION_PLAN_MODES):
+            return Response({'error': '지원하지 않는 분배 방식입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # 비동기 모드: 작업 ID를 바로 반환하고 백그라운드에서 계산
+        if self._is_async(request):
+            return self._submit_job(request, 'generate_distribution_plan', season_id, {'weeks': weeks, 'mode': mode})
+        
+        # 분배 계획 생성 및 저장
+        result = DistributionPlanService.generate_and_save(season_id, weeks, mode)
         
         if not result.get('success', False):
             return Response({'error': result.get('error', '알 수 없는 오류가 발생했습니다.')}, status=status.HTTP_400_BAD_REQUEST)
         
         return Response(result)
     
+    @action(detail=False, methods=['post'])
+    def simulate(self, request):
+        """루팅 시뮬레이션 API (분배 정책별 비스 완료 주차 분포 예측)"""
+        season_id = request.data.get('season')
+        policy = request.data.get('policy', 'priority')
+        seed = request.data.get('seed')
+        
+        if not season_id:
+            return Response({'error': '시즌 ID를 입력해주세요.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if policy not in dict(LOOT_SIMULATION_POLICIES):
+            return Response({'error': '지원하지 않는 분배 정책입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            trials = int(request.data.get('trials', 1000))
+            max_weeks = int(request.data.get('max_weeks', 24))
+            seed = int(seed) if seed is not None else None
+        except (TypeError, ValueError):
+            return Response({'error': '시행 횟수, 최대 주차, 시드는 정수여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if not 1 <= trials <= MAX_TRIALS or not 1 <= max_weeks <= 52:
+            return Response({
+                'error': f'시행 횟수는 1~{MAX_TRIALS}, 최대 주차는 1~52 사이여야 합니다.'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        # 시행 횟수가 많으면 async=1로 요청 스레드 밖에서 실행
+        if self._is_async(request):
+            return self._submit_job(request, 'simulate_loot', season_id, {
+                'trials': trials, 'policy': policy, 'max_weeks': max_weeks, 'seed': seed
+            })
+        
+        result = LootSimulationService.simulate_season(season_id, trials, policy, max_weeks, seed)
+        
+        if not result.get('success', False):
+            return Response({'error': result.get('error', '알 수 없는 오류가 발생했습니다.')}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(result)
+    
+    @action(detail=False, methods=['get'])
+    def distribution_plan(self, request):
+        """저장된 주간 분배 계획 조회 API"""
+        season_id = request.query_params.get('season')
+        
+        if not season_id:
+            return Response({'error': '시즌 ID를 입력해주세요.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        plan = DistributionPlanService.get_plan(season_id)
+        
+        if plan is None:
+            return Response({
+                'success': False,
+                'error': '저장된 분배 계획이 없습니다.'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        return Response(DistributionPlanService.to_dict(plan))
+    
     @action(detail=False, methods=['post'])
     def update_distribution_plan(self, request):
         """주간 분배 계획 수동 업데이트 API (9주차 이후)"""
@@ -101,8 +199,6 @@ class DistributionPriorityViewSet(viewsets.ModelViewSet):
         floor = request.data.get('floor')
         plan_data = request.data.get('plan_data', [])
         
-        logger.info(f"분배 계획 수동 업데이트: season_id={season_id}, week={week}, floor={floor}")
-        
         if not season_id or not week or not floor:
             return Response({
                 'success': False,
@@ -116,46 +212,38 @@ class DistributionPriorityViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            logger.info(f"수동 분배 계획 데이터: {plan_data}")
+            tracing.event(
+                'weekly_plan.manual_update', season_id=season_id, week=week, floor=floor,
+                assignments=len(plan_data) if isinstance(plan_data, list) else None
+            )
             
             # 이 시즌에 대한 기존 분배 계획 조회 또는 새로 생성
             season = Season.objects.get(pk=season_id)
             
-            # 새 계획 생성 및 캐시에 저장
-            cache_key = f"distribution_plan_{season_id}"
-            distribution_plan = cache.get(cache_key)
+            plan = DistributionPlanService.get_plan(season.id)
             
-            if not distribution_plan:
-                # 새로 계획 생성
-                result = DistributionService.generate_weekly_distribution_plan(season_id, 12)
+            if plan is None:
+                # 새로 계획 생성 후 저장
+                result = DistributionService.generate_weekly_distribution_plan(season.id, 12)
                 if not result.get('success', False):
                     return Response(result, status=status.HTTP_400_BAD_REQUEST)
                 
-                distribution_plan = result
+                plan = DistributionPlanService.save_plan(season.id, result)
             
-            # 해당 주차, 층의 계획 업데이트
-            updated = False
-            for week_plan in distribution_plan['weekly_plan']:
-                if week_plan['week'] == int(week):
-                    week_plan['floors'][str(floor)] = plan_data
-                    week_plan['manual_input'] = True
-                    updated = True
-                    break
+            # 해당 주차, 층의 계획만 업데이트
+            plan = DistributionPlanService.update_floor(plan, int(week), int(floor), plan_data)
             
-            if not updated:
+            if plan is None:
                 return Response({
                     'success': False,
                     'error': f'{week}주차 분배 계획을 찾을 수 없습니다.'
                 }, status=status.HTTP_404_NOT_FOUND)
             
-            # 캐시에 업데이트된 계획 저장
-            cache.set(cache_key, distribution_plan, 60*60*24) # 24시간 캐시
-            
             # 업데이트 된 계획 반환
             return Response({
                 'success': True,
                 'message': f'{week}주차 {floor}층 분배 계획이 업데이트되었습니다.',
-                'updated_plan': distribution_plan
+                'updated_plan': DistributionPlanService.to_dict(plan)
             })
             
         except Season.DoesNotExist:
@@ -3,50 +3,117 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db.models import Count, Sum
 
 from bis_manager.models import ResourceTracking, Player, Season
 from bis_manager.serializers import ResourceTrackingSerializer
 from bis_manager.permissions import IsAdminOrReadOnly
+from bis_manager.views.mixins import SeasonVersionedMixin
+from bis_manager.constants import RESOURCE_TYPES, JOB_TYPES
 from bis_manager.services.resource_calculation_service import ResourceCalculationService
 
 import logging
 logger = logging.getLogger(__name__)
 
-class ResourceTrackingViewSet(viewsets.ModelViewSet):
-    queryset = ResourceTracking.objects.all()
+class ResourceTrackingViewSet(SeasonVersionedMixin, viewsets.ModelViewSet):
+    queryset = ResourceTracking.objects.select_related('player')
     serializer_class = ResourceTrackingSerializer
+    # QueryBudgetMiddleware가 검사하는 액션별 최대 쿼리 수
+    query_budgets = {
+        'list': 6, 'retrieve': 4, 'update': 6, 'partial_update': 6, 'summary': 3, 'calculate_needs': 12
+    }
     permission_classes = [IsAdminOrReadOnly]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['player', 'season', 'resource_type']
     
-    def list(self, request, *args, **kwargs):
-        """리소스 목록 조회 시 로깅 추가"""
-        logger.info(f"자원 목록 조회: 쿼리 파라미터={request.query_params}")
-        print(f"[DEBUG] 자원 목록 조회: 쿼리 파라미터={request.query_params}")
-        return super().list(request, *args, **kwargs)
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        """공대 전체 재화 합계 (재화 종류별 GROUP BY 한 번, season/job_type으로 필터링)"""
+        season_id = request.query_params.get('season')
+        job_type = request.query_params.get('job_type')
+        
+        if job_type and job_type not in dict(JOB_TYPES):
+            return Response({'error': '존재하지 않는 직업 타입입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        queryset = ResourceTracking.objects.all()
+        if season_id:
+            if not str(season_id).isdigit():
+                return Response({'error': '시즌 ID는 숫자여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = queryset.filter(season_id=season_id)
+        if job_type:
+            queryset = queryset.filter(player__job_type=job_type)
+        
+        rows = queryset.values('resource_type').annotate(
+            total_needed=Sum('total_needed'),
+            current_amount=Sum('current_amount'),
+            player_count=Count('player_id', distinct=True)
+        ).order_by()
+        
+        # 재화 종류 정의 순서로 정렬
+        resource_order = {resource_type: index for index, (resource_type, _) in enumerate(RESOURCE_TYPES)}
+        resource_names = dict(RESOURCE_TYPES)
+        resources = []
+        for row in sorted(rows, key=lambda row: resource_order.get(row['resource_type'], len(resource_order))):
+            total_needed = row['total_needed'] or 0
+            current_amount = row['current_amount'] or 0
+            resources.append({
+                'resource_type': row['resource_type'],
+                'resource_type_display': resource_names.get(row['resource_type'], row['resource_type']),
+                'total_needed': total_needed,
+                'current_amount': current_amount,
+                'remaining': max(total_needed - current_amount, 0),
+                # 필요량이 없으면 완료로 봄
+                'completion_ratio': round(min(current_amount / total_needed, 1), 4) if total_needed else 1.0,
+                'player_count': row['player_count']
+            })
+        
+        return Response({
+            'season': int(season_id) if season_id else None,
+            'job_type': job_type or None,
+            'resources': resources
+        })
     
     @action(detail=False, methods=['post'])
     def calculate_needs(self, request):
-        """플레이어의 최종 비스에 필요한 재화 계산"""
+        """최종 비스에 필요한 재화 계산 (플레이어를 생략하면 시즌 전체 플레이어를 한 번에 계산)"""
         player_id = request.data.get('player')
         season_id = request.data.get('season')
         
-        logger.info(f"calculate_needs 호출: player_id={player_id}, season_id={season_id}")
-        print(f"[DEBUG] calculate_needs 호출: player_id={player_id}, season_id={season_id}")
-        
-        if not player_id or not season_id:
-            return Response({'error': '플레이어 ID와 시즌 ID를 모두 입력해주세요.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not season_id:
+            return Response({'error': '시즌 ID를 입력해주세요.'}, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            player = Player.objects.get(pk=player_id)
+            player = Player.objects.get(pk=player_id) if player_id else None
             season = Season.objects.get(pk=season_id)
         except (Player.DoesNotExist, Season.DoesNotExist):
             return Response({'error': '존재하지 않는 플레이어 또는 시즌입니다.'}, status=status.HTTP_404_NOT_FOUND)
         
-        # 재화 계산 서비스 호출
+        # 재화 계산 서비스 호출 (시즌 모델에서 계산 후 일괄 저장)
         try:
-            resources = ResourceCalculationService.calculate_resources_for_player(player, season)
+            resources_by_player = ResourceCalculationService.calculate_resources_for_season(
+                season, player_ids=[player.id] if player else None
+            )
             
+            season_data = {
+                'id': season.id,
+                'name': season.name
+            }
+            
+            if player is None:
+                players = Player.objects.in_bulk(list(resources_by_player.keys()))
+                return Response({
+                    'success': True,
+                    'season': season_data,
+                    'players': [
+                        {
+                            'player': {'id': p_id, 'nickname': players[p_id].nickname},
+                            'resources': resources
+                        }
+                        for p_id, resources in resources_by_player.items()
+                    ]
+                })
+            
+            resources = resources_by_player.get(player.id)
             if not resources:
                 return Response({'error': '이 플레이어의 최종 비스 세트가 존재하지 않습니다.'},
                                status=status.HTTP_404_NOT_FOUND)
@@ -58,22 +125,12 @@ class ResourceTrackingViewSet(viewsets.ModelViewSet):
                     'id': player.id,
                     'nickname': player.nickname
                 },
-                'season': {
-                    'id': season.id,
-                    'name': season.name
-                },
+                'season': season_data,
                 'resources': resources
             }
             
-            # 응답 로깅
-            logger.info(f"자원 계산 성공: player_id={player_id}, season_id={season_id}")
-            print(f"[DEBUG] 자원 계산 성공: player_id={player_id}, season_id={season_id}")
-            
             return Response(response_data)
         except Exception as e:
             logger.error(f"자원 계산 중 오류 발생: {str(e)}", exc_info=True)
-            print(f"[ERROR] 자원 계산 중 오류 발생: {str(e)}")
-            import traceback
-            traceback.print_exc()
             return Response({'error': f'자원 계산 중 오류가 발생했습니다: {str(e)}'},
                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
@@ -9,8 +9,12 @@ from bis_manager.serializers import ScheduleSerializer
 from bis_manager.permissions import IsAdminOrReadOnly, IsOwnerOrReadOnly
 
 class ScheduleViewSet(viewsets.ModelViewSet):
-    queryset = Schedule.objects.all().order_by('start_time')
+    queryset = Schedule.objects.select_related('creator').order_by('start_time')
     serializer_class = ScheduleSerializer
+    # QueryBudgetMiddleware가 검사하는 액션별 최대 쿼리 수
+    query_budgets = {
+        'list': 4, 'retrieve': 3, 'create': 3, 'update': 4, 'partial_update': 4, 'destroy': 4, 'my_schedules': 3
+    }
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['creator', 'is_admin_schedule', 'repeat_type']
     search_fields = ['title', 'description']
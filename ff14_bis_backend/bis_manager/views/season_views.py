@@ -1,16 +1,25 @@
-from rest_framework import viewsets, permissions
+from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from bis_manager.models import Season, Player
 from bis_manager.serializers import SeasonSerializer, PlayerSerializer
 from bis_manager.permissions import IsAdminOrReadOnly
+from bis_manager.views.mixins import SeasonVersionedMixin
+from bis_manager.services.season_dashboard_service import SeasonDashboardService, DEFAULT_RECENT_ACQUISITIONS
 
-class SeasonViewSet(viewsets.ModelViewSet):
+class SeasonViewSet(SeasonVersionedMixin, viewsets.ModelViewSet):
     queryset = Season.objects.all()
     serializer_class = SeasonSerializer
+    # QueryBudgetMiddleware가 검사하는 액션별 최대 쿼리 수
+    query_budgets = {
+        'list': 4, 'retrieve': 4, 'create': 3, 'update': 5, 'partial_update': 5, 'destroy': 13,
+        'active_players': 4, 'dashboard': 11
+    }
     permission_classes = [IsAdminOrReadOnly]
     filterset_fields = ['is_active', 'distribution_method']
+    # 상세 조회 대상이 시즌 자체
+    season_lookup = None
     
     @action(detail=True, methods=['get'])
     def active_players(self, request, pk=None):
@@ -18,4 +27,20 @@ class SeasonViewSet(viewsets.ModelViewSet):
         season = self.get_object()
         players = Player.objects.filter(bis_sets__season=season).distinct()
         serializer = PlayerSerializer(players, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+    
+    @action(detail=True, methods=['get'])
+    def dashboard(self, request, pk=None):
+        """시즌 화면 데이터를 한 번에 반환 (플레이어, 출발/최종 비스, 분배 우선순위, 필요 재화, 최근 획득 내역)
+        
+        recent 파라미터로 최근 획득 내역 개수 지정 (기본 20, 최대 100)
+        """
+        recent = request.query_params.get('recent', DEFAULT_RECENT_ACQUISITIONS)
+        if not str(recent).isdigit():
+            return Response({'error': 'recent는 0 이상의 숫자여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return self.versioned_response(
+            request,
+            self.get_object_season_version(pk),
+            lambda: Response(SeasonDashboardService.build(self.get_object(), int(recent)))
+        )
\ No newline at end of file
@@ -40,6 +40,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    'bis_manager.middleware.PerformanceMiddleware', # 표본 요청의 Server-Timing 헤더 및 /api/_metrics 집계
+    'bis_manager.middleware.TracingMiddleware', # 표본 요청의 구간별 구조화 추적 로그
+    'bis_manager.middleware.QueryBudgetMiddleware', # 요청별 쿼리 예산 검사 (세션/인증 쿼리도 포함)
     "django.contrib.sessions.middleware.SessionMiddleware",
     'corsheaders.middleware.CorsMiddleware', # CORS 미들웨어 추가
     "django.middleware.common.CommonMiddleware",
@@ -217,5 +220,46 @@ LOGGING = {
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-    }
-}
\ No newline at end of file
+    },
+    # 주간 분배 계획 메모이제이션 (내용 해시 키, 최근 사용 순으로 오래된 항목 제거)
+    'plans': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'weekly-plans',
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': 256,
+        },
+    },
+    # 플레이어별 필요 재화 캐시 (키에 DB의 세대 토큰이 포함되므로 프로세스별 캐시여도 비스 변경과 일관됨)
+    'resources': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'resource-needs',
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': 4096,
+        },
+    },
+}
+
+# 백그라운드 작업 (async=1 요청) 실행 스레드 수, EAGER이면 요청 스레드에서 바로 실행
+BACKGROUND_JOB_WORKERS = 2
+BACKGROUND_JOBS_EAGER = False
+
+# 루팅 시뮬레이션 프로세스 풀 크기 (프로세스마다 하나를 모든 요청이 공유, 1이면 요청 스레드에서 실행)
+LOOT_SIMULATION_WORKERS = 2
+
+# 동시 계산 요청 합치기: 최근 결과 재사용 시간(초), 진행 중 계산 대기 시간(초), DB 폴링 간격(초), 중단 판정 시간(초)
+SINGLE_FLIGHT_RESULT_TTL = 5
+SINGLE_FLIGHT_WAIT_TIMEOUT = 120
+SINGLE_FLIGHT_POLL_INTERVAL = 0.2
+SINGLE_FLIGHT_STALE_AFTER = 600
+
+# 요청별 쿼리 예산 (ViewSet.query_budgets) 검사 여부, 초과 시 예외 발생 여부 (기본은 경고 로그, 예산 테스트에서 켬)
+QUERY_BUDGET_ENABLED = DEBUG
+QUERY_BUDGET_RAISE = False
+
+# 요청 성능 측정 (Server-Timing 헤더, /api/_metrics 지연 시간 분포) 표본 비율 0~1, 0이면 측정하지 않음
+PERFORMANCE_SAMPLE_RATE = 1.0 if DEBUG else 0.0
+
+# 구조화 추적 (bis_manager.tracing) 표본 비율 0~1, 0이면 추적하지 않음 (요청/백그라운드 작업 단위)
+TRACING_SAMPLE_RATE = 0.0